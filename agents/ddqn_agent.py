@@ -1,8 +1,4 @@
 import numpy as np
-import tensorflow as tf
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense, Input
-from tensorflow.keras.optimizers import Adam
 from collections import deque
 import random
 
@@ -25,6 +21,9 @@ class DDQNAgent:
         self.update_target_model()
 
     def _build_model(self):
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import Dense, Input
+        from tensorflow.keras.optimizers import Adam
         model = Sequential()
         model.add(Input(shape=(self.state_size,)))
         model.add(Dense(self.hidden_size, activation='relu'))
@@ -2,10 +2,6 @@ import numpy as np
 import random
 import os
 from collections import deque
-import tensorflow as tf
-from tensorflow.keras.models import Model
-from tensorflow.keras.layers import Input, Dense, Add, Subtract, Lambda, BatchNormalization
-from tensorflow.keras.optimizers import Adam
 
 class DuelingAgent:
     def __init__(self, state_size, action_size, double_dqn=False):
@@ -27,6 +23,12 @@ class DuelingAgent:
         self.update_target_model()
 
     def _build_model(self):
+        # import local: quem só usa minimax/random não carrega o tensorflow
+        import tensorflow as tf
+        from tensorflow.keras.models import Model
+        from tensorflow.keras.layers import Input, Dense, Add, Subtract, Lambda, BatchNormalization
+        from tensorflow.keras.optimizers import Adam
+
         # dueling dqn architecture
         inputs = Input(shape=(self.state_size,))
         
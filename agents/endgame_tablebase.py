@@ -0,0 +1,125 @@
+import os
+import json
+import hashlib
+import numpy as np
+
+SCORCH, SPY, MUSTER = 9, 6, 3
+
+def is_endgame(env):
+    # com 1 round para cada lado, o próximo fim de round decide o jogo (e não há mais compras, fora o SPY)
+    return env.player_num_round_wins[0] == 1 and env.player_num_round_wins[1] == 1 and not env.check_game_over()[0]
+
+def deck_info(env, player):
+    # só a parte do deck que ainda pode mudar o resultado: a ordem inteira se há um SPY na mão
+    # (ele compra do topo), a quantidade de 3 se há um MUSTER, senão nada
+    hand, deck = env.player_hands[player], env.player_decks[player].deck
+    if SPY in hand and deck: return tuple(deck)
+    if MUSTER in hand: return deck.count(MUSTER)
+    return None
+
+def canonical_key(env):
+    # estado do ponto de vista de quem joga: mãos como multiconjuntos ordenados, diferença de pontos
+    # limitada ao maior swing possível e pontos exatos só até onde o SCORCH ainda enxerga
+    mover = env.get_player_turn()
+    other = (mover + 1) % 2
+    infos = (deck_info(env, mover), deck_info(env, other))
+
+    swing = sum(env.player_hands[mover]) + sum(env.player_hands[other])
+    nines = [env.player_hands[p].count(SCORCH) for p in (mover, other)]
+    for i, (info, p) in enumerate(zip(infos, (mover, other))):
+        if isinstance(info, tuple):
+            swing += sum(info)
+            nines[i] += info.count(SCORCH)
+        elif info: swing += MUSTER * info
+    bound = 2 * swing + 1
+    diff = max(-bound, min(bound, env.player_points[mover] - env.player_points[other]))
+
+    # o SCORCH tira min(pontos, 5): basta saber os pontos até 5x os SCORCH que o outro ainda pode jogar
+    mover_points = min(env.player_points[mover], env.scorch_damage * nines[1])
+    other_points = min(env.player_points[other], env.scorch_damage * nines[0])
+
+    state = (tuple(sorted(env.player_hands[mover])), tuple(sorted(env.player_hands[other])), diff,
+             mover_points, other_points, other in env.active_players, infos[0], infos[1])
+    key = int.from_bytes(hashlib.blake2b(repr(state).encode(), digest_size=8).digest(), 'little')
+    return key or 1 # 0 marca posição vazia na tabela
+
+class EndgameSolver:
+    # resolve o round final por busca completa memoizada; o valor é +1/0/-1 para quem joga
+    def __init__(self):
+        self.memo = {}
+
+    def solve(self, env):
+        key = canonical_key(env)
+        if key in self.memo: return self.memo[key]
+
+        mover = env.get_player_turn()
+        hand = env.player_hands[mover]
+        # cartas iguais levam ao mesmo estado: basta um índice por valor
+        actions = [0] + [1 + hand.index(card) for card in sorted(set(hand))]
+        best = -1
+        for action in actions:
+            child = env.clone()
+            child.act(action)
+            game_over, winner = child.check_game_over()
+            if game_over: value = 1 if winner[mover] == 'win' else (-1 if winner[mover] == 'loss' else 0)
+            else:
+                value = self.solve(child)
+                if child.get_player_turn() != mover: value = -value
+            best = max(best, value)
+            if best == 1: break
+
+        self.memo[key] = best
+        return best
+
+class EndgameTablebase:
+    # tabela hash de endereçamento aberto em disco: keys.bin (uint64) e values.bin (int8),
+    # abertos com np.memmap; probe() é O(1) sem carregar a tabela na memória
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json')) as f: self.meta = json.load(f)
+        size = self.meta['size']
+        self.keys = np.memmap(os.path.join(directory, 'keys.bin'), dtype=np.uint64, mode='r', shape=(size,))
+        self.values = np.memmap(os.path.join(directory, 'values.bin'), dtype=np.int8, mode='r', shape=(size,))
+        self.mask = size - 1
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self): return self.meta['positions']
+
+    def probe(self, env, player_id=None):
+        # resultado exato (+1 vitória, 0 empate, -1 derrota) para player_id, ou None fora da tabela
+        if not is_endgame(env): return None
+        key = canonical_key(env)
+        index = key & self.mask
+        while True:
+            stored = int(self.keys[index])
+            if stored == 0:
+                self.misses += 1
+                return None
+            if stored == key: break
+            index = (index + 1) & self.mask
+        self.hits += 1
+
+        value = int(self.values[index])
+        if player_id is not None and player_id != env.get_player_turn(): value = -value
+        return value
+
+    @staticmethod
+    def write(directory, memo, **meta):
+        # carga máxima de 50%: as sondagens lineares continuam curtas
+        size = 1
+        while size < 2 * max(1, len(memo)): size *= 2
+        keys = np.zeros(size, dtype=np.uint64)
+        values = np.zeros(size, dtype=np.int8)
+        mask = size - 1
+        for key, value in memo.items():
+            index = key & mask
+            while keys[index] != 0: index = (index + 1) & mask
+            keys[index] = key
+            values[index] = value
+
+        if not os.path.exists(directory): os.makedirs(directory)
+        keys.tofile(os.path.join(directory, 'keys.bin'))
+        values.tofile(os.path.join(directory, 'values.bin'))
+        with open(os.path.join(directory, 'meta.json'), 'w') as f:
+            json.dump(dict(meta, size=size, positions=len(memo)), f, indent=2)
@@ -0,0 +1,199 @@
+import math
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+MAX_TREES = 1024 # partidas com árvore guardada ao mesmo tempo (lockstep e servidor intercalam várias)
+
+class MCTSNode:
+    def __init__(self, parent=None, action=None, mover=None):
+        self.parent = parent
+        self.action = action
+        self.mover = mover # jogador que fez a ação que leva a este nó
+        self.children = {}
+        self.visits = 0
+        self.value = 0.0 # soma dos resultados do ponto de vista de mover
+        self.avail = 0 # quantas vezes a ação esteve disponível no pai (is-mcts)
+
+def legal_actions(env):
+    return range(len(env.player_hands[env.get_player_turn()]) + 1)
+
+def determinize(env, player_id, rng):
+    # amostra um estado completo consistente com o que player_id sabe: a própria mão, o
+    # histograma do próprio deck (ordem desconhecida) e, do oponente, só o tamanho da mão,
+    # o tamanho do deck e o poder total restante (que o jogo mostra)
+    det = env.clone()
+    opponent_id = (player_id + 1) % 2
+
+    own_deck = det.player_decks[player_id]
+    rng.shuffle(own_deck.deck)
+
+    hand_size = len(det.player_hands[opponent_id])
+    deck = det.player_decks[opponent_id]
+    num_cards = hand_size + deck.deck_size
+    if num_cards > 0:
+        # cartas >= 1 somando o poder restante, com o excesso distribuído ao acaso
+        extra = max(0, det.player_total_remaining_card_power[opponent_id] - num_cards)
+        cards = 1 + rng.multinomial(extra, np.full(num_cards, 1 / num_cards))
+        cards = [int(card) for card in np.minimum(cards, det.max_card_power)]
+        rng.shuffle(cards)
+        det.player_hands[opponent_id] = cards[:hand_size]
+        deck.deck = cards[hand_size:]
+        deck.feature_representation *= 0
+        for card in deck.deck: deck.feature_representation[card-1] += 1
+    return det
+
+def rollout_action(env, rng, policy):
+    player = env.get_player_turn()
+    hand = env.player_hands[player]
+    if policy == 'heuristic':
+        opponent = (player + 1) % 2
+        diff = env.player_points[player] - env.player_points[opponent]
+        if opponent not in env.active_players:
+            # oponente passou: passa se está na frente, senão joga a menor carta que vira o placar
+            if diff > 0: return 0
+            winning = [i for i, card in enumerate(hand) if card > -diff and env.special_cards.get(card) != 'SPY']
+            if winning: return 1 + min(winning, key=lambda i: hand[i])
+        if rng.random() < 0.1: return 0
+    return int(rng.integers(len(hand) + 1))
+
+def run_iterations(root, env, player_id, rng, deadline, max_iterations, exploration, policy):
+    # laço do single-observer is-mcts; devolve (iterações, nós criados)
+    iterations = nodes = 0
+    while iterations < max_iterations and time.perf_counter() < deadline:
+        det = determinize(env, player_id, rng)
+        node = root
+
+        # seleção / expansão
+        while not det.check_game_over()[0]:
+            legal = legal_actions(det)
+            for action in legal:
+                if action in node.children: node.children[action].avail += 1
+            untried = [action for action in legal if action not in node.children]
+            mover = det.get_player_turn()
+            if untried:
+                action = untried[int(rng.integers(len(untried)))]
+                det.act(action)
+                child = MCTSNode(node, action, mover)
+                child.avail = 1
+                node.children[action] = child
+                node = child
+                nodes += 1
+                break
+            node = max((node.children[a] for a in legal), key=lambda c: c.value / c.visits +
+                       exploration * math.sqrt(math.log(c.avail) / c.visits))
+            det.act(node.action)
+
+        # rollout até o fim do jogo
+        game_over, winner = det.check_game_over()
+        while not game_over:
+            det.act(rollout_action(det, rng, policy))
+            game_over, winner = det.check_game_over()
+
+        # backpropagation
+        while node is not root:
+            result = winner[node.mover]
+            node.value += 1.0 if result == 'win' else (0.5 if result == 'tie' else 0.0)
+            node.visits += 1
+            node = node.parent
+        root.visits += 1
+        iterations += 1
+    return iterations, nodes
+
+def search_worker(task):
+    # busca independente num processo do pool (paralelização na raiz); devolve as estatísticas da raiz
+    env, player_id, time_budget, max_iterations, seed, exploration, policy = task
+    root = MCTSNode()
+    deadline = time.perf_counter() + time_budget
+    iterations, nodes = run_iterations(root, env, player_id, np.random.default_rng(seed), deadline, max_iterations, exploration, policy)
+    return {action: (child.visits, child.value) for action, child in root.children.items()}, iterations, nodes
+
+class MCTSAgent:
+    def __init__(self, time_budget=0.5, max_iterations=None, exploration=0.7, rollout_policy='heuristic', workers=0, seed=None):
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations or math.inf
+        self.exploration = exploration
+        self.rollout_policy = rollout_policy # 'random' ou 'heuristic'
+        self.workers = workers
+        self.seed = seed
+        self.rng = np.random.default_rng(seed) # só para partidas sem seed de deal (ou agente sem seed)
+        self.epsilon = 0.0
+        self.pool = None
+
+        # árvore reaproveitada entre jogadas consecutivas da mesma partida. um agente joga várias
+        # partidas intercaladas (lockstep, servidor), então cada uma tem a sua, pela identidade do
+        # ambiente, pela seed do deal e pelo assento: (id(env), deal_seed, jogador) -> (raiz, histórico)
+        self.trees = {}
+        self.last_stats = {}
+
+    def game_key(self, env):
+        return id(env), env.deal_seed, env.get_player_turn()
+
+    def search_rng(self, env):
+        # com seed no agente e no deal, o gerador de cada jogada sai da seed, do deal e do número de
+        # ações já jogadas: o resultado não depende de quais partidas este processo jogou antes
+        if self.seed is None or env.deal_seed is None: return self.rng
+        return np.random.default_rng([self.seed, env.deal_seed, len(env.action_history)])
+
+    def reuse_tree(self, env):
+        # desce a árvore anterior pelas ações jogadas desde então (a nossa e as do oponente); um
+        # histórico que não estende o anterior (ou igual a ele) é outra partida no mesmo ambiente
+        history = env.action_history
+        root, root_history = self.trees.get(self.game_key(env), (None, None))
+        if root is None or len(history) <= len(root_history) or history[:len(root_history)] != root_history: return MCTSNode()
+        node = root
+        for action in history[len(root_history):]:
+            if action not in node.children: return MCTSNode()
+            node = node.children[action]
+        node.parent = None
+        return node
+
+    def store_tree(self, env, root):
+        key = self.game_key(env)
+        self.trees.pop(key, None)
+        if len(self.trees) >= MAX_TREES: del self.trees[next(iter(self.trees))] # a mais antiga
+        self.trees[key] = (root, list(env.action_history))
+
+    def act(self, env):
+        start_time = time.perf_counter()
+        player_id = env.get_player_turn()
+        root = self.reuse_tree(env)
+        reused_visits = root.visits
+        rng = self.search_rng(env)
+
+        futures = []
+        if self.workers > 0:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+            for _ in range(self.workers):
+                task = (env, player_id, self.time_budget, self.max_iterations, int(rng.integers(2**32)),
+                        self.exploration, self.rollout_policy)
+                futures.append(self.pool.submit(search_worker, task))
+
+        # o processo principal também busca, na árvore reaproveitada
+        deadline = start_time + self.time_budget
+        iterations, nodes = run_iterations(root, env, player_id, rng, deadline, self.max_iterations,
+                                           self.exploration, self.rollout_policy)
+
+        visits = {action: child.visits for action, child in root.children.items()}
+        for future in futures:
+            stats, worker_iterations, worker_nodes = future.result()
+            iterations += worker_iterations
+            nodes += worker_nodes
+            for action, (child_visits, _) in stats.items(): visits[action] = visits.get(action, 0) + child_visits
+
+        legal = legal_actions(env)
+        best_action = max(legal, key=lambda action: visits.get(action, 0))
+
+        self.store_tree(env, root)
+        elapsed = time.perf_counter() - start_time
+        self.last_stats = {'iterations': iterations, 'nodes': nodes, 'reused_visits': reused_visits, 'time': elapsed,
+                           'nodes_per_sec': nodes / elapsed if elapsed > 0 else 0.0,
+                           'iterations_per_sec': iterations / elapsed if elapsed > 0 else 0.0}
+        return best_action
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
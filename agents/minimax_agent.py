@@ -1,20 +1,134 @@
-import copy
 import math
+import time
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+from minimax_cache import state_key, card_of, action_of
+
+# part of the cache key: bump it when evaluate() or the root move order changes the decisions
+EVALUATOR_VERSION = 2
+
+class SearchAborted(Exception):
+    # raised inside minimax() when the agent's stop event is set (pondering that is no longer needed)
+    pass
+
+# --- root-parallel search: state of each pool process ---
+_root_worker = {}
+
+def init_root_worker(shared_alpha, depth, tablebase_dir):
+    tablebase = None
+    if tablebase_dir is not None:
+        from endgame_tablebase import EndgameTablebase
+        tablebase = EndgameTablebase(tablebase_dir)
+    agent = MinimaxAgent(depth=depth, tablebase=tablebase)
+    agent.shared_alpha = shared_alpha
+    _root_worker['agent'] = agent
+
+def search_root_child(task):
+    # searches one root move; the alpha shared by all workers tightens pruning as soon as any of them finishes
+    env, player_id = task
+    agent = _root_worker['agent']
+    agent.reset_counters()
+    score = agent.minimax(env, agent.depth - 1, -math.inf, math.inf, False, player_id)
+    with agent.shared_alpha.get_lock():
+        agent.shared_alpha.value = max(agent.shared_alpha.value, score)
+    return score, agent.counters()
 
 class MinimaxAgent:
-    def __init__(self, depth=3):
+    def __init__(self, depth=3, tablebase=None, cache=None, workers=0):
         self.depth = depth
+        self.tablebase = tablebase # optional EndgameTablebase with exact final-round outcomes
+        self.cache = cache # optional MinimaxCache shared across games
+        self.workers = workers # >0: root moves are searched by a persistent process pool
+        self.shared_alpha = None
+        self.pool = None
+        self.stop = None # optional threading.Event: aborts the search in progress with SearchAborted
         self.expanded_nodes = 0
+        self.tablebase_hits = 0
+
+        # search statistics: last_stats for the last move, stats_log for the recent ones, totals since creation
+        self.last_stats = {}
+        self.stats_log = deque(maxlen=1000)
+        self.totals = {'moves': 0, 'cache_hits': 0, 'nodes': 0, 'leaf_evaluations': 0, 'cutoffs': 0,
+                       'time': 0.0, 'clone_time': 0.0, 'eval_time': 0.0, 'act_time': 0.0}
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.expanded_nodes = 0
+        self.leaf_evaluations = 0
+        self.nodes_per_ply = [0] * (self.depth + 1)
+        self.cutoffs_per_ply = [0] * (self.depth + 1)
+        self.clone_time = 0.0
+        self.eval_time = 0.0
+        self.act_time = 0.0
+
+    def counters(self):
+        return (self.expanded_nodes, self.leaf_evaluations, self.nodes_per_ply, self.cutoffs_per_ply, self.clone_time, self.eval_time,
+                self.act_time)
+
+    def merge_counters(self, counters):
+        nodes, leaf_evaluations, nodes_per_ply, cutoffs_per_ply, clone_time, eval_time, act_time = counters
+        self.expanded_nodes += nodes
+        self.leaf_evaluations += leaf_evaluations
+        self.nodes_per_ply = [a + b for a, b in zip(self.nodes_per_ply, nodes_per_ply)]
+        self.cutoffs_per_ply = [a + b for a, b in zip(self.cutoffs_per_ply, cutoffs_per_ply)]
+        self.clone_time += clone_time
+        self.eval_time += eval_time
+        self.act_time += act_time
+
+    def record_stats(self, start_time, score=None, cache_hit=False):
+        elapsed = time.perf_counter() - start_time
+        # effective branching factor: the b with b^L nodes at the deepest ply L reached (root = ply 0)
+        last_ply = max([ply for ply, nodes in enumerate(self.nodes_per_ply) if nodes > 0], default=0)
+        ebf = self.nodes_per_ply[last_ply] ** (1 / last_ply) if last_ply > 0 else 0.0
+        self.last_stats = {'nodes': self.expanded_nodes, 'leaf_evaluations': self.leaf_evaluations,
+                           'nodes_per_ply': list(self.nodes_per_ply), 'cutoffs_per_ply': list(self.cutoffs_per_ply),
+                           'ebf': ebf, 'score': score, 'time': elapsed, 'clone_time': self.clone_time, 'eval_time': self.eval_time,
+                           'act_time': self.act_time, 'nodes_per_sec': self.expanded_nodes / elapsed if elapsed > 0 else 0.0,
+                           'cache_hit': cache_hit}
+        self.add_stats(self.last_stats)
+
+    def add_stats(self, stats):
+        # also used for moves searched by another agent (pool processes), given their last_stats
+        self.stats_log.append(stats)
+        totals = self.totals
+        totals['moves'] += 1
+        totals['cache_hits'] += int(stats['cache_hit'])
+        totals['nodes'] += stats['nodes']
+        totals['leaf_evaluations'] += stats['leaf_evaluations']
+        totals['cutoffs'] += sum(stats['cutoffs_per_ply'])
+        totals['time'] += stats['time']
+        totals['clone_time'] += stats['clone_time']
+        totals['eval_time'] += stats['eval_time']
+        totals['act_time'] += stats['act_time']
 
     def act(self, env):
         # calculates the best move for the current player using minimax with alpha-beta pruning
+        start_time = time.perf_counter()
         current_player = env.get_player_turn()
-        self.expanded_nodes = 0
+        self.reset_counters()
+        self.nodes_per_ply[0] = 1
 
-        # get legal actions: 0 (pass) + indices for cards in hand (1..len(hand))
-        hand_size = len(env.player_hands[current_player])
-        legal_actions = [0] + list(range(1, hand_size + 1))
+        # positions already searched in earlier games (same depth, evaluator and endgame table)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache_key(env)
+            cached_card = self.cache.get(cache_key)
+            if cached_card is not None:
+                self.record_stats(start_time, cache_hit=True)
+                return action_of(env, cached_card)
+
+        # get legal actions: 0 (pass) + indices for cards in hand (1..len(hand)), by card value so that
+        # ties go to the same card whatever the hand order (the cache key only sees the sorted hand)
+        hand = env.player_hands[current_player]
+        legal_actions = [0] + sorted(range(1, len(hand) + 1), key=lambda action: hand[action - 1])
+
+        if self.workers > 0:
+            best_action, best_score = self.parallel_root(env, legal_actions, current_player)
+            if cache_key is not None: self.cache.put(cache_key, card_of(env, best_action))
+            self.record_stats(start_time, best_score)
+            return best_action
 
         best_score = -math.inf
         best_action = 0 # default to pass if everything else fails
@@ -24,12 +138,16 @@ class MinimaxAgent:
 
         for action in legal_actions:
             # clone the environment to simulate the move
-            env_copy = copy.deepcopy(env)
+            clone_start = time.perf_counter()
+            env_copy = env.clone()
+            self.clone_time += time.perf_counter() - clone_start
 
             # apply move
             # note: act() returns true/false, but for minimax we assume we picked from legal_actions
             # gwentlite handles turn switching internally
+            act_start = time.perf_counter()
             env_copy.act(action)
+            self.act_time += time.perf_counter() - act_start
 
             # recursively call minimax
             # if the move ended the game or round, the env_copy state reflects that
@@ -41,16 +159,84 @@ class MinimaxAgent:
 
             alpha = max(alpha, best_score)
             if beta <= alpha:
+                self.cutoffs_per_ply[0] += 1
                 break # beta cutoff (pruning)
 
+        if cache_key is not None: self.cache.put(cache_key, card_of(env, best_action))
+        self.record_stats(start_time, best_score)
         return best_action
 
+    def cache_key(self, env):
+        # with an endgame table the probes see the whole deck behind a SPY, so the key keeps the decks whole
+        tablebase_dir = self.tablebase.directory if self.tablebase is not None else None
+        return state_key(env, self.depth, tablebase_dir, EVALUATOR_VERSION, whole_deck=tablebase_dir is not None)
+
+    def parallel_root(self, env, legal_actions, current_player):
+        # young brothers wait: the first move is searched here to get a bound, the rest go to the pool.
+        # scores are integers and workers prune with alpha - 1, so every move tied for the best score
+        # returns it exactly and every other move returns less: the first best move is the serial one
+        if self.pool is None:
+            ctx = multiprocessing.get_context('spawn')
+            self.shared_alpha = ctx.Value('d', -math.inf)
+            tablebase_dir = self.tablebase.directory if self.tablebase is not None else None
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx, initializer=init_root_worker,
+                                            initargs=(self.shared_alpha, self.depth, tablebase_dir))
+
+        children = []
+        for action in legal_actions:
+            clone_start = time.perf_counter()
+            env_copy = env.clone()
+            act_start = time.perf_counter()
+            env_copy.act(action)
+            self.clone_time += act_start - clone_start
+            self.act_time += time.perf_counter() - act_start
+            children.append(env_copy)
+
+        shared_alpha, self.shared_alpha = self.shared_alpha, None # the first move is searched like the serial one
+        first_score = self.minimax(children[0], self.depth - 1, -math.inf, math.inf, False, current_player)
+        self.shared_alpha = shared_alpha
+        self.shared_alpha.value = first_score
+
+        futures = [self.pool.submit(search_root_child, (child, current_player)) for child in children[1:]]
+        scores = [first_score]
+        for future in futures:
+            score, counters = future.result()
+            scores.append(score)
+            self.merge_counters(counters)
+
+        best_index = 0
+        for i, score in enumerate(scores):
+            if score > scores[best_index]: best_index = i
+        return legal_actions[best_index], scores[best_index]
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
     def minimax(self, env, depth, alpha, beta, is_maximizing, player_id):
         self.expanded_nodes += 1
+        ply = self.depth - depth
+        self.nodes_per_ply[ply] += 1
+        if self.stop is not None and self.stop.is_set():
+            raise SearchAborted()
+        if self.shared_alpha is not None:
+            # root alpha published by the other workers (alpha is always from player_id's point of view)
+            alpha = max(alpha, self.shared_alpha.value - 1)
 
         game_over, winner = env.check_game_over()
+        if self.tablebase is not None and not game_over:
+            # exact outcome of a solved endgame beats any heuristic cutoff
+            outcome = self.tablebase.probe(env, player_id)
+            if outcome is not None:
+                self.tablebase_hits += 1
+                return outcome * 100000
         if depth == 0 or game_over:
-            return self.evaluate(env, player_id)
+            self.leaf_evaluations += 1
+            eval_start = time.perf_counter()
+            score = self.evaluate(env, player_id)
+            self.eval_time += time.perf_counter() - eval_start
+            return score
 
         # who is the *current* active player in the simulation?
         # note: in gwent, one player might pass, leaving the other to play multiple turns.
@@ -67,23 +253,33 @@ class MinimaxAgent:
         if is_current_maximizing:
             max_eval = -math.inf
             for action in legal_actions:
-                env_copy = copy.deepcopy(env)
+                clone_start = time.perf_counter()
+                env_copy = env.clone()
+                act_start = time.perf_counter()
                 env_copy.act(action)
+                self.clone_time += act_start - clone_start
+                self.act_time += time.perf_counter() - act_start
                 eval_score = self.minimax(env_copy, depth - 1, alpha, beta, False, player_id)
                 max_eval = max(max_eval, eval_score)
                 alpha = max(alpha, eval_score)
                 if beta <= alpha:
+                    self.cutoffs_per_ply[ply] += 1
                     break
             return max_eval
         else:
             min_eval = math.inf
             for action in legal_actions:
-                env_copy = copy.deepcopy(env)
+                clone_start = time.perf_counter()
+                env_copy = env.clone()
+                act_start = time.perf_counter()
                 env_copy.act(action)
+                self.clone_time += act_start - clone_start
+                self.act_time += time.perf_counter() - act_start
                 eval_score = self.minimax(env_copy, depth - 1, alpha, beta, True, player_id)
                 min_eval = min(min_eval, eval_score)
                 beta = min(beta, eval_score)
                 if beta <= alpha:
+                    self.cutoffs_per_ply[ply] += 1
                     break
             return min_eval
 
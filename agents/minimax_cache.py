@@ -0,0 +1,118 @@
+import os
+import hashlib
+from collections import OrderedDict
+import numpy as np
+from GwentLite import RULES_VERSION
+from endgame_tablebase import MUSTER, SCORCH
+
+def visible_deck(env, player, depth):
+    # o que uma busca de `depth` jogadas enxerga do deck: cada jogada compra no máximo 3 cartas de cada
+    # deck (fim de round; o SPY compra 1), e só as compradas antes da última jogada ainda podem ser jogadas
+    # (das outras basta saber se são 3). o MUSTER tira os 3 do deck, então o topo é medido em cartas
+    # que não são 3, mais a quantidade total de 3 se um MUSTER pode ser jogado
+    deck = env.player_decks[player].deck
+    playable, drawable = 3 * (depth - 1), 3 * depth
+    top, others = [], 0
+    for card in reversed(deck):
+        if others == drawable: break
+        if card != MUSTER: others += 1
+        top.append(card if card == MUSTER or others <= playable else 0)
+    musters = deck.count(MUSTER) if MUSTER in env.player_hands[player] or MUSTER in top else None
+    return tuple(top), musters
+
+def state_key(env, depth, *extra, whole_deck=False):
+    # tudo o que uma busca de `depth` jogadas enxerga, do ponto de vista de quem joga (as regras são
+    # simétricas): mãos como multiconjuntos (a decisão é guardada como valor da carta, ver card_of),
+    # o que dá para comprar dos decks, diferença de pontos, rounds, quem já passou e quem abre um round
+    # empatado. como na tablebase, os pontos de cada um só contam até onde os SCORCH do outro enxergam.
+    # com whole_deck os decks entram inteiros (a tablebase enxerga o deck todo atrás de um SPY)
+    mover = env.get_player_turn()
+    other = (mover + 1) % 2
+    if whole_deck: decks = (tuple(env.player_decks[mover].deck), tuple(env.player_decks[other].deck))
+    else: decks = (visible_deck(env, mover, depth), visible_deck(env, other, depth))
+    tops = decks if whole_deck else (decks[0][0], decks[1][0])
+    nines = [env.player_hands[p].count(SCORCH) + top.count(SCORCH) for p, top in zip((mover, other), tops)]
+    mover_points = min(env.player_points[mover], env.scorch_damage * nines[1])
+    other_points = min(env.player_points[other], env.scorch_damage * nines[0])
+
+    state = (RULES_VERSION, depth, tuple(sorted(env.player_hands[mover])), tuple(sorted(env.player_hands[other])), decks,
+             env.player_points[mover] - env.player_points[other], mover_points, other_points,
+             env.player_num_round_wins[mover], env.player_num_round_wins[other],
+             other in env.active_players, env.round_one_first_player_index == mover) + extra
+    return int.from_bytes(hashlib.blake2b(repr(state).encode(), digest_size=8).digest(), 'little')
+
+def card_of(env, action):
+    # a chave não vê a ordem da mão: o cache guarda o valor da carta jogada (0 = passar)
+    return env.player_hands[env.get_player_turn()][action - 1] if action > 0 else 0
+
+def action_of(env, card):
+    # primeira posição da carta na mão, a mesma que a busca escolhe entre cartas iguais
+    return env.player_hands[env.get_player_turn()].index(card) + 1 if card > 0 else 0
+
+class MinimaxCache:
+    # decisões do minimax entre jogos: uma base ordenada em disco, aberta por memmap e só lida
+    # (vários processos podem abrir o mesmo arquivo), mais um LRU em memória com as decisões novas
+    def __init__(self, path=None, max_entries=1_000_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.recent = OrderedDict() # key -> carta jogada (0 = passar), do menos para o mais recente
+        self.base_keys = np.zeros(0, dtype=np.uint64)
+        self.base_actions = np.zeros(0, dtype=np.uint8)
+        if path and os.path.exists(path + '.keys.npy'):
+            self.base_keys = np.load(path + '.keys.npy', mmap_mode='r')
+            self.base_actions = np.load(path + '.actions.npy', mmap_mode='r')
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        action = self.recent.get(key)
+        if action is not None:
+            self.recent.move_to_end(key)
+            self.hits += 1
+            return action
+
+        index = np.searchsorted(self.base_keys, np.uint64(key))
+        if index < len(self.base_keys) and self.base_keys[index] == key:
+            action = int(self.base_actions[index])
+            self.put(key, action) # promove para o LRU: entradas usadas sobrevivem ao save()
+            self.hits += 1
+            return action
+
+        self.misses += 1
+        return None
+
+    def put(self, key, action):
+        self.recent[key] = action
+        self.recent.move_to_end(key)
+        if len(self.recent) > self.max_entries:
+            self.recent.popitem(last=False)
+            self.evictions += 1
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def save(self, path=None):
+        # grava o LRU e completa com o que já está no arquivo até max_entries (outro agente pode ter
+        # salvo no mesmo arquivo depois que este abriu); só um processo por vez deve salvar
+        path = path or self.path
+        base_keys, base_actions = self.base_keys, self.base_actions
+        if os.path.exists(path + '.keys.npy'):
+            base_keys, base_actions = np.load(path + '.keys.npy', mmap_mode='r'), np.load(path + '.actions.npy', mmap_mode='r')
+        entries = dict(self.recent)
+        for key, action in zip(base_keys, base_actions):
+            if len(entries) >= self.max_entries: break
+            entries.setdefault(int(key), int(action))
+
+        keys = np.fromiter(entries.keys(), dtype=np.uint64, count=len(entries))
+        actions = np.fromiter(entries.values(), dtype=np.uint8, count=len(entries))
+        order = np.argsort(keys)
+        # escreve em arquivos temporários: a base atual pode estar mapeada neste ou em outros processos
+        for suffix, array in (('.keys.npy', keys[order]), ('.actions.npy', actions[order])):
+            with open(path + suffix + '.tmp', 'wb') as f: np.save(f, array)
+            os.replace(path + suffix + '.tmp', path + suffix)
+
+    def __str__(self):
+        return f'{len(self.base_keys)} decisões na base + {len(self.recent)} em memória, {self.hits} hits / {self.misses} misses ({self.hit_rate():.1%}), {self.evictions} evicções'
@@ -0,0 +1,76 @@
+import threading
+from minimax_agent import MinimaxAgent, SearchAborted
+from minimax_cache import MinimaxCache
+
+class Ponderer:
+    # busca em segundo plano durante a vez do humano: uma thread calcula a resposta do minimax para cada
+    # jogada legal do humano e grava no cache de decisões do agente. quando o humano joga, a resposta
+    # já está no cache ou a busca daquela posição, se estiver em andamento, é concluída em vez de recomeçar
+    def __init__(self, agent):
+        if agent.cache is None:
+            agent.cache = MinimaxCache(max_entries=100_000) # só em memória, vale para esta partida
+        self.agent = agent
+        # agente próprio para a thread (contadores separados), com o mesmo cache e a mesma tablebase
+        self.worker_agent = MinimaxAgent(depth=agent.depth, tablebase=agent.tablebase, cache=agent.cache)
+        self.worker_agent.stop = threading.Event()
+        self.thread = None
+        self.lock = threading.Lock() # current_key e finish_current são lidos e escritos pelas duas threads
+        self.current_key = None
+        self.finish_current = False
+
+        self.pondered = 0 # posições buscadas durante a vez do humano
+        self.instant = 0 # respostas encontradas prontas no cache
+        self.resumed = 0 # respostas cuja busca já estava em andamento
+
+    def key(self, env):
+        return self.agent.cache_key(env)
+
+    def start(self, env):
+        # chamado com o humano na vez: uma posição por jogada legal dele em que a ia joga em seguida
+        self.stop()
+        human = env.get_player_turn()
+        children = []
+        for action in range(len(env.player_hands[human]) + 1):
+            child = env.clone()
+            child.act(action)
+            if not child.check_game_over()[0] and child.get_player_turn() != human:
+                children.append(child)
+        # jogadas melhores para o humano primeiro (as mais prováveis)
+        children.sort(key=lambda child: self.agent.evaluate(child, human), reverse=True)
+
+        self.worker_agent.stop.clear()
+        self.finish_current = False
+        self.thread = threading.Thread(target=self.run, args=(children,), daemon=True)
+        self.thread.start()
+
+    def run(self, children):
+        for child in children:
+            with self.lock:
+                if self.finish_current: break
+                self.current_key = self.key(child)
+            try:
+                self.worker_agent.act(child)
+            except SearchAborted:
+                break
+            self.pondered += 1
+        with self.lock: self.current_key = None
+
+    def act(self, env):
+        # jogada da ia na posição real: termina a busca dela se já começou, aborta as outras
+        key = self.key(env)
+        with self.lock:
+            resume = self.current_key == key
+            if resume: self.finish_current = True
+        if resume:
+            self.resumed += 1
+            self.thread.join()
+        self.stop()
+        action = self.agent.act(env)
+        if self.agent.last_stats['cache_hit'] and not resume: self.instant += 1
+        return action
+
+    def stop(self):
+        if self.thread is not None:
+            self.worker_agent.stop.set()
+            self.thread.join()
+            self.thread = None
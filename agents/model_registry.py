@@ -0,0 +1,160 @@
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+
+REGISTRY_FILE = 'model_registry.json'
+CHECKPOINT_PATTERN = re.compile(r'^(?P<name>.+)_(?P<episode>\d+|best)\.weights\.h5$')
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''): digest.update(block)
+    return digest.hexdigest()
+
+def infer_arch(path):
+    # arquitetura lida das camadas gravadas no próprio arquivo de pesos (keras 3), sem construir a rede:
+    # dueling tem batch normalization, o aluno destilado tem 2 camadas densas, o dqn/ddqn denso tem 4
+    if path.endswith('.npz'): return 'quantized', None # exportado por quantize_model.py
+    import h5py
+    with h5py.File(path, 'r') as f:
+        if 'layers' not in f: return None, None
+        layers = list(f['layers'].keys())
+        if any(layer.startswith('batch_normalization') for layer in layers): return 'dueling', None
+        dense = sorted(layer for layer in layers if layer.startswith('dense'))
+        hidden_size = int(f['layers'][dense[0]]['vars']['0'].shape[1]) if dense else None
+        return ('student' if len(dense) == 2 else 'dense'), hidden_size
+
+def default_name(path):
+    # pasta/arquivo sem extensão: os dois trainers salvam checkpoints com o mesmo nome em pastas diferentes
+    stem = os.path.basename(path)
+    for suffix in ('.weights.h5', '.npz'):
+        if stem.endswith(suffix): stem = stem[:-len(suffix)]
+    return f'{os.path.basename(os.path.dirname(os.path.abspath(path)))}/{stem}'
+
+def infer_algorithm(filename):
+    return 'DDQN' if os.path.basename(filename).upper().startswith('DDQN') else 'DQN'
+
+class ModelRegistry:
+    # manifesto json dos modelos treinados: caminho, hash do conteúdo, arquitetura, algoritmo, episódio
+    # e metadados de criação. listar e resolver nomes é só ler o manifesto; os pesos são carregados quando
+    # load_agent cria o agente, e arquivos com o mesmo hash compartilham um único agente em memória
+    def __init__(self, path=REGISTRY_FILE):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as f: self.entries = json.load(f)
+        self.agents = {} # (hash, arch, algoritmo, hidden_size) -> agente carregado
+
+    def __len__(self): return len(self.entries)
+    def __contains__(self, name): return name in self.entries
+    def names(self): return sorted(self.entries)
+    def get(self, name): return self.entries[name]
+
+    def find(self, path):
+        path = os.path.normpath(path)
+        for name, entry in self.entries.items():
+            if os.path.normpath(entry['path']) == path: return name
+        return None
+
+    def describe(self, path):
+        # entrada do manifesto para este arquivo (se ele não mudou desde o registro) ou uma nova, não salva
+        name = self.find(path)
+        stat = os.stat(path)
+        if name is not None:
+            entry = self.entries[name]
+            if entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime: return entry
+        arch, hidden_size = infer_arch(path)
+        return {'path': path, 'sha256': file_hash(path), 'size': stat.st_size, 'mtime': stat.st_mtime,
+                'arch': arch, 'hidden_size': hidden_size, 'algorithm': infer_algorithm(path)}
+
+    def register(self, name, path, algorithm=None, arch=None, episode=None, **metadata):
+        entry = self.describe(path)
+        entry = dict(entry, path=path, algorithm=algorithm or entry['algorithm'], arch=arch or entry['arch'], episode=episode,
+                     created=time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(entry['mtime'])), **metadata)
+        self.entries[name] = entry
+        return entry
+
+    def scan(self, directory, algorithm=None, arch=None, **metadata):
+        # registra os .weights.h5 de uma pasta (não recursivo); o episódio vem de {model_name}_{e}.weights.h5
+        added = []
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith('.weights.h5'): continue
+            path = os.path.join(directory, filename)
+            match = CHECKPOINT_PATTERN.match(filename)
+            episode = int(match.group('episode')) if match and match.group('episode').isdigit() else None
+            name = default_name(path)
+            self.register(name, path, algorithm or infer_algorithm(filename), arch, episode, **metadata)
+            added.append(name)
+        return added
+
+    def config(self, name):
+        # config no formato do MODELS_CONFIG do torneio
+        entry = self.entries[name]
+        config = {'type': entry['algorithm'], 'path': entry['path'], 'arch': entry['arch'] or 'dense'}
+        if entry.get('episode') is not None: config['episode'] = entry['episode']
+        if entry.get('hidden_size') and entry['arch'] == 'student': config['hidden_size'] = entry['hidden_size']
+        return config
+
+    def resolve(self, config):
+        # {'model': nome} aponta para uma entrada do manifesto; o resto da config sobrescreve
+        if 'model' not in config: return config
+        return dict(self.config(config['model']), **{k: v for k, v in config.items() if k != 'model'})
+
+    def shared_agent(self, config, build):
+        # um agente por conteúdo de pesos: build(arch, hidden_size) só roda na primeira vez que o hash aparece
+        entry = self.describe(config['path'])
+        arch = config.get('arch') or entry['arch'] or 'dense'
+        hidden_size = config.get('hidden_size') or entry.get('hidden_size')
+        key = (entry['sha256'], arch, config['type'], hidden_size)
+        if key not in self.agents: self.agents[key] = build(arch, hidden_size)
+        return self.agents[key]
+
+    def save(self):
+        # relê o manifesto antes de gravar (outro trainer pode ter registrado modelos) e grava atomicamente
+        entries = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f: entries = json.load(f)
+        entries.update(self.entries)
+        self.entries = entries
+        with open(self.path + '.tmp', 'w') as f: json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(self.path + '.tmp', self.path)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Registro de modelos treinados.')
+    parser.add_argument('--registry', type=str, default=REGISTRY_FILE)
+    commands = parser.add_subparsers(dest='command', required=True)
+    scan = commands.add_parser('scan', help='registra os checkpoints de uma ou mais pastas')
+    scan.add_argument('directories', nargs='+')
+    scan.add_argument('--algorithm', choices=['DQN', 'DDQN'], default=None, help='padrão: pelo prefixo do arquivo')
+    scan.add_argument('--arch', choices=['dueling', 'dense', 'student'], default=None, help='padrão: lida do arquivo')
+    commands.add_parser('list', help='lista os modelos registrados')
+    commands.add_parser('verify', help='confere o hash de cada arquivo registrado')
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.registry)
+    if args.command == 'scan':
+        for directory in args.directories:
+            added = registry.scan(directory, args.algorithm, args.arch)
+            print(f'{directory}: {len(added)} modelos registrados')
+        registry.save()
+    elif args.command == 'list':
+        print(f'{"Modelo":<44} {"Alg":<5} {"Arq":<8} {"Episódio":>8}  {"Hash":<12} Caminho')
+        for name in registry.names():
+            entry = registry.get(name)
+            print(f'{name:<44} {entry["algorithm"]:<5} {str(entry["arch"]):<8} {str(entry.get("episode") or "-"):>8}  '
+                  f'{entry["sha256"][:12]} {entry["path"]}')
+    else:
+        problems = 0
+        for name in registry.names():
+            entry = registry.get(name)
+            if not os.path.exists(entry['path']): status = 'AUSENTE'
+            elif file_hash(entry['path']) != entry['sha256']: status = 'ALTERADO'
+            else: continue
+            problems += 1
+            print(f'{name}: {status} ({entry["path"]})')
+        print(f'{len(registry) - problems}/{len(registry)} modelos conferem')
+        sys.exit(1 if problems else 0)
@@ -0,0 +1,147 @@
+import math
+import time
+import numpy as np
+
+class NeuralMinimaxAgent:
+    # minimax com alpha-beta nas camadas de cima e avaliação neural nas folhas.
+    # as últimas batch_depth camadas de cada ramo são expandidas por completo, e cada nó logo acima
+    # dessa fronteira avalia as folhas de todos os filhos num único forward pass da rede: são
+    # ~b^(depth - batch_depth - 1) passes por jogada (b ~ 10), um só com batch_depth >= depth - 1.
+    def __init__(self, network_agent, depth=3, batch_depth=2, leaf_value='max_q', win_value=100.0):
+        self.network_agent = network_agent
+        self.depth = depth
+        self.batch_depth = min(batch_depth, depth)
+        self.leaf_value = leaf_value # 'max_q' ou 'value' (stream de valor do dueling)
+        self.win_value = win_value # acima de qualquer q-valor da rede (recompensas de -10 a +8)
+        self.epsilon = 0.0
+        self.value_model = self._build_value_model() if leaf_value == 'value' else None
+
+        self.expanded_nodes = 0
+        self.leaf_evaluations = 0
+        self.forward_passes = 0
+        self.last_move_time = 0.0
+
+    def _build_value_model(self):
+        # sub-rede até a saída de 1 unidade do stream de valor do DuelingAgent
+        if not hasattr(self.network_agent, 'model'):
+            raise ValueError("leaf_value='value' precisa da rede keras do dueling; redes numpy (aluno, quantizada) só com 'max_q'")
+        from tensorflow.keras.models import Model
+        from tensorflow.keras.layers import Dense
+        model = self.network_agent.model
+        value_layers = [layer for layer in model.layers if isinstance(layer, Dense) and layer.units == 1]
+        if not value_layers: raise ValueError("leaf_value='value' precisa de uma rede dueling (use 'max_q')")
+        value_layer = value_layers[0]
+        return Model(inputs=model.inputs, outputs=value_layer.output)
+
+    def act(self, env):
+        start_time = time.perf_counter()
+        self.expanded_nodes = 0
+        self.leaf_evaluations = 0
+        self.forward_passes = 0
+
+        player_id = env.get_player_turn()
+        legal_actions = [0] + list(range(1, len(env.player_hands[player_id]) + 1))
+        children = []
+        for action in legal_actions:
+            child = env.clone()
+            child.act(action)
+            children.append(child)
+
+        if self.depth - 1 <= self.batch_depth:
+            # a árvore inteira cabe em um lote: um único forward pass por jogada
+            scores = self.evaluate_subtrees(children, self.depth - 1, player_id)
+        else:
+            scores = []
+            alpha = -math.inf
+            for child in children:
+                score = self.minimax(child, self.depth - 1, alpha, math.inf, player_id)
+                scores.append(score)
+                alpha = max(alpha, score)
+
+        self.last_move_time = time.perf_counter() - start_time
+        return legal_actions[int(np.argmax(scores))]
+
+    def minimax(self, env, depth, alpha, beta, player_id):
+        if depth <= self.batch_depth: return self.evaluate_subtrees([env], depth, player_id)[0]
+
+        self.expanded_nodes += 1
+        game_over, winner = env.check_game_over()
+        if game_over: return self.terminal_value(winner, player_id)
+
+        sim_current_player = env.get_player_turn()
+        is_current_maximizing = (sim_current_player == player_id)
+        legal_actions = [0] + list(range(1, len(env.player_hands[sim_current_player]) + 1))
+
+        if depth - 1 <= self.batch_depth:
+            # os filhos são todos raízes da fronteira: um forward pass para todos, sem poda entre eles
+            children = []
+            for action in legal_actions:
+                child = env.clone()
+                child.act(action)
+                children.append(child)
+            scores = self.evaluate_subtrees(children, depth - 1, player_id)
+            return max(scores) if is_current_maximizing else min(scores)
+
+        best = -math.inf if is_current_maximizing else math.inf
+        for action in legal_actions:
+            child = env.clone()
+            child.act(action)
+            score = self.minimax(child, depth - 1, alpha, beta, player_id)
+            if is_current_maximizing:
+                best = max(best, score)
+                alpha = max(alpha, score)
+            else:
+                best = min(best, score)
+                beta = min(beta, score)
+            if beta <= alpha: break
+        return best
+
+    def evaluate_subtrees(self, roots, depth, player_id):
+        # expande cada raiz até depth sem poda, avalia todas as folhas juntas e faz o backup
+        leaves = []
+        trees = [self.expand(root, depth, player_id, leaves) for root in roots]
+        values = self.evaluate_leaves(leaves, player_id)
+        return [self.backup(tree, values) for tree in trees]
+
+    def expand(self, env, depth, player_id, leaves):
+        self.expanded_nodes += 1
+        game_over, winner = env.check_game_over()
+        if game_over: return ('terminal', self.terminal_value(winner, player_id))
+        if depth == 0:
+            leaves.append(env)
+            return ('leaf', len(leaves) - 1)
+
+        sim_current_player = env.get_player_turn()
+        children = []
+        for action in range(len(env.player_hands[sim_current_player]) + 1):
+            child = env.clone()
+            child.act(action)
+            children.append(self.expand(child, depth - 1, player_id, leaves))
+        return ('max' if sim_current_player == player_id else 'min', children)
+
+    def backup(self, node, values):
+        kind, content = node
+        if kind == 'terminal': return content
+        if kind == 'leaf': return values[content]
+        scores = [self.backup(child, values) for child in content]
+        return max(scores) if kind == 'max' else min(scores)
+
+    def evaluate_leaves(self, leaves, player_id):
+        if not leaves: return np.zeros(0)
+        # a rede avalia do ponto de vista de quem joga na folha; o sinal passa para player_id
+        turns = np.array([leaf.get_player_turn() for leaf in leaves])
+        batch = np.concatenate([leaf.get_features(turn) for leaf, turn in zip(leaves, turns)], axis=0)
+
+        if self.value_model is not None: values = np.asarray(self.value_model(batch, training=False))[:, 0]
+        # aluno destilado e exportação quantizada rodam em numpy, sem o keras
+        elif hasattr(self.network_agent, 'q_values'): values = self.network_agent.q_values(batch).max(axis=1)
+        else: values = np.asarray(self.network_agent.model(batch, training=False)).max(axis=1)
+
+        self.leaf_evaluations += len(leaves)
+        self.forward_passes += 1
+        return np.where(turns == player_id, values, -values)
+
+    def terminal_value(self, winner, player_id):
+        if winner[player_id] == 'win': return self.win_value
+        if winner[player_id] == 'loss': return -self.win_value
+        return 0.0
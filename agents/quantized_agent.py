@@ -0,0 +1,91 @@
+import json
+import random
+import numpy as np
+
+# exportação dos agentes neurais para um mlp puro em numpy com pesos em baixa precisão.
+# a decisão só depende do argmax dos q-values, então os pesos podem ser guardados em float16 ou em
+# int8 com uma escala por canal de saída; na carga eles voltam a float32 (o blas do numpy não tem
+# matmul rápido em int8/float16), e o ganho de velocidade vem de rodar sem o keras: o batch
+# normalization é dobrado nas camadas seguintes e a cabeça dueling (V + A - média de A) vira uma
+# única camada linear.
+PRECISIONS = ('float32', 'float16', 'int8')
+
+def dense_stack(model, arch):
+    # camadas (W, b) de um modelo keras, em float64 para dobrar sem perda; relu entre elas, a última é linear
+    dense = [layer for layer in model.layers if type(layer).__name__ == 'Dense']
+    weights = lambda layer: [np.asarray(w, dtype=np.float64) for w in layer.get_weights()]
+    if arch != 'dueling': return [tuple(weights(layer)) for layer in dense]
+
+    # tronco dense -> bn -> dense -> bn, depois dois ramos de 64 (valor e vantagem) e as duas saídas
+    value_out = next(layer for layer in dense if layer.units == 1)
+    value_hidden = next(layer for layer in dense if layer.output is value_out.input)
+    advantage_hidden = next(layer for layer in dense if layer.input is value_hidden.input and layer is not value_hidden)
+    advantage_out = next(layer for layer in dense if layer.input is advantage_hidden.output)
+    trunk = [layer for layer in dense if layer not in (value_out, advantage_out, value_hidden, advantage_hidden)]
+    norms = [layer for layer in model.layers if type(layer).__name__ == 'BatchNormalization']
+
+    def fold(norm, w, b):
+        # bn (em inferência) depois da relu: h * s + t entra na camada seguinte como W' = s W, b' = t W + b
+        gamma, beta, mean, var = weights(norm)
+        s = gamma / np.sqrt(var + norm.epsilon)
+        return s[:, None] * w, (beta - mean * s) @ w + b
+
+    (w1, b1), (w2, b2) = weights(trunk[0]), weights(trunk[1])
+    w2, b2 = fold(norms[0], w2, b2)
+    wv, bv = fold(norms[1], *weights(value_hidden))
+    wa, ba = fold(norms[1], *weights(advantage_hidden))
+    (wvo, bvo), (wao, bao) = weights(value_out), weights(advantage_out)
+
+    # Q = V + A - média(A) é linear em [h_valor, h_vantagem]
+    actions = wao.shape[1]
+    head_w = np.concatenate([np.repeat(wvo, actions, axis=1), wao - wao.mean(axis=1, keepdims=True)], axis=0)
+    head_b = bvo + bao - bao.mean()
+    return [(w1, b1), (w2, b2), (np.concatenate([wv, wa], axis=1), np.concatenate([bv, ba])), (head_w, head_b)]
+
+def quantize(layers, precision):
+    arrays = {}
+    for i, (w, b) in enumerate(layers):
+        arrays[f'b{i}'] = b.astype(np.float32)
+        if precision == 'int8':
+            # escala simétrica por canal de saída (coluna de W)
+            scale = np.abs(w).max(axis=0) / 127
+            scale[scale == 0] = 1
+            arrays[f'w{i}'] = np.clip(np.round(w / scale), -127, 127).astype(np.int8)
+            arrays[f'scale{i}'] = scale.astype(np.float32)
+        else:
+            arrays[f'w{i}'] = w.astype(precision)
+    return arrays
+
+def export(model, arch, path, precision='int8', **metadata):
+    layers = dense_stack(model, arch)
+    metadata = dict(metadata, arch=arch, precision=precision, layers=len(layers))
+    np.savez(path, meta=np.array(json.dumps(metadata)), **quantize(layers, precision))
+    return metadata
+
+class QuantizedAgent:
+    # mesma interface de inferência do StudentAgent: q_values(states) em lote e act(state)
+    def __init__(self, path=None):
+        self.epsilon = 0.0
+        self.layers, self.metadata = [], {}
+        if path is not None: self.load(path)
+
+    def load(self, path):
+        with np.load(path) as data:
+            self.metadata = json.loads(str(data['meta']))
+            self.layers = []
+            for i in range(self.metadata['layers']):
+                w = data[f'w{i}'].astype(np.float32)
+                if f'scale{i}' in data: w *= data[f'scale{i}']
+                self.layers.append((w, data[f'b{i}']))
+        self.state_size, self.action_size = self.layers[0][0].shape[0], self.layers[-1][0].shape[1]
+
+    def q_values(self, states):
+        h = np.asarray(states, dtype=np.float32)
+        for w, b in self.layers[:-1]: h = np.maximum(h @ w + b, 0)
+        w, b = self.layers[-1]
+        return h @ w + b
+
+    def act(self, state):
+        if np.random.rand() <= self.epsilon:
+            return random.randrange(self.action_size)
+        return int(np.argmax(self.q_values(np.asarray(state, dtype=np.float32).reshape(1, -1))[0]))
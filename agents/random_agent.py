@@ -0,0 +1,9 @@
+class RandomAgent:
+    # baseline: joga uniformemente entre as ações legais (passar ou uma carta da mão)
+    def __init__(self):
+        self.epsilon = 0.0
+
+    def act(self, env):
+        # sorteia pelo rng do próprio ambiente, que o torneio semeia por partida:
+        # o resultado é o mesmo no runner sequencial e no lockstep
+        return env.sample_legal_move()
@@ -0,0 +1,46 @@
+import numpy as np
+import random
+
+class StudentAgent:
+    # rede pequena (state -> 64 -> ações) destilada de um DuelingAgent treinado.
+    # o keras só é usado para treinar e salvar; act() roda a rede em numpy, sem overhead do predict
+    def __init__(self, state_size, action_size, hidden_size=64):
+        self.state_size = state_size
+        self.action_size = action_size
+        self.hidden_size = hidden_size
+        self.epsilon = 0.0
+        self.learning_rate = 0.001
+
+        self.model = self._build_model()
+        self.refresh()
+
+    def _build_model(self):
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import Dense, Input
+        from tensorflow.keras.optimizers import Adam
+        model = Sequential()
+        model.add(Input(shape=(self.state_size,)))
+        model.add(Dense(self.hidden_size, activation='relu'))
+        model.add(Dense(self.action_size, activation='linear'))
+        model.compile(loss='mse', optimizer=Adam(learning_rate=self.learning_rate))
+        return model
+
+    def refresh(self):
+        # copia os pesos do keras para numpy; chamar depois de treinar ou carregar
+        self.w1, self.b1, self.w2, self.b2 = [w.astype(np.float32) for w in self.model.get_weights()]
+
+    def q_values(self, states):
+        hidden = np.maximum(states @ self.w1 + self.b1, 0)
+        return hidden @ self.w2 + self.b2
+
+    def act(self, state):
+        if np.random.rand() <= self.epsilon:
+            return random.randrange(self.action_size)
+        return int(np.argmax(self.q_values(np.asarray(state, dtype=np.float32).reshape(1, -1))[0]))
+
+    def load(self, name):
+        self.model.load_weights(name)
+        self.refresh()
+
+    def save(self, name):
+        self.model.save_weights(name)
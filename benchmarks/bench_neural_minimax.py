@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, '.') # GwentLite importa games.Game a partir da raiz do repo
+sys.path.insert(0, 'games')
+sys.path.insert(0, 'agents')
+from GwentLite import GwentLite
+from minimax_agent import MinimaxAgent
+from positions import sample_positions
+from dueling_agent import DuelingAgent
+from neural_minimax_agent import NeuralMinimaxAgent
+
+def time_agent(agent, positions):
+    start_time = time.perf_counter()
+    for env in positions: agent.act(env)
+    return (time.perf_counter() - start_time) / len(positions) * 1000
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Latência por jogada: minimax heurístico vs minimax com folhas neurais.')
+    parser.add_argument('--weights', type=str, default=None, help='checkpoint do DuelingAgent (padrão: rede não treinada)')
+    parser.add_argument('--double', action='store_true')
+    parser.add_argument('--depths', type=int, nargs='+', default=[2, 3, 4, 5])
+    parser.add_argument('--positions', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+    env = GwentLite()
+    network = DuelingAgent(env.get_observation_shape(), env.get_action_space_size(), double_dqn=args.double)
+    if args.weights: network.load(args.weights)
+    network.epsilon = 0.0
+
+    positions = sample_positions(args.positions, args.seed)
+    NeuralMinimaxAgent(network, depth=1).act(positions[0]) # aquece o grafo da rede
+
+    print(f'{"Agente":<22} {"Depth":>5} {"ms/jogada":>10} {"Nós":>8} {"Folhas":>8} {"Passes":>7}')
+    for depth in args.depths:
+        minimax = MinimaxAgent(depth=depth)
+        ms = time_agent(minimax, positions)
+        print(f'{"Minimax":<22} {depth:>5} {ms:>10.1f} {minimax.expanded_nodes:>8} {"-":>8} {"-":>7}')
+
+        neural = NeuralMinimaxAgent(network, depth=depth)
+        ms = time_agent(neural, positions)
+        print(f'{"NeuralMinimax":<22} {depth:>5} {ms:>10.1f} {neural.expanded_nodes:>8} {neural.leaf_evaluations:>8} {neural.forward_passes:>7}')
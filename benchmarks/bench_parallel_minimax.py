@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, '.') # GwentLite importa games.Game a partir da raiz do repo
+sys.path.insert(0, 'games')
+sys.path.insert(0, 'agents')
+from minimax_agent import MinimaxAgent
+from positions import sample_positions
+
+def run(agent, positions):
+    start_time = time.perf_counter()
+    actions, nodes = [], 0
+    for env in positions:
+        actions.append(agent.act(env))
+        nodes += agent.expanded_nodes
+    return actions, nodes, (time.perf_counter() - start_time) / len(positions) * 1000
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Speedup do minimax com a raiz dividida entre processos.')
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--positions', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    positions = sample_positions(args.positions, args.seed)
+    serial_actions, serial_nodes, serial_ms = run(MinimaxAgent(depth=args.depth), positions)
+
+    print(f'Minimax depth {args.depth}, {args.positions} posições')
+    print(f'{"Workers":>7} {"ms/jogada":>10} {"Speedup":>8} {"Nós":>10} {"Igual ao serial":>16}')
+    print(f'{"serial":>7} {serial_ms:>10.1f} {1.0:>8.2f} {serial_nodes:>10} {"-":>16}')
+    for workers in range(1, args.max_workers + 1):
+        agent = MinimaxAgent(depth=args.depth, workers=workers)
+        agent.act(positions[0]) # sobe o pool fora da medição
+        actions, nodes, ms = run(agent, positions)
+        agent.close()
+        print(f'{workers:>7} {ms:>10.1f} {serial_ms / ms:>8.2f} {nodes:>10} {str(actions == serial_actions):>16}')
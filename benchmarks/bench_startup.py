@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+# cada cenário roda num processo novo a partir da raiz do repo; scripts são carregados sem executar o main()
+PREAMBLE = '''
+import sys, time, runpy, resource
+sys.path[:0] = ['.', 'games', 'agents', 'training_scripts']
+start_time = time.perf_counter()
+'''
+EPILOGUE = '''
+import json
+print(json.dumps({'seconds': time.perf_counter() - start_time,
+                  'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  'tensorflow': 'tensorflow' in sys.modules}))
+'''
+
+SCENARIOS = {
+    'jogar_vs_ia (import)': "runpy.run_path('jogar_vs_ia.py', run_name='startup')",
+    'jogar_vs_minimax (import)': "runpy.run_path('jogar_vs_minimax.py', run_name='startup')",
+    'run_tournament_v2 (import)': "runpy.run_path('training_scripts/run_tournament_v2.py', run_name='startup')",
+    'evaluate_checkpoints (import)': "runpy.run_path('training_scripts/evaluate_checkpoints.py', run_name='startup')",
+    'build_tablebase (import)': "runpy.run_path('training_scripts/build_tablebase.py', run_name='startup')",
+    'generate_minimax_dataset (import)': "runpy.run_path('training_scripts/generate_minimax_dataset.py', run_name='startup')",
+    'train_pro (import)': "runpy.run_path('training_scripts/train_pro.py', run_name='startup')",
+    # um worker de torneio só com agentes de busca, até o primeiro jogo
+    'worker Minimax vs Random': '''
+from tournament_core import init_worker, play_shard
+init_worker({'Minimax_Depth2': {'type': 'Minimax', 'path': None, 'depth': 2}, 'Random': {'type': 'Random', 'path': None}}, 42, 100)
+play_shard(('Minimax_Depth2', 'Random', [0]))
+''',
+    # referência: o mesmo processo construindo uma rede
+    'construir DuelingAgent': '''
+from dueling_agent import DuelingAgent
+DuelingAgent(100, 11, double_dqn=True)
+''',
+}
+
+def measure(code, repeats):
+    # melhor tempo de `repeats` processos; rss é o pico do processo
+    runs = []
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, '-c', PREAMBLE + code + EPILOGUE], capture_output=True, text=True,
+                             env={'TF_CPP_MIN_LOG_LEVEL': '3', **os.environ})
+        if out.returncode != 0:
+            raise RuntimeError(out.stderr.strip().splitlines()[-1])
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return min(runs, key=lambda r: r['seconds'])
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tempo de inicialização e memória (RSS) de cada ponto de entrada.')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--only', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--output', type=str, default=None, help='salva os resultados em json')
+    args = parser.parse_args()
+
+    results = {}
+    print(f'{"Cenário":<36} {"Tempo (s)":>10} {"RSS (MB)":>10} {"TF":>4}')
+    for name in args.only:
+        try:
+            r = measure(SCENARIOS[name], args.repeats)
+        except RuntimeError as e:
+            print(f'{name:<36} ERRO: {e}')
+            continue
+        results[name] = r
+        print(f'{name:<36} {r["seconds"]:>10.2f} {r["rss_mb"]:>10.0f} {"sim" if r["tensorflow"] else "não":>4}')
+
+    if args.output:
+        with open(args.output, 'w') as f: json.dump(results, f, indent=2)
+        print(f'Resultados salvos em {args.output}')
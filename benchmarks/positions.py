@@ -0,0 +1,17 @@
+import sys
+
+sys.path.insert(0, '.') # GwentLite importa games.Game a partir da raiz do repo
+sys.path.insert(0, 'games')
+from GwentLite import GwentLite
+
+def sample_positions(count, seed, random_moves=4):
+    # posições de início de jogo com algumas jogadas aleatórias, todas reproduzíveis; sem tensorflow,
+    # para servir aos benchmarks que não carregam agentes neurais
+    positions = []
+    for i in range(count):
+        env = GwentLite()
+        env.reset(seed=seed + i)
+        for _ in range(random_moves):
+            env.act(int(env.rng.integers(1, len(env.player_hands[env.get_player_turn()]) + 1)))
+        positions.append(env)
+    return positions
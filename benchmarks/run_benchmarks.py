@@ -0,0 +1,174 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import numpy as np
+
+sys.path.insert(0, '.') # GwentLite importa games.Game a partir da raiz do repo
+sys.path.insert(0, 'games')
+sys.path.insert(0, 'agents')
+sys.path.insert(0, 'training_scripts')
+from GwentLite import GwentLite
+from minimax_agent import MinimaxAgent
+from positions import sample_positions
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_TOLERANCE = 0.15 # regressão = mais de 15% abaixo do baseline
+
+def best_rate(fn, count, repeats):
+    # operações por segundo na melhor de `repeats` rodadas (a menos perturbada pelo resto da máquina)
+    best = float('inf')
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start_time)
+    return count / best
+
+# --- benchmarks: cada um devolve {nome: (valor, unidade)}; maior é sempre melhor ---
+
+def bench_reset(scale, repeats):
+    env = GwentLite(seed=0)
+    n = 2000 * scale
+    return {'gwentlite.reset': (best_rate(lambda: [env.reset() for _ in range(n)], n, repeats), 'ops/s')}
+
+def bench_act(scale, repeats):
+    # dez jogadas fixas sobre cópias de deals semeados (a cópia fica fora da contagem de ops, mas dentro do tempo)
+    positions = sample_positions(200, 0, random_moves=0)
+    def run():
+        for env in positions:
+            env = env.clone()
+            for _ in range(10): env.act(1)
+    return {'gwentlite.act': (best_rate(run, 200 * 10, repeats), 'ops/s')}
+
+def bench_get_features(scale, repeats):
+    positions = sample_positions(100, 0)
+    n = 20 * scale
+    def run():
+        for _ in range(n):
+            for env in positions: env.get_features(env.get_player_turn())
+    return {'gwentlite.get_features': (best_rate(run, 100 * n, repeats), 'ops/s')}
+
+def bench_random_games(scale, repeats):
+    env = GwentLite()
+    n = 200 * scale
+    def run():
+        for i in range(n):
+            env.reset(seed=i)
+            while not env.check_game_over()[0]: env.act(int(env.sample_legal_move()))
+    return {'random_games': (best_rate(run, n, repeats), 'games/s')}
+
+def bench_minimax(scale, repeats, depths=(1, 2, 3, 4)):
+    positions = sample_positions(5 * scale, 0)
+    results = {}
+    for depth in depths:
+        agent = MinimaxAgent(depth=depth)
+        stats = {}
+        def run():
+            nodes = 0
+            for env in positions:
+                agent.act(env)
+                nodes += agent.expanded_nodes
+            stats['nodes'] = nodes
+        moves_per_sec = best_rate(run, len(positions), repeats)
+        results[f'minimax.d{depth}.moves'] = (moves_per_sec, 'moves/s')
+        results[f'minimax.d{depth}.nodes'] = (stats['nodes'] / len(positions) * moves_per_sec, 'nodes/s')
+    return results
+
+def bench_dueling(scale, repeats):
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+    from dueling_agent import DuelingAgent
+    env = GwentLite()
+    agent = DuelingAgent(env.get_observation_shape(), env.get_action_space_size(), double_dqn=True)
+    agent.epsilon = 0.0
+    states = [p.get_features(p.get_player_turn()) for p in sample_positions(20 * scale, 0)]
+    agent.act(states[0]) # aquece o grafo
+
+    results = {'dueling.act': (best_rate(lambda: [agent.act(s) for s in states], len(states), repeats), 'moves/s')}
+
+    # replay() com o buffer cheio de transições sintéticas semeadas
+    rng = np.random.default_rng(0)
+    for _ in range(agent.batch_size * 4):
+        s, s2 = states[rng.integers(len(states))], states[rng.integers(len(states))]
+        agent.remember(s, int(rng.integers(11)), float(rng.normal()), s2, bool(rng.random() < 0.1))
+    agent.replay()
+    n = 5 * scale
+    results['dueling.replay'] = (best_rate(lambda: [agent.replay() for _ in range(n)], n, repeats), 'steps/s')
+    return results
+
+def bench_tournament(scale, repeats):
+    from tournament_core import ShardRunner, make_shards
+    configs = {'Minimax_Depth1': {'type': 'Minimax', 'path': None, 'depth': 1}, 'Random': {'type': 'Random', 'path': None}}
+    n = 10 * scale
+    shards = make_shards([('Minimax_Depth1', 'Random'), ('Random', 'Minimax_Depth1')], n, n)
+    def run():
+        with ShardRunner(configs, 1, 0, 100) as runner: list(runner.imap(shards))
+    return {'tournament': (best_rate(run, 2 * n, repeats), 'games/s')}
+
+BENCHMARKS = {'reset': bench_reset, 'act': bench_act, 'get_features': bench_get_features, 'random_games': bench_random_games,
+              'minimax': bench_minimax, 'dueling': bench_dueling, 'tournament': bench_tournament}
+
+def machine_info():
+    info = {'platform': platform.platform(), 'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count(), 'python': platform.python_version(), 'numpy': np.__version__}
+    try:
+        import tensorflow as tf
+        info['tensorflow'] = tf.__version__
+    except ImportError:
+        pass
+    return info
+
+def compare(results, baseline, tolerance):
+    # devolve os benchmarks que ficaram mais de `tolerance` abaixo do baseline
+    regressions = []
+    print(f'\n{"Benchmark":<26} {"Atual":>12} {"Baseline":>12} {"Razão":>7}')
+    for name, entry in results.items():
+        if name not in baseline['results']: continue
+        base = baseline['results'][name]
+        limit = base.get('tolerance', tolerance)
+        ratio = entry['value'] / base['value']
+        flag = ' REGRESSÃO' if ratio < 1 - limit else ''
+        print(f'{name:<26} {entry["value"]:>12.1f} {base["value"]:>12.1f} {ratio:>7.2f}{flag}')
+        if flag: regressions.append(name)
+    return regressions
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks dos caminhos quentes, com comparação contra um baseline.')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--scale', type=int, default=1, help='multiplica o tamanho de cada benchmark')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', type=str, default='benchmark_results.json')
+    parser.add_argument('--baseline', type=str, default=BASELINE_FILE)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--save-baseline', action='store_true', help='grava os resultados como novo baseline')
+    parser.add_argument('--require-baseline', action='store_true', help='sai com código 2 se o baseline não existir')
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only:
+        print(f'Rodando {name}...')
+        for bench_name, (value, unit) in BENCHMARKS[name](args.scale, args.repeats).items():
+            results[bench_name] = {'value': value, 'unit': unit}
+            print(f'  {bench_name:<26} {value:>12.1f} {unit}')
+
+    report = {'machine': machine_info(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'scale': args.scale, 'repeats': args.repeats, 'results': results}
+    with open(args.output, 'w') as f: json.dump(report, f, indent=2)
+    print(f'Resultados salvos em {args.output}')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f: json.dump(report, f, indent=2)
+        print(f'Baseline salvo em {args.baseline}')
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f: baseline = json.load(f)
+        if baseline['machine'] != report['machine']: print('Aviso: baseline gerado em outra máquina/ambiente')
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f'\n{len(regressions)} regressões acima de {args.tolerance:.0%}: {", ".join(regressions)}')
+            sys.exit(1)
+        print('\nSem regressões.')
+    else:
+        print(f'\nAviso: baseline {args.baseline} não encontrado, nada foi comparado '
+              '(--save-baseline grava um a partir desta execução)')
+        if args.require_baseline: sys.exit(2)
@@ -1,6 +1,10 @@
 from games.Game import *
 import numpy as np
 
+# incrementar sempre que uma mudança de regra ou de geração de decks alterar o resultado
+# de uma partida com a mesma seed (invalida os caches de matchups do torneio)
+RULES_VERSION = 2
+
 class Deck:
     def __init__(self,min_deck_size,max_deck_power):
         self.min_deck_size = min_deck_size
@@ -10,8 +14,9 @@ class Deck:
         self.deck = []
         self.deck_size = 0
         self.feature_representation = np.array([0 for _ in range(self.max_card_power)],dtype=float)
-    def reset(self,input_deck_list,mean=None,stdev=None):
-        
+    def reset(self,input_deck_list,mean=None,stdev=None,rng=None):
+        if rng is None: rng = np.random # compatibilidade: rng global do numpy
+
         if input_deck_list != None: deck_list = input_deck_list.copy()
         else:
             deck_list = []
@@ -19,7 +24,7 @@ class Deck:
             while len(deck_list) < self.min_deck_size:
                 if max_card_power == 1: deck_list.append(1)
                 else:
-                    card = max( 1 , round( np.random.normal(mean,stdev) ) )
+                    card = max( 1 , round( rng.normal(mean,stdev) ) )
                     card = min( max_card_power , card )
                     deck_list.append(card)
                     max_card_power -= card - 1
@@ -29,12 +34,18 @@ class Deck:
         self.deck_size = len(deck_list)
         self.feature_representation *= 0
         for card in self.deck: self.feature_representation[card-1] += 1
-        np.random.shuffle(self.deck) 
+        rng.shuffle(self.deck)
     def draw(self):
         card = self.deck.pop(-1)
         self.deck_size -= 1
         self.feature_representation[card-1] -= 1
         return card
+    def clone(self):
+        deck = Deck.__new__(Deck)
+        deck.__dict__.update(self.__dict__)
+        deck.deck = list(self.deck)
+        deck.feature_representation = self.feature_representation.copy()
+        return deck
     def get_features(self):
         if self.deck_size == 0: return self.feature_representation * 0 
         return self.feature_representation / self.deck_size
@@ -42,7 +53,7 @@ class Deck:
     def __repr__(self): return str(self)
 
 class GwentLite(Game):
-    def __init__(self):
+    def __init__(self,seed=None):
         self.min_deck_size = 25
         self.max_deck_power = 100
         self.max_card_power = self.max_deck_power - self.min_deck_size + 1
@@ -61,7 +72,12 @@ class GwentLite(Game):
         self.active_players = []
         self.active_player_index = None
         self.round_one_first_player_index = None
+        self.action_history = [] # ações aplicadas desde o reset, na ordem
         
+        # cada ambiente tem seu próprio gerador; reset(seed=...) reproduz exatamente o mesmo deal
+        self.rng = np.random.default_rng(seed)
+        self.deal_seed = None # seed do deal atual (None sem reset semeado): identifica a partida para os agentes
+
         self.scorch_damage = 5
         self.special_cards = {
             3: 'MUSTER',
@@ -73,9 +89,11 @@ class GwentLite(Game):
     def get_observation_shape(self): return (self.max_card_power+10+5) + (7) + (2)
     def get_action_space_size(self): return 11
     def get_number_of_players(self): return 2
-    def reset(self,deck_lists=(None,None)):
+    def reset(self,deck_lists=(None,None),seed=None):
+        if seed is not None: self.rng = np.random.default_rng(seed)
+        self.deal_seed = seed
         for player_index in range(2):
-            self.player_decks[player_index].reset(deck_lists[player_index],self.mean,np.random.choice(self.stdev_range))
+            self.player_decks[player_index].reset(deck_lists[player_index],self.mean,self.rng.choice(self.stdev_range),self.rng)
             self.num_unplayed_cards[player_index] = len(self.player_decks[player_index].deck)
             self.player_hands[player_index].clear()
             for _ in range(10): self.player_hands[player_index].append( self.player_decks[player_index].draw() )
@@ -86,7 +104,8 @@ class GwentLite(Game):
 
         self.round = 1
         self.active_players = [0,1]
-        self.active_player_index = np.random.choice(2)
+        self.action_history = []
+        self.active_player_index = int(self.rng.integers(2))
         self.round_one_first_player_index = self.get_player_turn()
     def next_round(self):
         self.round += 1
@@ -105,9 +124,25 @@ class GwentLite(Game):
             for _ in range( min( 10-len(self.player_hands[player_index]) , 3 ) ): 
                 if self.player_decks[player_index].deck_size > 0:
                     self.player_hands[player_index].append( self.player_decks[player_index].draw() )
+    def clone(self):
+        # cópia do estado bem mais barata que copy.deepcopy, para busca em árvore.
+        # o rng é compartilhado: act() e check_game_over() não sorteiam nada
+        env = GwentLite.__new__(GwentLite)
+        env.__dict__.update(self.__dict__)
+        env.player_decks = { 0 : self.player_decks[0].clone() , 1 : self.player_decks[1].clone() }
+        env.num_unplayed_cards = dict(self.num_unplayed_cards)
+        env.player_hands = { 0 : list(self.player_hands[0]) , 1 : list(self.player_hands[1]) }
+        env.player_points = dict(self.player_points)
+        env.player_num_round_wins = dict(self.player_num_round_wins)
+        env.player_total_remaining_card_power = dict(self.player_total_remaining_card_power)
+        env.player_average_remaining_card_power = dict(self.player_average_remaining_card_power)
+        env.active_players = list(self.active_players)
+        env.action_history = list(self.action_history)
+        return env
     def get_player_turn(self): return self.active_players[self.active_player_index]
     def act(self,action):
         active_player_index = self.get_player_turn()
+        self.action_history.append(action)
 
         if action == 0 or action-1 >= len(self.player_hands[ active_player_index ]):
             self.active_players.remove( active_player_index )
@@ -201,7 +236,7 @@ class GwentLite(Game):
             ) ).reshape(1,-1)
 
     def sample_legal_move(self):
-        return np.random.choice( len( self.player_hands[ self.get_player_turn() ] ) + 1 )
+        return self.rng.integers( len( self.player_hands[ self.get_player_turn() ] ) + 1 )
     def __str__(self): return f'\nPlayer decks: {self.player_decks}\nPlayer hands: {self.player_hands}\nPlayer points: {self.player_points}\nPlayer round wins: {self.player_num_round_wins}\nPlayer total remaining card power: {self.player_total_remaining_card_power}\nPlayer average remaining card power: {self.player_average_remaining_card_power}\nRound: {self.round}\nPlayer turn: {self.get_player_turn()}'
     def __repr__(self): return str(self)
     def play(self):
@@ -1,15 +1,16 @@
 import sys
 import time
 import os
-import glob
 import numpy as np
 
 sys.path.insert(0, 'games')
 sys.path.insert(0, 'agents')
+sys.path.insert(0, 'training_scripts')
 
 from GwentLite import GwentLite
 from minimax_agent import MinimaxAgent
-from dueling_agent import DuelingAgent
+from minimax_ponder import Ponderer
+from model_registry import ModelRegistry
 
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3' 
 
@@ -49,14 +50,9 @@ def print_game_state(env, player_id):
         print(f"{i + 1:>2}: Jogar carta [{card}]{special}")
     print("="*50)
 
-def get_available_models():
-    """Busca arquivos de modelo .h5 na pasta atual e subpastas."""
-    models = []
-    search_path = os.path.join(os.getcwd(), "**", "*.weights.h5")
-    for file in glob.glob(search_path, recursive=True):
-        if "Gwent IA Definitivo" in file:
-             models.append(file)
-    return sorted(models, key=os.path.getmtime, reverse=True)
+def get_available_models(registry):
+    """Lista os modelos do registro (model_registry.json), do mais recente para o mais antigo."""
+    return sorted(registry.names(), key=lambda name: registry.get(name)['mtime'], reverse=True)
 
 def main():
     print("--- GWENT LITE: HUMANO VS IA ---")
@@ -68,6 +64,7 @@ def main():
     opponent_type = input("Opção (1/2): ")
     
     agent = None
+    ponderer = None
     agent_name = "IA"
     
     env = GwentLite() 
@@ -77,36 +74,42 @@ def main():
             depth = int(input("Profundidade do Minimax (Enter para 3): ") or 3)
         except:
             depth = 3
-        agent = MinimaxAgent(depth=depth)
+        try:
+            workers = int(input("Processos para a busca (Enter para 1): ") or 1)
+        except:
+            workers = 1
+        # com mais de um processo, os lances da raiz são divididos entre eles (mesma jogada do serial)
+        agent = MinimaxAgent(depth=depth, workers=workers if workers > 1 else 0)
         agent_name = f"Minimax-d{depth}"
+        # pondering: enquanto você pensa, a ia já busca a resposta para cada jogada sua
+        if input("Deixar a IA pensar durante a sua vez? (S/n): ").strip().lower() != 'n':
+            ponderer = Ponderer(agent)
         
     elif opponent_type == '2':
-        models = get_available_models()
+        registry = ModelRegistry()
+        models = get_available_models(registry)
         if not models:
-            print("Nenhum modelo .weights.h5 encontrado!")
+            print("Nenhum modelo registrado! Registre com: python agents/model_registry.py scan <pasta dos modelos>")
             return
 
-        print("\nModelos encontrados:")
-        for i, m in enumerate(models):
-            print(f"{i+1}. {os.path.basename(m)}")
+        print("\nModelos registrados:")
+        for i, name in enumerate(models):
+            entry = registry.get(name)
+            print(f"{i+1}. {name} ({entry['algorithm']}, {entry['arch']}, episódio {entry.get('episode') or '-'})")
         
         try:
             sel = int(input("\nEscolha o número do modelo: ")) - 1
             if 0 <= sel < len(models):
-                model_path = models[sel]
-                filename = os.path.basename(model_path)
-                is_double = 'DDQN' in filename or 'ddqn' in filename
-                
-                print(f"Carregando {filename}...")
-                
+                name = models[sel]
                 state_size = env.get_observation_shape()
                 action_size = env.get_action_space_size()
                 
-                agent = DuelingAgent(state_size, action_size, double_dqn=is_double)
-                agent.load(model_path)
-                agent.epsilon = 0.0
+                # algoritmo e arquitetura vêm do registro; agentes neurais (e o tensorflow) só são carregados nesta opção
+                from tournament_core import load_agent
+                agent = load_agent(name, {'model': name}, state_size, action_size)
+                if agent is None: return
                 
-                agent_name = f"IA-{filename}"
+                agent_name = f"IA-{name}"
             else:
                 print("Seleção inválida.")
                 return
@@ -145,6 +148,7 @@ def main():
 
         if current_turn == human_player:
             print_game_state(env, human_player)
+            if ponderer is not None: ponderer.start(env)
             
             valid_move = False
             while not valid_move:
@@ -169,7 +173,10 @@ def main():
             print(f"\n[{agent_name}] Pensando...")
             time.sleep(1.5)
             
-            if isinstance(agent, MinimaxAgent):
+            if ponderer is not None:
+                action = ponderer.act(env)
+                if agent.last_stats['cache_hit']: print("(resposta já calculada durante a sua vez)")
+            elif isinstance(agent, MinimaxAgent):
                 action = agent.act(env)
             else:
                 state = env.get_features(ai_player)
@@ -202,6 +209,11 @@ def main():
     else:
         print("VOCÊ PERDEU. A IA VENCEU!")
     print("="*50)
+    if ponderer is not None:
+        ponderer.stop()
+        print(f"Pondering: {ponderer.pondered} posições buscadas na sua vez, {ponderer.instant} respostas instantâneas, "
+              f"{ponderer.resumed} buscas retomadas")
+    if isinstance(agent, MinimaxAgent): agent.close()
 
 if __name__ == "__main__":
     main()
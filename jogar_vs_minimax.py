@@ -45,9 +45,14 @@ def main():
         depth = int(input("Escolha a profundidade do Minimax (padrão 3, cuidado com >4): ") or 3)
     except:
         depth = 3
+    try:
+        workers = int(input("Processos para a busca (Enter para 1): ") or 1)
+    except:
+        workers = 1
         
     print(f"Inicializando Minimax com profundidade {depth}...")
-    agent = MinimaxAgent(depth=depth)
+    # com mais de um processo, os lances da raiz são divididos entre eles (mesma jogada do serial)
+    agent = MinimaxAgent(depth=depth, workers=workers if workers > 1 else 0)
     env = GwentLite()
     
     # Escolha de ordem
@@ -115,6 +120,7 @@ def main():
     else:
         print("VOCÊ PERDEU. MAIS SORTE NA PRÓXIMA!")
     print("="*40)
+    agent.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,330 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import multiprocessing
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+
+sys.path.insert(0, '.') # GwentLite importa games.Game a partir da raiz do repo
+sys.path.insert(0, 'games')
+sys.path.insert(0, 'agents')
+sys.path.insert(0, 'training_scripts')
+from tournament_core import GwentLite, load_agent, batch_q_values, minimax_act, ENV_AGENT_TYPES, get_registry
+
+# oponentes disponíveis (mesmo formato do MODELS_CONFIG do torneio)
+MODELS_CONFIG = {
+    'Minimax_Depth2': {'type': 'Minimax', 'path': None, 'depth': 2},
+    'Minimax_Depth3': {'type': 'Minimax', 'path': None, 'depth': 3},
+    'Random': {'type': 'Random', 'path': None},
+    'DDQN_v2_Fixed': {'type': 'DDQN', 'path': 'models_pro_DDQN_v2_fixed/DDQN_v2_10000.weights.h5'},
+    'DQN_v2_Fixed': {'type': 'DQN', 'path': 'models_pro_DQN_v2_fixed/DQN_v2_10000.weights.h5'},
+}
+
+LATENCY_WINDOW = 10000 # latências guardadas por categoria para os percentis
+
+# protocolo: uma linha json por requisição e uma por resposta, na mesma conexão
+#   {"cmd": "models"}
+#   {"cmd": "new", "opponent": "Minimax_Depth3", "seat": 0, "seed": 7}    seat = assento do humano, seed opcional
+#   {"cmd": "move", "session": 1, "action": 2}                           0 = passar, i = i-ésima carta da mão
+#   {"cmd": "state", "session": 1}
+#   {"cmd": "quit", "session": 1}
+#   {"cmd": "stats"}
+# "new" e "move" só respondem quando é a vez do humano de novo (ou o jogo acabou), com as jogadas da ia em "ai_actions"
+
+class Session:
+    def __init__(self, session_id, opponent, human, seed):
+        self.id = session_id
+        self.opponent = opponent
+        self.human = human
+        self.ai = 1 - human
+        self.env = GwentLite()
+        self.env.reset(seed=seed)
+        self.last_active = time.monotonic()
+        self.busy = False # esperando a jogada da ia: o reaper não fecha a sessão
+
+    def state(self):
+        env, human, ai = self.env, self.human, self.ai
+        game_over, results = env.check_game_over()
+        return {'session': self.id, 'round': env.round, 'your_turn': not game_over and env.get_player_turn() == human,
+                'hand': list(env.player_hands[human]), 'points': [env.player_points[human], env.player_points[ai]],
+                'round_wins': [env.player_num_round_wins[human], env.player_num_round_wins[ai]],
+                'opponent_hand_size': len(env.player_hands[ai]),
+                'deck_power': [env.player_total_remaining_card_power[human], env.player_total_remaining_card_power[ai]],
+                'game_over': game_over, 'result': results[human] if game_over else None}
+
+class GameServer:
+    def __init__(self, models_config, tick, minimax_workers, session_timeout, move_timeout):
+        self.configs = models_config
+        self.tick = tick
+        self.session_timeout = session_timeout
+        self.move_timeout = move_timeout
+        self.env = GwentLite()
+        self.agents = {}
+        self.sessions = {}
+        self.next_session_id = 1
+
+        # jogadas da ia pendentes por modelo: [(sessão, future)], drenadas a cada tick
+        self.pending = defaultdict(list)
+        self.wakeup = asyncio.Event()
+        self.running = set() # modelos com um lote em andamento
+        self.batch_tasks = set()
+        # cada agente roda na sua própria thread (o forward pass ou a busca não trava o loop, e um modelo
+        # lento não segura os outros); o minimax, se houver workers, num pool de processos
+        self.executors = {} # id(agente) -> executor de uma thread: agentes compartilhados não rodam em paralelo
+        self.minimax_pool = None
+        if minimax_workers > 0:
+            self.minimax_pool = ProcessPoolExecutor(max_workers=minimax_workers, mp_context=multiprocessing.get_context('spawn'))
+
+        self.latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self.batch_sizes = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self.counts = defaultdict(int) # sessions, games_finished, timeouts, errors
+
+    def preload(self):
+        # carrega os modelos antes de aceitar conexões: carregar uma rede trava o loop por segundos
+        for name, config in self.configs.items():
+            if config['type'] != 'Minimax' or self.minimax_pool is None: self.get_agent(name)
+
+    def executor(self, agent):
+        if id(agent) not in self.executors: self.executors[id(agent)] = ThreadPoolExecutor(max_workers=1)
+        return self.executors[id(agent)]
+
+    def get_agent(self, name):
+        if name not in self.agents:
+            agent = load_agent(name, self.configs[name], self.env.get_observation_shape(), self.env.get_action_space_size())
+            if agent is None: raise RuntimeError(f'Falha ao carregar {name}')
+            self.agents[name] = agent
+        return self.agents[name]
+
+    # --- micro-batches das jogadas da ia ---
+
+    async def ai_move(self, session):
+        future = asyncio.get_running_loop().create_future()
+        self.pending[session.opponent].append((session, future, time.perf_counter()))
+        self.wakeup.set()
+        return await future
+
+    async def batcher(self):
+        # no máximo um lote em andamento por modelo; modelos diferentes não esperam uns pelos outros
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            await asyncio.sleep(self.tick) # janela do tick: junta as jogadas que chegarem nesse intervalo
+            for name in list(self.pending):
+                if name in self.running: continue
+                items = self.pending.pop(name)
+                self.running.add(name)
+                task = asyncio.create_task(self.run_batch(name, items))
+                self.batch_tasks.add(task)
+                task.add_done_callback(self.batch_tasks.discard)
+
+    async def run_batch(self, name, items):
+        try:
+            await self.compute_batch(name, items)
+        finally:
+            self.running.discard(name)
+            if self.pending.get(name): self.wakeup.set() # jogadas que chegaram durante o lote
+
+    async def compute_batch(self, name, items):
+        loop = asyncio.get_running_loop()
+        config = self.configs[name]
+        envs = [session.env for session, _, _ in items]
+        try:
+            if config['type'] == 'Minimax' and self.minimax_pool is not None:
+                task = (config['depth'], config.get('tablebase'), config.get('cache'))
+                results = await asyncio.gather(*(loop.run_in_executor(self.minimax_pool, minimax_act, task + (env,)) for env in envs))
+                actions = [action for action, _ in results]
+            elif config['type'] in ENV_AGENT_TYPES:
+                agent = self.get_agent(name)
+                actions = await loop.run_in_executor(self.executor(agent), lambda: [agent.act(env) for env in envs])
+            else:
+                # um forward pass para todas as sessões que esperam este modelo
+                agent = self.get_agent(name)
+                states = [env.get_features(env.get_player_turn()) for env in envs]
+                q_values = await loop.run_in_executor(self.executor(agent), batch_q_values, agent, states)
+                actions = np.argmax(q_values, axis=1)
+        except Exception as e:
+            for _, future, _ in items:
+                if not future.done(): future.set_exception(e)
+            return
+
+        self.batch_sizes[name].append(len(items))
+        now = time.perf_counter()
+        for (_, future, queued), action in zip(items, actions):
+            self.latencies[f'ai.{name}'].append(now - queued)
+            if not future.done(): future.set_result(int(action)) # a sessão pode ter desistido por timeout
+
+    async def play_ai(self, session):
+        # joga a ia até voltar a vez do humano (ela joga várias vezes seguidas se o humano passou)
+        actions = []
+        session.busy = True
+        try:
+            while not session.env.check_game_over()[0] and session.env.get_player_turn() == session.ai:
+                action = await asyncio.wait_for(self.ai_move(session), self.move_timeout)
+                session.env.act(action)
+                actions.append(action)
+        finally:
+            session.busy = False
+            session.last_active = time.monotonic()
+        if session.env.check_game_over()[0]: self.counts['games_finished'] += 1
+        return actions
+
+    # --- comandos ---
+
+    async def dispatch(self, request, owned):
+        cmd = request['cmd']
+        if cmd == 'models':
+            return {'ok': True, 'models': list(self.configs)}
+        if cmd == 'stats':
+            return dict(self.stats(), ok=True)
+        if cmd == 'new':
+            opponent = request['opponent']
+            if opponent not in self.configs: return {'ok': False, 'error': f'oponente desconhecido: {opponent}'}
+            seat = int(request.get('seat', 0))
+            if seat not in (0, 1): return {'ok': False, 'error': f'assento inválido: {seat} (0 ou 1)'}
+            seed = request.get('seed', int(np.random.default_rng().integers(2**31)))
+            session = Session(self.next_session_id, opponent, seat, seed)
+            self.next_session_id += 1
+            self.sessions[session.id] = session
+            owned.add(session.id)
+            self.counts['sessions'] += 1
+            return await self.reply_after_ai(session)
+
+        if cmd not in ('state', 'quit', 'move'): return {'ok': False, 'error': f'comando desconhecido: {cmd}'}
+        # cada conexão só mexe nas próprias sessões (os ids são sequenciais)
+        session = self.sessions.get(request.get('session')) if request.get('session') in owned else None
+        if session is None: return {'ok': False, 'error': 'sessão inexistente, expirada ou de outra conexão'}
+        session.last_active = time.monotonic()
+        if cmd == 'state':
+            return dict(session.state(), ok=True)
+        if cmd == 'quit':
+            self.close_session(session.id, owned)
+            return {'ok': True}
+        env, action = session.env, int(request['action'])
+        if env.check_game_over()[0] or env.get_player_turn() != session.human:
+            return {'ok': False, 'error': 'não é a sua vez'}
+        if not 0 <= action <= len(env.player_hands[session.human]):
+            return {'ok': False, 'error': f'ação inválida: {action}'}
+        env.act(action)
+        return await self.reply_after_ai(session)
+
+    async def reply_after_ai(self, session):
+        try:
+            actions = await self.play_ai(session)
+        except asyncio.TimeoutError:
+            self.counts['timeouts'] += 1
+            self.close_session(session.id)
+            return {'ok': False, 'error': f'a ia não respondeu em {self.move_timeout}s; sessão encerrada'}
+        return dict(session.state(), ok=True, ai_actions=actions)
+
+    def close_session(self, session_id, owned=None):
+        self.sessions.pop(session_id, None)
+        if owned is not None: owned.discard(session_id)
+
+    async def handle(self, reader, writer):
+        owned = set() # sessões abertas por esta conexão, fechadas quando ela cair
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+                start_time = time.perf_counter()
+                cmd = 'invalid'
+                try:
+                    request = json.loads(line)
+                    cmd = request['cmd']
+                    reply = await self.dispatch(request, owned)
+                except (ValueError, KeyError, TypeError) as e:
+                    reply = {'ok': False, 'error': f'requisição inválida: {e}'}
+                except Exception as e:
+                    reply = {'ok': False, 'error': str(e)}
+                if not reply['ok']: self.counts['errors'] += 1
+                writer.write((json.dumps(reply, ensure_ascii=False) + '\n').encode())
+                await writer.drain()
+                self.latencies[cmd].append(time.perf_counter() - start_time)
+        except ConnectionError:
+            pass
+        finally:
+            for session_id in list(owned): self.close_session(session_id)
+            writer.close()
+
+    async def reaper(self):
+        # fecha sessões paradas há mais de session_timeout segundos
+        while True:
+            await asyncio.sleep(1.0)
+            now = time.monotonic()
+            for session in list(self.sessions.values()):
+                if not session.busy and now - session.last_active > self.session_timeout:
+                    self.close_session(session.id)
+                    self.counts['timeouts'] += 1
+
+    def stats(self):
+        latency = {}
+        for name, values in self.latencies.items():
+            if not values: continue
+            ms = np.array(values) * 1000
+            latency[name] = {'count': len(ms), 'p50': float(np.percentile(ms, 50)), 'p90': float(np.percentile(ms, 90)),
+                             'p99': float(np.percentile(ms, 99)), 'max': float(ms.max())}
+        return {'active_sessions': len(self.sessions), 'counts': dict(self.counts), 'latency_ms': latency,
+                'mean_batch': {name: float(np.mean(sizes)) for name, sizes in self.batch_sizes.items()}}
+
+    async def reporter(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            stats = self.stats()
+            print(f'\n[{time.strftime("%H:%M:%S")}] Sessões ativas: {stats["active_sessions"]} | {stats["counts"]}')
+            for name, p in sorted(stats['latency_ms'].items()):
+                print(f'  {name:<24} n={p["count"]:<6} p50 {p["p50"]:7.1f}ms  p90 {p["p90"]:7.1f}ms  p99 {p["p99"]:7.1f}ms')
+            for name, size in stats['mean_batch'].items():
+                print(f'  lote médio {name}: {size:.1f}')
+
+    def close(self):
+        for executor in self.executors.values(): executor.shutdown()
+        if self.minimax_pool is not None: self.minimax_pool.shutdown()
+        for agent in self.agents.values():
+            if hasattr(agent, 'close'): agent.close()
+
+def load_valid_configs():
+    # os modelos do registro também ficam disponíveis como oponentes, pelo nome registrado
+    registry = get_registry()
+    models_config = dict(MODELS_CONFIG, **{name: {'model': name} for name in registry.names() if name not in MODELS_CONFIG})
+    valid_configs = {}
+    for name, config in models_config.items():
+        config = registry.resolve(config)
+        if config['type'] not in ENV_AGENT_TYPES and not os.path.exists(config['path']):
+            print(f'Aviso: {name} indisponível, arquivo {config["path"]} não encontrado')
+            continue
+        valid_configs[name] = config
+    return valid_configs
+
+async def serve(host, port, tick, minimax_workers, session_timeout, move_timeout, report_every):
+    server = GameServer(load_valid_configs(), tick, minimax_workers, session_timeout, move_timeout)
+    server.preload()
+    tcp_server = await asyncio.start_server(server.handle, host, port, limit=2**20)
+    tasks = [asyncio.create_task(server.batcher()), asyncio.create_task(server.reaper())]
+    if report_every > 0: tasks.append(asyncio.create_task(server.reporter(report_every)))
+    print(f'Servidor em {host}:{port} | Oponentes: {", ".join(server.configs)} | Minimax workers: {minimax_workers}')
+    try:
+        async with tcp_server: await tcp_server.serve_forever()
+    finally:
+        for task in tasks: task.cancel()
+        server.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Servidor asyncio com várias partidas humano vs IA simultâneas.')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--tick', type=float, default=0.005, help='janela (s) para juntar as jogadas da ia num lote')
+    parser.add_argument('--minimax-workers', type=int, default=1, help='processos do pool do minimax (0 = thread local)')
+    parser.add_argument('--session-timeout', type=float, default=300.0, help='fecha sessões paradas há mais de N segundos')
+    parser.add_argument('--move-timeout', type=float, default=30.0, help='tempo máximo para a ia responder')
+    parser.add_argument('--report-every', type=float, default=10.0, help='intervalo (s) do relatório de latência')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.tick, args.minimax_workers, args.session_timeout, args.move_timeout,
+                          args.report_every))
+    except KeyboardInterrupt:
+        print('\nServidor encerrado.')
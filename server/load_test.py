@@ -0,0 +1,81 @@
+import sys
+import json
+import time
+import asyncio
+import argparse
+import numpy as np
+
+async def request(reader, writer, message):
+    writer.write((json.dumps(message) + '\n').encode())
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+async def play_session(index, args, latencies, outcomes):
+    # um "humano" aleatório por conexão: cria a sessão, joga até o fim e mede o tempo de cada resposta
+    rng = np.random.default_rng(args.seed + index)
+    reader, writer = await asyncio.open_connection(args.host, args.port, limit=2**20)
+    try:
+        opponent = args.opponents[index % len(args.opponents)]
+        start_time = time.perf_counter()
+        state = await request(reader, writer, {'cmd': 'new', 'opponent': opponent, 'seat': index % 2, 'seed': args.seed + index})
+        latencies['new'].append(time.perf_counter() - start_time)
+
+        while state['ok'] and not state['game_over']:
+            if args.think > 0: await asyncio.sleep(rng.exponential(args.think))
+            action = int(rng.integers(len(state['hand']) + 1))
+            start_time = time.perf_counter()
+            state = await request(reader, writer, {'cmd': 'move', 'session': state['session'], 'action': action})
+            latencies['move'].append(time.perf_counter() - start_time)
+
+        outcomes['finished' if state['ok'] else 'errors'] += 1
+        if state['ok']: outcomes[state['result']] += 1
+    except (ConnectionError, json.JSONDecodeError):
+        outcomes['errors'] += 1
+    finally:
+        writer.close()
+
+async def run(args):
+    latencies = {'new': [], 'move': []}
+    outcomes = {'finished': 0, 'errors': 0, 'win': 0, 'loss': 0, 'tie': 0}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(index):
+        async with semaphore: await play_session(index, args, latencies, outcomes)
+
+    print(f'Simulando {args.sessions} sessões ({args.concurrency} simultâneas) contra {", ".join(args.opponents)}...')
+    start_time = time.perf_counter()
+    await asyncio.gather(*(limited(i) for i in range(args.sessions)))
+    elapsed = time.perf_counter() - start_time
+
+    print('\n' + '=' * 60)
+    print(f'Sessões concluídas: {outcomes["finished"]}/{args.sessions} | erros: {outcomes["errors"]} | {elapsed:.1f}s '
+          f'({outcomes["finished"] / elapsed:.1f} jogos/s, {len(latencies["move"]) / elapsed:.1f} jogadas/s)')
+    print(f'Resultado do humano aleatório: V {outcomes["win"]} / E {outcomes["tie"]} / D {outcomes["loss"]}')
+    for name, values in latencies.items():
+        if not values: continue
+        ms = np.array(values) * 1000
+        print(f'{name:<6} n={len(ms):<6} p50 {np.percentile(ms, 50):7.1f}ms  p90 {np.percentile(ms, 90):7.1f}ms  '
+              f'p99 {np.percentile(ms, 99):7.1f}ms  max {ms.max():7.1f}ms')
+
+    # percentis medidos no servidor (fila da ia, tamanho dos lotes)
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    stats = await request(reader, writer, {'cmd': 'stats'})
+    writer.close()
+    for name, p in sorted(stats['latency_ms'].items()):
+        if name.startswith('ai.'):
+            print(f'{name:<24} p50 {p["p50"]:7.1f}ms  p99 {p["p99"]:7.1f}ms | lote médio {stats["mean_batch"].get(name[3:], 0):.1f}')
+    print('=' * 60)
+    return outcomes['errors']
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Teste de carga do game_server.py com centenas de sessões simuladas.')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=200, help='sessões abertas ao mesmo tempo')
+    parser.add_argument('--opponents', nargs='+', default=['Minimax_Depth2'])
+    parser.add_argument('--think', type=float, default=0.05, help='tempo médio (s) de "pensamento" do humano simulado')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    sys.exit(1 if asyncio.run(run(args)) else 0)
@@ -0,0 +1,281 @@
+import os
+import sys
+import time
+import codecs
+import argparse
+from collections import deque
+
+# lê os csvs de métricas dos trainers (metrics_pro_*.csv) em blocos, sem carregar o arquivo inteiro.
+# os trainers gravam utf-8, mas os arquivos arquivados em metrics/ foram convertidos para utf-16 com bom e crlf
+COLUMNS = ['Episode', 'Epsilon', 'Winner', 'Turns', 'Total_Reward_P0', 'Duration_Sec', 'ELO_P0']
+# avaliações contra o minimax (train_pro*.py --eval-freq) vão para eval_<csv de métricas>, na mesma pasta
+EVAL_COLUMNS = ['Episode', 'Eval_Depth', 'Eval_Games', 'Eval_Wins', 'Eval_Ties', 'Eval_Losses', 'Eval_Score']
+CHUNK_SIZE = 1 << 20
+WINDOW = 500
+
+def detect_encoding(head):
+    # pelo bom; sem bom, bytes nulos alternados denunciam utf-16
+    if head.startswith(codecs.BOM_UTF8): return 'utf-8-sig'
+    if head.startswith(codecs.BOM_UTF16_LE) or head.startswith(codecs.BOM_UTF16_BE): return 'utf-16'
+    if len(head) >= 4 and head[1::2][:2] == b'\x00\x00': return 'utf-16-le'
+    if len(head) >= 4 and head[0::2][:2] == b'\x00\x00': return 'utf-16-be'
+    return 'utf-8'
+
+def eval_path(path):
+    return os.path.join(os.path.dirname(path), 'eval_' + os.path.basename(path))
+
+class MetricsReader:
+    # leitura incremental: guarda a posição, o decodificador e a linha incompleta do fim,
+    # então chamadas seguidas a rows() só leem o que foi acrescentado (modo --follow)
+    required = COLUMNS
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.restart()
+
+    def restart(self):
+        self.position = 0
+        self.encoding = None
+        self.decoder = None
+        self.pending = ''
+        self.columns = None
+
+    def rewritten(self):
+        # arquivo menor do que o já lido: o treino foi reiniciado e recriou o csv
+        return os.path.exists(self.path) and os.path.getsize(self.path) < self.position
+
+    def rows(self):
+        if not os.path.exists(self.path): return
+        with open(self.path, 'rb') as f:
+            if self.encoding is None:
+                head = f.read(4)
+                if len(head) < 4: return
+                self.encoding = detect_encoding(head)
+                self.decoder = codecs.getincrementaldecoder(self.encoding)()
+            f.seek(self.position)
+            while True:
+                data = f.read(self.chunk_size)
+                if not data: break
+                self.position += len(data)
+                lines = (self.pending + self.decoder.decode(data)).split('\n')
+                self.pending = lines.pop() # pode ser uma linha ainda sendo escrita
+                for line in lines:
+                    row = self.parse(line.rstrip('\r'))
+                    if row is not None: yield row
+
+    def parse(self, line):
+        if not line: return None
+        fields = line.split(',')
+        if self.columns is None:
+            missing = [c for c in self.required if c not in fields]
+            if missing: raise ValueError(f'{self.path}: não é um csv de métricas de treino (faltam {", ".join(missing)})')
+            self.columns = [fields.index(c) for c in self.required]
+            return None
+        return self.convert([fields[i] for i in self.columns])
+
+    def convert(self, values):
+        e, eps, w, t, r, d, elo = values
+        return int(e), float(eps), w, int(t), float(r), float(d), float(elo)
+
+class EvalReader(MetricsReader):
+    # eval_<csv>: uma linha por avaliação, (episódio, profundidade, jogos, vitórias, empates, derrotas, score)
+    required = EVAL_COLUMNS
+
+    def convert(self, values):
+        e, depth, games, wins, ties, losses, score = values
+        return int(e), int(depth), int(games), int(wins), int(ties), int(losses), float(score)
+
+class RollingWindow:
+    # estatísticas das últimas `size` linhas com somas corrigidas a cada entrada/saída (o(1) por linha);
+    # a inclinação do elo é a regressão linear de ELO_P0 sobre o episódio dentro da janela
+    def __init__(self, size=WINDOW):
+        self.rows = deque(maxlen=size)
+        self.wins = self.ties = self.timeouts = self.illegal = 0
+        self.reward = self.turns = 0.0
+        self.sx = self.sxx = 0
+        self.sy = self.sxy = 0.0
+
+    def update(self, row, sign):
+        e, _, w, t, r, _, elo = row
+        self.wins += sign * (w == '0')
+        self.ties += sign * (w == 'Tie')
+        self.timeouts += sign * (w == 'Timeout')
+        self.illegal += sign * (w == 'Illegal')
+        self.reward += sign * r
+        self.turns += sign * t
+        self.sx += sign * e
+        self.sxx += sign * e * e
+        self.sy += sign * elo
+        self.sxy += sign * e * elo
+
+    def push(self, row):
+        if len(self.rows) == self.rows.maxlen: self.update(self.rows[0], -1)
+        self.rows.append(row)
+        self.update(row, 1)
+
+    def __len__(self): return len(self.rows)
+    @property
+    def episode(self): return self.rows[-1][0]
+    @property
+    def win_rate(self): return self.wins / len(self.rows)
+    @property
+    def mean_reward(self): return self.reward / len(self.rows)
+    @property
+    def mean_turns(self): return self.turns / len(self.rows)
+
+    @property
+    def elo_slope(self):
+        # pontos de elo por 1000 episódios
+        n = len(self.rows)
+        var = n * self.sxx - self.sx * self.sx
+        return 1000 * (n * self.sxy - self.sx * self.sy) / var if var > 0 else 0.0
+
+    @property
+    def episodes_per_sec(self):
+        first, last = self.rows[0], self.rows[-1]
+        elapsed = last[5] - first[5]
+        return (last[0] - first[0]) / elapsed if elapsed > 0 else 0.0
+
+class RunSummary:
+    # acumulados do treino inteiro mais a janela móvel e o melhor trecho visto
+    def __init__(self, path, window=WINDOW):
+        self.path = path
+        self.window_size = window
+        self.reset()
+
+    def reset(self):
+        self.reader = MetricsReader(self.path)
+        self.eval_reader = EvalReader(eval_path(self.path))
+        self.eval_queue = deque() # avaliações lidas cujo episódio ainda não apareceu nas métricas
+        self.last_eval = self.best_eval = None
+        self.window = RollingWindow(self.window_size)
+        self.episodes = self.wins = 0
+        self.reward = 0.0
+        self.last = None
+        self.peak_elo = float('-inf')
+        self.best_win_rate, self.best_episode = 0.0, None
+
+    def consume(self, every=0):
+        if self.reader.rewritten() or self.eval_reader.rewritten():
+            print(f'{self.path} foi reescrito, recomeçando do início')
+            self.reset()
+        # as avaliações terminam depois do episódio avaliado: cada uma entra quando a linha dele é lida
+        self.eval_queue.extend(self.eval_reader.rows())
+        count = 0
+        for row in self.reader.rows():
+            while self.eval_queue and self.eval_queue[0][0] <= row[0]: self.add_eval(self.eval_queue.popleft())
+            self.window.push(row)
+            self.episodes += 1
+            self.wins += row[2] == '0'
+            self.reward += row[4]
+            self.peak_elo = max(self.peak_elo, row[6])
+            self.last = row
+            if len(self.window) == self.window.rows.maxlen and self.window.win_rate > self.best_win_rate:
+                self.best_win_rate, self.best_episode = self.window.win_rate, row[0]
+            if every and row[0] % every == 0: print_progress(self.window, row, self.last_eval)
+            count += 1
+        return count
+
+    def add_eval(self, row):
+        self.last_eval = row
+        if self.best_eval is None or row[6] > self.best_eval[6]: self.best_eval = row
+
+    def columns(self):
+        if self.last is None: return {}
+        w = self.window
+        return {
+            'Episódios': f'{self.episodes}',
+            'Vitórias (total)': f'{100 * self.wins / self.episodes:.1f}%',
+            'Vitórias (janela)': f'{100 * w.win_rate:.1f}%',
+            'Melhor janela': f'{100 * self.best_win_rate:.1f}% @ {self.best_episode}' if self.best_episode else '-',
+            'Recompensa média': f'{self.reward / self.episodes:.2f}',
+            'Recompensa (janela)': f'{w.mean_reward:.2f}',
+            'Turnos (janela)': f'{w.mean_turns:.1f}',
+            'ELO final': f'{self.last[6]:.0f}',
+            'ELO máximo': f'{self.peak_elo:.0f}',
+            'Inclinação ELO/1000 ep': f'{w.elo_slope:+.1f}',
+            'Avaliação (última)': f'{self.last_eval[6]:.3f} @ {self.last_eval[0]}' if self.last_eval else '-',
+            'Melhor avaliação': f'{self.best_eval[6]:.3f} @ {self.best_eval[0]}' if self.best_eval else '-',
+            'Epsilon': f'{self.last[1]:.3f}',
+            'Timeouts/ilegais (janela)': f'{w.timeouts}/{w.illegal}',
+            'Ep/s (janela)': f'{w.episodes_per_sec:.2f}',
+            'Duração': f'{self.last[5] / 3600:.1f}h',
+        }
+
+def eval_label(row):
+    # score contra o minimax da última avaliação até aqui
+    return f' | aval. d{row[1]} {row[6]:.3f} (ep {row[0]})' if row else ''
+
+def print_progress(window, row, last_eval=None):
+    print(f'Ep {row[0]:>8} | vitórias {100 * window.win_rate:5.1f}% | R {window.mean_reward:6.2f} | '
+          f'ELO {row[6]:7.1f} ({window.elo_slope:+6.1f}/1000 ep) | ε {row[1]:.3f} | {window.episodes_per_sec:6.2f} ep/s'
+          + eval_label(last_eval))
+
+def print_comparison(runs):
+    names = [os.path.basename(run.path) for run in runs]
+    table = [run.columns() for run in runs]
+    labels = next((list(t) for t in table if t), [])
+    width = max([len(label) for label in labels] + [10])
+    widths = [max(len(name), 12) for name in names]
+    print(f'{"":<{width}}  ' + '  '.join(f'{name:>{w}}' for name, w in zip(names, widths)))
+    for label in labels:
+        print(f'{label:<{width}}  ' + '  '.join(f'{t.get(label, "-"):>{w}}' for t, w in zip(table, widths)))
+
+def follow(path, window, interval):
+    # acompanha um treino em andamento: só imprime quando chegam linhas novas, com a variação desde a última
+    run = RunSummary(path, window)
+    run.consume()
+    if run.last is not None:
+        print(f'{path}: {run.episodes} episódios até agora ({run.reader.encoding})')
+        print_progress(run.window, run.last, run.last_eval)
+    else:
+        print(f'Aguardando linhas em {path}...')
+    previous = (run.window.win_rate, run.window.mean_reward, run.last[6]) if run.last else None
+    try:
+        while True:
+            time.sleep(interval)
+            new_rows = run.consume()
+            if not new_rows: continue
+            w, row = run.window, run.last
+            line = f'Ep {row[0]:>8} (+{new_rows}) | vitórias {100 * w.win_rate:5.1f}%'
+            if previous is not None:
+                line += (f' ({100 * (w.win_rate - previous[0]):+.1f}) | R {w.mean_reward:6.2f} ({w.mean_reward - previous[1]:+.2f}) | '
+                         f'ELO {row[6]:7.1f} ({row[6] - previous[2]:+.1f})')
+            else:
+                line += f' | R {w.mean_reward:6.2f} | ELO {row[6]:7.1f}'
+            print(line + f' | {w.elo_slope:+.1f}/1000 ep | ε {row[1]:.3f} | {w.episodes_per_sec:.2f} ep/s' + eval_label(run.last_eval), flush=True)
+            previous = (w.win_rate, w.mean_reward, row[6])
+    except KeyboardInterrupt:
+        print()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Análise em streaming dos csvs de métricas dos trainers (utf-8 ou utf-16).')
+    parser.add_argument('files', nargs='+', help='metrics_pro_*.csv; com mais de um, compara os treinos lado a lado')
+    parser.add_argument('--window', type=int, default=WINDOW, help='episódios na janela móvel')
+    parser.add_argument('--every', type=int, default=None, help='imprime a janela a cada N episódios (padrão: 1000 com um arquivo só)')
+    parser.add_argument('--follow', action='store_true', help='acompanha um treino em andamento (como tail -f)')
+    parser.add_argument('--interval', type=float, default=2.0, help='segundos entre leituras no --follow')
+    args = parser.parse_args()
+
+    if args.follow:
+        if len(args.files) != 1: parser.error('--follow acompanha um arquivo só')
+        follow(args.files[0], args.window, args.interval)
+        sys.exit(0)
+
+    every = args.every if args.every is not None else (1000 if len(args.files) == 1 else 0)
+    runs = []
+    for path in args.files:
+        run = RunSummary(path, args.window)
+        start_time = time.perf_counter()
+        if every: print(f'--- {path} ---')
+        try:
+            run.consume(every)
+        except ValueError as error:
+            print(f'ERRO: {error}')
+            continue
+        print(f'{path}: {run.episodes} linhas ({run.reader.encoding}) em {time.perf_counter() - start_time:.2f}s')
+        runs.append(run)
+    if runs:
+        print()
+        print_comparison(runs)
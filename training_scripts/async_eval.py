@@ -0,0 +1,120 @@
+import csv
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from tournament_core import game_seed, play_game, configure_worker_threads, GwentLite, DuelingAgent, MinimaxAgent, MinimaxCache
+
+MAX_PENDING = 2 # snapshots na fila (um avaliando, um esperando); cada um é uma cópia inteira dos pesos
+
+# --- estado do processo de avaliação ---
+_eval = {}
+
+def init_eval_worker(state_size, action_size, double_dqn, depth, max_turns):
+    configure_worker_threads()
+    # a avaliação roda só na cpu: a gpu (e a memória dela) fica inteira para o processo de treino
+    try:
+        import tensorflow as tf
+        tf.config.set_visible_devices([], 'GPU')
+    except (ImportError, RuntimeError):
+        pass
+    _eval['env'] = GwentLite()
+    _eval['agent'] = DuelingAgent(state_size, action_size, double_dqn=double_dqn)
+    _eval['agent'].epsilon = 0.0
+    # os deals são os mesmos em toda avaliação: as decisões do minimax se repetem entre snapshots
+    _eval['minimax'] = MinimaxAgent(depth=depth, cache=MinimaxCache(max_entries=200_000))
+    _eval['depth'] = depth
+    _eval['max_turns'] = max_turns
+
+def evaluate_snapshot(task):
+    # joga cada deal nos dois assentos contra o minimax, com os pesos do snapshot
+    episode, weights, games, seed = task
+    agent, minimax, env = _eval['agent'], _eval['minimax'], _eval['env']
+    agent.model.set_weights(weights)
+
+    names = ('Agent', 'Minimax')
+    agent_config, minimax_config = {'type': 'DQN'}, {'type': 'Minimax', 'depth': _eval['depth']}
+    wins = ties = losses = 0
+    for i in range(games):
+        seed_i = game_seed(seed, None, None, i, duplicate=True)
+        for agent_seat in (0, 1):
+            if agent_seat == 0: record = play_game(env, names, (agent, minimax), (agent_config, minimax_config), seed_i, _eval['max_turns'])
+            else: record = play_game(env, names[::-1], (minimax, agent), (minimax_config, agent_config), seed_i, _eval['max_turns'])
+            if record['winner'] == 'Agent': wins += 1
+            elif record['winner'] == 'Minimax': losses += 1
+            else: ties += 1
+
+    total = wins + ties + losses
+    return {'episode': episode, 'games': total, 'wins': wins, 'ties': ties, 'losses': losses,
+            'score': (wins + ties / 2) / total, 'depth': _eval['depth']}
+
+class AsyncEvaluator:
+    # avalia snapshots de pesos contra o minimax num processo à parte; o loop de treino só
+    # chama submit() e poll(), que nunca bloqueiam
+    def __init__(self, state_size, action_size, double_dqn, depth, games, metrics_file, seed=0, max_turns=100):
+        self.games = games
+        self.seed = seed
+        self.metrics_file = metrics_file
+        self.pending = {} # episode -> (future, pesos)
+        self.skipped = 0
+        self.best_score = -1.0
+        self.best_episode = None
+        self.evals_without_improvement = 0
+
+        ctx = multiprocessing.get_context('spawn') # tensorflow não é seguro com fork
+        self.executor = ProcessPoolExecutor(max_workers=1, mp_context=ctx, initializer=init_eval_worker,
+                                            initargs=(state_size, action_size, double_dqn, depth, max_turns))
+
+        with open(self.metrics_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Episode', 'Eval_Depth', 'Eval_Games', 'Eval_Wins', 'Eval_Ties', 'Eval_Losses', 'Eval_Score'])
+
+    def submit(self, episode, model):
+        # os pesos vão como cópia em memória (model.get_weights()), sem tocar o disco. se a avaliação
+        # está mais lenta que o treino, o snapshot é pulado em vez de acumular cópias sem limite
+        if len(self.pending) >= MAX_PENDING:
+            self.skipped += 1
+            return False
+        weights = model.get_weights()
+        future = self.executor.submit(evaluate_snapshot, (episode, weights, self.games, self.seed))
+        self.pending[episode] = (future, weights)
+        return True
+
+    def poll(self, wait=False):
+        # devolve [(resultado, pesos, é_o_melhor)] das avaliações terminadas, em ordem de episódio
+        finished = []
+        for episode in sorted(self.pending):
+            future, weights = self.pending[episode]
+            if not wait and not future.done(): break # mantém a ordem de episódios no csv
+            result = future.result()
+            del self.pending[episode]
+
+            is_best = result['score'] > self.best_score
+            if is_best:
+                self.best_score, self.best_episode = result['score'], episode
+                self.evals_without_improvement = 0
+            else:
+                self.evals_without_improvement += 1
+
+            with open(self.metrics_file, 'a', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow([episode, result['depth'], result['games'], result['wins'], result['ties'], result['losses'], f'{result["score"]:.4f}'])
+            finished.append((result, weights, is_best))
+        return finished
+
+    def close(self):
+        finished = self.poll(wait=True)
+        self.executor.shutdown()
+        return finished
+
+def save_snapshot(agent, weights, path):
+    # salva um snapshot antigo sem perder os pesos atuais do treino
+    current = agent.model.get_weights()
+    agent.model.set_weights(weights)
+    agent.save(path)
+    agent.model.set_weights(current)
+
+def report_results(finished, agent, best_path):
+    for result, weights, is_best in finished:
+        print(f">> Avaliação Ep {result['episode']} vs Minimax d{result['depth']}: score {result['score']:.3f} "
+              f"(V {result['wins']} / E {result['ties']} / D {result['losses']})" + (' [melhor]' if is_best else ''))
+        if is_best: save_snapshot(agent, weights, best_path)
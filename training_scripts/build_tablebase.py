@@ -0,0 +1,41 @@
+import sys
+import time
+import argparse
+
+sys.path.insert(0, '.')
+sys.path.insert(0, 'games')
+sys.path.insert(0, 'agents')
+from GwentLite import GwentLite, RULES_VERSION
+from endgame_tablebase import EndgameSolver, EndgameTablebase, is_endgame
+
+def build(output_dir, games, seed, max_cards):
+    # as cartas vão de 1 a 76, então enumerar todas as mãos possíveis é inviável: o solver parte das
+    # posições de round final que aparecem em jogos aleatórios e guarda a subárvore inteira de cada uma
+    env = GwentLite()
+    solver = EndgameSolver()
+    roots = 0
+    start_time = time.time()
+
+    for i in range(games):
+        env.reset(seed=seed + i)
+        while not env.check_game_over()[0]:
+            if is_endgame(env) and len(env.player_hands[0]) + len(env.player_hands[1]) <= max_cards:
+                solver.solve(env)
+                roots += 1
+            env.act(int(env.sample_legal_move()))
+
+        if (i + 1) % 100 == 0:
+            print(f'Jogo {i + 1}/{games} | {roots} raízes | {len(solver.memo)} posições | {time.time() - start_time:.1f}s')
+
+    EndgameTablebase.write(output_dir, solver.memo, rules=RULES_VERSION, max_cards=max_cards, games=games, seed=seed)
+    print(f'Tablebase salva em {output_dir}: {len(solver.memo)} posições de {roots} raízes ({time.time() - start_time:.1f}s)')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gera a tablebase exata de posições do round final.')
+    parser.add_argument('output', help='pasta da tablebase')
+    parser.add_argument('--games', type=int, default=1000, help='jogos aleatórios usados para achar posições de round final')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-cards', type=int, default=8, help='máximo de cartas somando as duas mãos')
+    args = parser.parse_args()
+
+    build(args.output, args.games, args.seed, args.max_cards)
@@ -0,0 +1,127 @@
+import os
+import time
+import argparse
+import numpy as np
+
+from tournament_core import load_agent, play_game, game_seed, GwentLite
+from student_agent import StudentAgent
+
+MAX_TURNS = 100
+
+def generate_corpus(teacher, games, seed, explore):
+    # jogos semeados jogados pelo próprio professor (com jogadas aleatórias para sair da linha principal),
+    # todos andando juntos: um forward pass por tick para todas as partidas
+    envs = []
+    for i in range(games):
+        env = GwentLite()
+        env.reset(seed=seed + i)
+        envs.append(env)
+    rng = np.random.default_rng(seed)
+
+    states = []
+    active = list(range(games))
+    turns = 0
+    while active and turns < MAX_TURNS:
+        batch = np.concatenate([envs[g].get_features(envs[g].get_player_turn()) for g in active], axis=0)
+        actions = np.argmax(np.asarray(teacher.model.predict_on_batch(batch)), axis=1)
+        states.append(batch)
+        for g, action in zip(list(active), actions):
+            env = envs[g]
+            if rng.random() < explore: action = env.sample_legal_move()
+            env.act(int(action))
+            if env.check_game_over()[0]: active.remove(g)
+        turns += 1
+    return np.concatenate(states).astype(np.float32)
+
+def us_per_move(act, states):
+    start_time = time.perf_counter()
+    for state in states: act(state.reshape(1, -1))
+    return (time.perf_counter() - start_time) / len(states) * 1e6
+
+def us_per_state_batched(q_values, states):
+    start_time = time.perf_counter()
+    q_values(states)
+    return (time.perf_counter() - start_time) / len(states) * 1e6
+
+def play_match(student, teacher, games, seed):
+    # cada deal nos dois assentos; score do aluno contra o professor
+    env = GwentLite()
+    names = ('Student', 'Teacher')
+    config = {'type': 'DQN'}
+    wins = ties = losses = 0
+    for i in range(games):
+        deal = game_seed(seed, None, None, i, duplicate=True)
+        for record in (play_game(env, names, (student, teacher), (config, config), deal, MAX_TURNS),
+                       play_game(env, names[::-1], (teacher, student), (config, config), deal, MAX_TURNS)):
+            if record['winner'] == 'Student': wins += 1
+            elif record['winner'] == 'Teacher': losses += 1
+            else: ties += 1
+    return wins, ties, losses
+
+def distill(teacher_path, teacher_type, output, hidden_size, games, explore, epochs, batch_size, eval_games, seed):
+    env = GwentLite()
+    state_size, action_size = env.get_observation_shape(), env.get_action_space_size()
+    teacher = load_agent('Teacher', {'type': teacher_type, 'path': teacher_path, 'arch': 'dueling'}, state_size, action_size)
+    if teacher is None: return
+
+    print(f'Gerando corpus com {games} jogos semeados...')
+    states = generate_corpus(teacher, games, seed, explore)
+    targets = np.asarray(teacher.model.predict(states, batch_size=4096, verbose=0))
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(states))
+    val_size = max(1, len(order) // 10)
+    val_idx, train_idx = order[:val_size], order[val_size:]
+    print(f'Corpus: {len(train_idx)} estados de treino, {val_size} de validação')
+
+    # o aluno aprende os q-valores do professor (mse), o que também preserva o argmax
+    student = StudentAgent(state_size, action_size, hidden_size=hidden_size)
+    for epoch in range(1, epochs + 1):
+        history = student.model.fit(states[train_idx], targets[train_idx], batch_size=batch_size, epochs=1, verbose=0, shuffle=True)
+        if epoch % 5 == 0 or epoch == epochs:
+            student.refresh()
+            agreement = np.mean(np.argmax(student.q_values(states[val_idx]), axis=1) == np.argmax(targets[val_idx], axis=1))
+            print(f'Época {epoch}/{epochs} | loss {history.history["loss"][0]:.4f} | concordância: {agreement:.3f}')
+    student.refresh()
+
+    output_dir = os.path.dirname(output)
+    if output_dir and not os.path.exists(output_dir): os.makedirs(output_dir)
+    student.save(output)
+
+    # --- relatório ---
+    agreement = np.mean(np.argmax(student.q_values(states[val_idx]), axis=1) == np.argmax(targets[val_idx], axis=1))
+    timing_states = states[val_idx[:200]]
+    teacher_us = us_per_move(teacher.act, timing_states)
+    student_us = us_per_move(student.act, timing_states)
+    teacher_batch_us = us_per_state_batched(teacher.model.predict_on_batch, states[val_idx])
+    student_batch_us = us_per_state_batched(student.q_values, states[val_idx])
+    wins, ties, losses = play_match(student, teacher, eval_games, seed)
+    total = wins + ties + losses
+
+    print('\n' + '=' * 60)
+    print(f'Aluno salvo em {output} ({state_size}->{hidden_size}->{action_size})')
+    print(f'Concordância de ação com o professor: {agreement:.3f}')
+    print(f'Aluno vs professor: {(wins + ties / 2) / total:.3f} (V {wins} / E {ties} / D {losses}, {eval_games} deals x 2 assentos)')
+    print(f'{"":<12} {"µs/jogada":>10} {"µs/estado (lote)":>18}')
+    print(f'{"Professor":<12} {teacher_us:>10.1f} {teacher_batch_us:>18.2f}')
+    print(f'{"Aluno":<12} {student_us:>10.1f} {student_batch_us:>18.2f}')
+    print('=' * 60)
+    print(f"No MODELS_CONFIG: {{'type': 'DQN', 'arch': 'student', 'hidden_size': {hidden_size}, 'path': '{output}'}}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Destila um DuelingAgent treinado numa rede pequena.')
+    parser.add_argument('teacher', help='checkpoint .weights.h5 do DuelingAgent')
+    parser.add_argument('--type', type=str, choices=['DQN', 'DDQN'], default='DDQN')
+    parser.add_argument('--output', type=str, default=None, help='padrão: <professor>_student.weights.h5')
+    parser.add_argument('--hidden-size', type=int, default=64)
+    parser.add_argument('--games', type=int, default=2000, help='jogos semeados do corpus de estados')
+    parser.add_argument('--explore', type=float, default=0.2)
+    parser.add_argument('--epochs', type=int, default=30)
+    parser.add_argument('--batch-size', type=int, default=512)
+    parser.add_argument('--eval-games', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    output = args.output or args.teacher.replace('.weights.h5', '_student.weights.h5')
+    distill(args.teacher, args.type, output, args.hidden_size, args.games, args.explore, args.epochs, args.batch_size,
+            args.eval_games, args.seed)
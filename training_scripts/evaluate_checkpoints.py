@@ -0,0 +1,127 @@
+import os
+import re
+import csv
+import time
+import argparse
+import numpy as np
+
+from tournament_core import ShardRunner
+from sharding import add_shard_arguments, shard_items, shard_path
+
+MAX_TURNS = 100
+CHECKPOINT_PATTERN = re.compile(r'^(?P<name>.+)_(?P<episode>\d+)\.weights\.h5$')
+
+def find_checkpoints(directory):
+    # {model_name}_{e}.weights.h5, como os trainers salvam a cada SAVE_MODEL_FREQ episódios
+    checkpoints = []
+    for filename in os.listdir(directory):
+        match = CHECKPOINT_PATTERN.match(filename)
+        if match: checkpoints.append((int(match.group('episode')), match.group('name'), os.path.join(directory, filename)))
+    return sorted(checkpoints)
+
+def build_configs(checkpoints, arch, minimax_depth, minimax_cache=None):
+    # cada checkpoint vira um "modelo" do torneio; sem arch explícito, a arquitetura vem do registro
+    # de modelos (ou das camadas gravadas no próprio arquivo)
+    configs = {}
+    for episode, name, path in checkpoints:
+        model_type = 'DDQN' if name.upper().startswith('DDQN') else 'DQN'
+        configs[f'{name}_{episode}'] = {'type': model_type, 'path': path, 'episode': episode}
+        if arch: configs[f'{name}_{episode}']['arch'] = arch
+
+    minimax = {'type': 'Minimax', 'path': None, 'depth': minimax_depth}
+    if minimax_cache: minimax['cache'] = minimax_cache
+    baselines = {f'Minimax_Depth{minimax_depth}': minimax,
+                 'Random': {'type': 'Random', 'path': None}}
+    return configs, baselines
+
+def make_sweep_shards(checkpoint_names, baseline_names, games, chunk_size):
+    # cada deal é jogado nos dois assentos; as fatias de um mesmo checkpoint ficam juntas
+    # para que o worker que o carregou jogue o máximo possível com ele
+    shards = []
+    for checkpoint in checkpoint_names:
+        for baseline in baseline_names:
+            for start in range(0, games, chunk_size):
+                indices = list(range(start, min(start + chunk_size, games)))
+                shards.append((checkpoint, baseline, indices))
+                shards.append((baseline, checkpoint, indices))
+    return shards
+
+def summarize(checkpoint, baseline, records):
+    by_deal = {}
+    wins = ties = losses = 0
+    for record in records:
+        score = 1.0 if record['winner'] == checkpoint else (0.0 if record['winner'] == baseline else 0.5)
+        if score == 1.0: wins += 1
+        elif score == 0.0: losses += 1
+        else: ties += 1
+        by_deal.setdefault(record['game'], []).append(score)
+
+    # score duplicado: média dos dois assentos do mesmo deal
+    pair_scores = np.array([np.mean(scores) for scores in by_deal.values()])
+    stderr = pair_scores.std(ddof=1) / np.sqrt(len(pair_scores)) if len(pair_scores) > 1 else float('nan')
+    return wins, ties, losses, pair_scores.mean(), stderr
+
+def run_sweep(directory, output_file, games, minimax_depth, workers, seed, arch, chunk_size, lockstep, minimax_cache=None,
+              shard_index=0, num_shards=1):
+    # com shards, cada execução avalia uma fatia fixa dos checkpoints (os deals são os mesmos em todas)
+    checkpoints = find_checkpoints(directory)
+    if not checkpoints:
+        print(f'Nenhum checkpoint encontrado em {directory}')
+        return
+    checkpoints = shard_items(checkpoints, shard_index, num_shards)
+
+    configs, baselines = build_configs(checkpoints, arch, minimax_depth, minimax_cache)
+    all_configs = {**configs, **baselines}
+    shards = make_sweep_shards(list(configs), list(baselines), games, chunk_size or games)
+
+    print('-' * 60)
+    print(f'AVALIAÇÃO DE CHECKPOINTS: {directory}')
+    print(f'{len(configs)} checkpoints x {len(baselines)} baselines x {games} deals x 2 assentos, Workers: {workers}')
+    if num_shards > 1: print(f'Shard {shard_index + 1}/{num_shards} -> {output_file}')
+    print('-' * 60)
+
+    start_time = time.time()
+    results = {}
+    # deals compartilhados por todos os checkpoints (modo duplicado): as curvas são comparáveis ponto a ponto
+    with ShardRunner(all_configs, workers, seed, MAX_TURNS, lockstep=lockstep, duplicate=True) as runner:
+        for records in runner.imap(shards):
+            for record in records:
+                checkpoint = record['p0'] if record['p0'] in configs else record['p1']
+                baseline = record['p1'] if checkpoint == record['p0'] else record['p0']
+                results.setdefault((checkpoint, baseline), []).append(record)
+
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Checkpoint', 'Episode', 'Baseline', 'Games', 'Wins', 'Ties', 'Losses', 'Score', 'Score_Stderr'])
+        for name, config in configs.items():
+            line = f'Ep {config["episode"]:>6}'
+            for baseline in baselines:
+                if (name, baseline) not in results: # um dos modelos não carregou
+                    line += f' | {baseline}: pulado'
+                    continue
+                wins, ties, losses, score, stderr = summarize(name, baseline, results[(name, baseline)])
+                writer.writerow([name, config['episode'], baseline, wins + ties + losses, wins, ties, losses, f'{score:.4f}', f'{stderr:.4f}'])
+                line += f' | {baseline}: {score:.3f} ± {stderr:.3f}'
+            print(line)
+
+    print(f'\nCurva de aprendizado salva em {output_file} ({time.time() - start_time:.1f}s)')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Avalia todos os checkpoints de um treino contra baselines fixos.')
+    parser.add_argument('directory', help='pasta com {model_name}_{e}.weights.h5')
+    parser.add_argument('--output', type=str, default=None, help='csv da curva (padrão: learning_curve_<pasta>.csv)')
+    parser.add_argument('--games', type=int, default=50, help='deals por checkpoint e baseline (cada um jogado 2x)')
+    parser.add_argument('--minimax-depth', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--arch', choices=['dueling', 'dense', 'student'], default=None, help='padrão: lida dos arquivos')
+    parser.add_argument('--chunk-size', type=int, default=None, help='deals por fatia (padrão: todos)')
+    parser.add_argument('--lockstep', action='store_true')
+    parser.add_argument('--minimax-cache', type=str, default=None, help='cache persistente de decisões do minimax')
+    add_shard_arguments(parser)
+    args = parser.parse_args()
+    if args.games < 1: parser.error('--games precisa ser pelo menos 1')
+
+    output_file = args.output or f'learning_curve_{os.path.basename(os.path.normpath(args.directory))}.csv'
+    run_sweep(args.directory, shard_path(output_file, args.shard_index, args.num_shards), args.games, args.minimax_depth,
+              args.workers, args.seed, args.arch, args.chunk_size, args.lockstep, args.minimax_cache, args.shard_index, args.num_shards)
@@ -0,0 +1,212 @@
+import os
+import sys
+import glob
+import argparse
+import numpy as np
+
+sys.path.insert(0, '.')
+sys.path.insert(0, 'games')
+sys.path.insert(0, 'training_scripts')
+from GwentLite import GwentLite
+from results_store import ResultsStore, TERMINATIONS
+
+# uma partida é reconstruível a partir da seed do deal (o reset sorteia decks, mãos e quem começa
+# com o rng do ambiente) e da sequência de ações. as ações vão de 0 a 10, então cabem em 4 bits:
+# duas por byte. índices fora da mão valem como passe no GwentLite, por isso 15 substitui qualquer
+# ação maior sem mudar a partida.
+INDEX_DTYPE = np.dtype([
+    ('offset', '<u4'),       # posição das ações no arquivo de dados do chunk
+    ('first_player', 'u1'),  # quem abriu o round 1 (conferido no replay)
+])
+
+CHUNK_BYTES = 16 * 2**20 # um chunk novo começa quando o arquivo de dados passa deste tamanho
+MAX_ACTION = 15
+
+def pack_actions(actions):
+    codes = np.minimum(np.asarray(actions, dtype=np.int64), MAX_ACTION).astype(np.uint8)
+    if len(codes) % 2: codes = np.append(codes, np.uint8(0))
+    return (codes[0::2] | (codes[1::2] << 4)).tobytes()
+
+def unpack_actions(data, count):
+    packed = np.frombuffer(data, dtype=np.uint8)
+    codes = np.empty(2 * len(packed), dtype=np.uint8)
+    codes[0::2], codes[1::2] = packed & 0x0F, packed >> 4
+    return codes[:count].tolist()
+
+class GameRecordStore(ResultsStore):
+    # ResultsStore (models.json + games.bin, então ratings.py funciona sobre a mesma pasta) com as
+    # jogadas de cada partida em chunks append-only: records_NNNNN.bin guarda as ações empacotadas e
+    # records_NNNNN.idx uma linha de tamanho fixo por partida, na mesma ordem do games.bin.
+    # games.bin é o índice por modelo, resultado e tamanho; o .idx só aponta para as ações.
+    def __init__(self, directory, chunk_bytes=CHUNK_BYTES):
+        super().__init__(directory)
+        self.chunk_bytes = chunk_bytes
+        self.chunks = sorted(glob.glob(os.path.join(directory, 'records_*.idx')))
+        self._index = None
+        self.repair()
+
+    def chunk_files(self, chunk):
+        base = os.path.join(self.directory, f'records_{chunk:05d}')
+        return base + '.bin', base + '.idx'
+
+    def repair(self):
+        # a ordem de escrita é dados -> .idx -> games.bin; se o processo morreu no meio, as linhas do
+        # .idx sem partida correspondente no games.bin são descartadas (bytes órfãos nos dados não atrapalham)
+        games = len(self.load())
+        for idx_file in self.chunks:
+            rows = os.path.getsize(idx_file) // INDEX_DTYPE.itemsize
+            keep = min(rows, games)
+            if keep * INDEX_DTYPE.itemsize != os.path.getsize(idx_file):
+                with open(idx_file, 'r+b') as f: f.truncate(keep * INDEX_DTYPE.itemsize)
+            games -= keep
+
+    def append(self, records):
+        if not records: return
+        chunk = max(len(self.chunks) - 1, 0)
+        data_file, idx_file = self.chunk_files(chunk)
+        if os.path.exists(data_file) and os.path.getsize(data_file) >= self.chunk_bytes:
+            chunk += 1
+            data_file, idx_file = self.chunk_files(chunk)
+        if idx_file not in self.chunks: self.chunks.append(idx_file)
+
+        index = np.zeros(len(records), dtype=INDEX_DTYPE)
+        blobs = []
+        offset = os.path.getsize(data_file) if os.path.exists(data_file) else 0
+        for i, record in enumerate(records):
+            blob = pack_actions(record['actions'])
+            index[i] = (offset, record['first_player'])
+            blobs.append(blob)
+            offset += len(blob)
+
+        with open(data_file, 'ab') as f: f.write(b''.join(blobs))
+        with open(idx_file, 'ab') as f: f.write(index.tobytes())
+        super().append(records)
+        self._index = None
+
+    def index(self):
+        # linhas do games.bin com o chunk e a posição das ações de cada partida
+        if self._index is None:
+            games = self.load()
+            parts = []
+            for chunk, idx_file in enumerate(self.chunks):
+                count = os.path.getsize(idx_file) // INDEX_DTYPE.itemsize
+                part = np.fromfile(idx_file, dtype=INDEX_DTYPE, count=count)
+                parts.append((np.full(count, chunk, dtype=np.uint16), part))
+            chunks = np.concatenate([c for c, _ in parts]) if parts else np.zeros(0, dtype=np.uint16)
+            index = np.concatenate([p for _, p in parts]) if parts else np.zeros(0, dtype=INDEX_DTYPE)
+            count = min(len(games), len(index))
+            self._index = games[:count], chunks[:count], index[:count]
+        return self._index
+
+    def query(self, model=None, outcome=None, min_length=None, max_length=None, termination=None):
+        # números das partidas que casam com o filtro; outcome ('win', 'loss', 'tie') é do ponto de vista de model
+        games, _, _ = self.index()
+        mask = np.ones(len(games), dtype=bool)
+        if model is not None:
+            if model not in self.model_ids: return np.zeros(0, dtype=np.int64)
+            model_id = self.model_ids[model]
+            seat = np.where(games['p0'] == model_id, 0, np.where(games['p1'] == model_id, 1, -1))
+            mask &= seat >= 0
+            if outcome == 'win': mask &= games['winner'] == seat
+            elif outcome == 'loss': mask &= (games['winner'] >= 0) & (games['winner'] != seat)
+        elif outcome in ('win', 'loss'):
+            raise ValueError('outcome win/loss precisa de um modelo')
+        if outcome == 'tie': mask &= games['winner'] == -1
+        if min_length is not None: mask &= games['turns'] >= min_length
+        if max_length is not None: mask &= games['turns'] <= max_length
+        if termination is not None: mask &= games['termination'] == TERMINATIONS.index(termination)
+        return np.flatnonzero(mask)
+
+    def read(self, rows):
+        games, chunks, index = self.index()
+        rows = [int(row) for row in rows]
+        records = self.to_records(games[rows])
+        data = {}
+        for row, record in zip(rows, records):
+            chunk = int(chunks[row])
+            if chunk not in data: data[chunk] = np.memmap(self.chunk_files(chunk)[0], dtype=np.uint8, mode='r')
+            offset = int(index[row]['offset'])
+            record['actions'] = unpack_actions(data[chunk][offset:offset + (record['turns'] + 1) // 2], record['turns'])
+            record['first_player'] = int(index[row]['first_player'])
+            record['game'] = row
+        return records
+
+    def __len__(self): return len(self.index()[0])
+
+def replay(record, upto=None):
+    # ambiente na posição depois das primeiras `upto` ações (todas, por padrão)
+    env = GwentLite()
+    env.reset(seed=record['seed'])
+    if env.round_one_first_player_index != record['first_player']:
+        raise ValueError(f'seed {record["seed"]} não reproduz o primeiro jogador do registro')
+    for action in record['actions'][:upto]: env.act(action)
+    return env
+
+def positions(record):
+    # (posição, jogador da vez, ação) para cada jogada da partida
+    env = replay(record, 0)
+    for action in record['actions']:
+        yield env.clone(), env.get_player_turn(), action
+        env.act(action)
+
+def verify(record):
+    # o replay tem que terminar com o mesmo resultado gravado
+    env = replay(record)
+    if record['termination'] == 'Timeout': return True
+    game_over, results = env.check_game_over()
+    if not game_over: return False
+    winner = record['p0'] if results[0] == 'win' else (record['p1'] if results[1] == 'win' else 'Tie')
+    return winner == record['winner']
+
+def print_record(record):
+    print(f'Partida {record["game"]}: {record["p0"]} vs {record["p1"]} | seed {record["seed"]} | '
+          f'começa P{record["first_player"]} | vencedor {record["winner"]} ({record["termination"]}, {record["turns"]} turnos)')
+    for turn, (env, player, action) in enumerate(positions(record), 1):
+        hand = env.player_hands[player]
+        played = f'carta {hand[action - 1]}' if 0 < action <= len(hand) else 'passa'
+        print(f'  {turn:>3}. P{player} mão {hand} pontos {env.player_points[0]}x{env.player_points[1]} '
+              f'rounds {env.player_num_round_wins[0]}x{env.player_num_round_wins[1]} -> {played}')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Registros compactos de partidas: resumo, consulta e replay.')
+    parser.add_argument('directory', help='pasta gravada com --records')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('summary', help='partidas, bytes por partida e modelos')
+    for name, help_text in [('query', 'lista as partidas que casam com o filtro'), ('verify', 'refaz as partidas e confere o resultado'),
+                            ('show', 'refaz uma partida jogada a jogada')]:
+        command = commands.add_parser(name, help=help_text)
+        if name == 'show':
+            command.add_argument('game', type=int)
+            continue
+        command.add_argument('--model', type=str, default=None)
+        command.add_argument('--outcome', choices=['win', 'loss', 'tie'], default=None)
+        command.add_argument('--min-length', type=int, default=None)
+        command.add_argument('--max-length', type=int, default=None)
+        command.add_argument('--termination', choices=TERMINATIONS, default=None)
+        command.add_argument('--limit', type=int, default=20 if name == 'query' else None)
+    args = parser.parse_args()
+
+    store = GameRecordStore(args.directory)
+    if args.command == 'summary':
+        games = store.index()[0]
+        size = sum(os.path.getsize(path) for path in glob.glob(os.path.join(args.directory, '*')) if os.path.isfile(path))
+        print(f'{len(games)} partidas em {len(store.chunks)} chunks, {size / 2**20:.2f} MB ({size / max(len(games), 1):.1f} bytes por partida)')
+        if len(games): print(f'Turnos: média {games["turns"].mean():.1f}, máximo {games["turns"].max()}')
+        for model_id, name in enumerate(store.models):
+            print(f'  {name}: {int(np.sum((games["p0"] == model_id) | (games["p1"] == model_id)))} partidas')
+    elif args.command == 'show':
+        print_record(store.read([args.game])[0])
+    else:
+        rows = store.query(args.model, args.outcome, args.min_length, args.max_length, args.termination)
+        print(f'{len(rows)} partidas')
+        rows = rows[:args.limit]
+        records = store.read(rows)
+        if args.command == 'query':
+            for record in records:
+                print(f'{record["game"]:>8}  {record["p0"]} vs {record["p1"]}  vencedor {record["winner"]}  '
+                      f'{record["termination"]}  {record["turns"]} turnos  seed {record["seed"]}')
+        else:
+            failed = [record['game'] for record in records if not verify(record)]
+            print(f'{len(records) - len(failed)}/{len(records)} replays reproduzem o resultado gravado')
+            if failed: print(f'Divergentes: {failed[:20]}')
+            sys.exit(1 if failed else 0)
@@ -0,0 +1,112 @@
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+import numpy as np
+
+sys.path.insert(0, '.') # GwentLite importa games.Game a partir da raiz do repo
+sys.path.insert(0, 'games')
+sys.path.insert(0, 'agents')
+from GwentLite import GwentLite, RULES_VERSION
+from minimax_agent import MinimaxAgent
+from endgame_tablebase import EndgameTablebase
+
+MAX_TURNS = 100
+
+# --- estado de cada processo gerador ---
+_gen = {}
+
+def init_generator(output_dir, depth, tablebase_dir, explore):
+    _gen['env'] = GwentLite()
+    _gen['agent'] = MinimaxAgent(depth=depth, tablebase=EndgameTablebase(tablebase_dir) if tablebase_dir else None)
+    _gen['output_dir'] = output_dir
+    _gen['explore'] = explore
+
+def play_labelled_game(env, agent, seed, explore):
+    # o minimax escolhe a jogada dos dois lados; com probabilidade explore o jogo segue por uma jogada
+    # aleatória (o rótulo continua sendo a do minimax), para cobrir posições fora da linha principal
+    env.reset(seed=seed)
+    features, actions, values = [], [], []
+    turns = 0
+    while not env.check_game_over()[0] and turns < MAX_TURNS:
+        player = env.get_player_turn()
+        action = agent.act(env)
+        features.append(env.get_features(player)[0])
+        actions.append(action)
+        values.append(agent.last_stats['score'])
+        if env.rng.random() < explore: action = int(env.sample_legal_move())
+        env.act(action)
+        turns += 1
+    return features, actions, values
+
+def generate_shard(task):
+    shard_index, seeds = task
+    env, agent = _gen['env'], _gen['agent']
+    features, actions, values = [], [], []
+    for seed in seeds:
+        f, a, v = play_labelled_game(env, agent, seed, _gen['explore'])
+        features.extend(f)
+        actions.extend(a)
+        values.extend(v)
+
+    # features em float16 (frações de 0 a 1), ação em uint8: ~200 bytes por posição
+    path = os.path.join(_gen['output_dir'], f'shard_{shard_index:05d}.npz')
+    np.savez(path, features=np.array(features, dtype=np.float16), actions=np.array(actions, dtype=np.uint8),
+             values=np.array(values, dtype=np.float32))
+    return shard_index, len(actions)
+
+def load_shards(directory):
+    # concatena todos os shards de um dataset gerado por este script
+    shards = sorted(f for f in os.listdir(directory) if f.startswith('shard_') and f.endswith('.npz'))
+    features, actions, values = [], [], []
+    for filename in shards:
+        with np.load(os.path.join(directory, filename)) as data:
+            features.append(data['features'])
+            actions.append(data['actions'])
+            values.append(data['values'])
+    return np.concatenate(features), np.concatenate(actions), np.concatenate(values)
+
+def generate(output_dir, games, games_per_shard, depth, workers, seed, tablebase_dir, explore):
+    if not os.path.exists(output_dir): os.makedirs(output_dir)
+    with open(os.path.join(output_dir, 'meta.json'), 'w') as f:
+        json.dump({'games': games, 'depth': depth, 'seed': seed, 'explore': explore, 'tablebase': tablebase_dir,
+                   'rules': RULES_VERSION, 'state_size': GwentLite().get_observation_shape()}, f, indent=2)
+
+    tasks = [(i, list(range(seed + start, seed + min(start + games_per_shard, games))))
+             for i, start in enumerate(range(0, games, games_per_shard))]
+    print(f'Gerando {games} jogos do Minimax d{depth} em {len(tasks)} shards, Workers: {workers}')
+
+    start_time = time.time()
+    positions = 0
+    init_args = (output_dir, depth, tablebase_dir, explore)
+    if workers <= 1:
+        init_generator(*init_args)
+        results = map(generate_shard, tasks)
+    else:
+        pool = multiprocessing.get_context('spawn').Pool(workers, initializer=init_generator, initargs=init_args)
+        results = pool.imap_unordered(generate_shard, tasks)
+
+    for done, (shard_index, count) in enumerate(results, 1):
+        positions += count
+        print(f'Shard {shard_index} ({done}/{len(tasks)}): {count} posições | total {positions} | {time.time() - start_time:.1f}s')
+
+    if workers > 1:
+        pool.close()
+        pool.join()
+    print(f'Dataset salvo em {output_dir}: {positions} posições')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gera posições rotuladas pelo Minimax para pré-treino supervisionado.')
+    parser.add_argument('output', help='pasta do dataset (shards .npz)')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--games-per-shard', type=int, default=50)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tablebase', type=str, default=None, help='tablebase de finais usada pelo minimax')
+    parser.add_argument('--explore', type=float, default=0.1, help='probabilidade de seguir uma jogada aleatória')
+    args = parser.parse_args()
+
+    generate(args.output, args.games, args.games_per_shard, args.depth, args.workers, args.seed, args.tablebase, args.explore)
@@ -0,0 +1,67 @@
+import os
+import sys
+import json
+import hashlib
+
+sys.path.insert(0, 'games')
+sys.path.insert(0, 'agents')
+from GwentLite import RULES_VERSION
+from minimax_agent import EVALUATOR_VERSION
+
+class MatchupCache:
+    # cache endereçado por conteúdo: a chave de um matchup é o hash dos pesos (ou da config do
+    # minimax) dos dois modelos, da versão das regras, do limite de turnos e do conjunto de seeds.
+    # trocar o checkpoint de um modelo muda só as chaves dos matchups em que ele aparece.
+    def __init__(self, directory):
+        self.directory = directory
+        if not os.path.exists(directory): os.makedirs(directory)
+        self.file_hashes = {}
+        self.hits = 0
+        self.misses = 0
+
+    def file_hash(self, path):
+        stat = os.stat(path)
+        memo_key = (path, stat.st_size, stat.st_mtime)
+        if memo_key not in self.file_hashes:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''): digest.update(block)
+            self.file_hashes[memo_key] = digest.hexdigest()
+        return self.file_hashes[memo_key]
+
+    def model_key(self, config):
+        # o caminho não entra na chave, só o conteúdo dos pesos e o resto da config (profundidade etc.);
+        # o cache de decisões do minimax não muda nenhuma jogada
+        key = {name: value for name, value in sorted(config.items()) if name not in ('path', 'episode', 'cache')}
+        if config.get('path'): key['weights'] = self.file_hash(config['path'])
+        if config.get('type') == 'Minimax': key['evaluator'] = EVALUATOR_VERSION # mudar evaluate() muda as jogadas
+        return key
+
+    def matchup_key(self, config0, config1, seeds, max_turns):
+        payload = {'p0': self.model_key(config0), 'p1': self.model_key(config1),
+                   'rules': RULES_VERSION, 'max_turns': max_turns, 'seeds': list(seeds)}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key, names):
+        path = os.path.join(self.directory, f'{key}.json')
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        with open(path) as f: cached = json.load(f)
+        self.hits += 1
+
+        # os registros guardam os nomes da execução que os gravou. fora do modo duplicado as seeds já dependem
+        # dos nomes, então a chave muda junto com eles; no --duplicate os deals só dependem do índice do jogo
+        # e um modelo renomeado acerta o cache, por isso os nomes são sempre trocados pelos atuais
+        p0_name, p1_name = names
+        for record in cached:
+            if record['winner'] == record['p0']: record['winner'] = p0_name
+            elif record['winner'] == record['p1']: record['winner'] = p1_name
+            record['p0'], record['p1'] = p0_name, p1_name
+        return cached
+
+    def put(self, key, records):
+        path = os.path.join(self.directory, f'{key}.json')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f: json.dump(records, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,99 @@
+import os
+import csv
+import glob
+import argparse
+import itertools
+import numpy as np
+
+from sharding import find_shards, interleave
+from results_store import ResultsStore, GAME_DTYPE, TERMINATIONS
+from game_records import GameRecordStore
+from ratings import fit_elo, print_table
+from run_tournament_v2 import calculate_elo, INITIAL_ELO
+
+def read_blocks(path, key):
+    # linhas do csv agrupadas em blocos consecutivos com o mesmo valor de key (um matchup, um checkpoint)
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        blocks = [list(rows) for _, rows in itertools.groupby(reader, key=lambda row: row[key])]
+    return reader.fieldnames, blocks
+
+def read_shards(output, key):
+    shard_files = find_shards(output)
+    header, parts = None, []
+    for shard_file in shard_files:
+        fieldnames, blocks = read_blocks(shard_file, key)
+        if header is not None and fieldnames != header: raise ValueError(f'{shard_file}: colunas diferentes dos outros shards')
+        header = fieldnames
+        parts.append(blocks)
+    print(f'{len(shard_files)} shards de {output}')
+    return header, interleave(parts)
+
+def merge_tournament(output):
+    # junta os matchups na ordem canônica e refaz o elo sequencial: o csv final é o mesmo de uma execução única
+    header, blocks = read_shards(output, 'Matchup_ID')
+    elos, names = {}, {}
+    games = []
+    with open(output, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in itertools.chain.from_iterable(blocks):
+            p0_name, p1_name, winner_model = row['Player0_Model'], row['Player1_Model'], row['Winner_Model']
+            for name in (p0_name, p1_name):
+                elos.setdefault(name, INITIAL_ELO)
+                names.setdefault(name, len(names))
+            elo0, elo1 = elos[p0_name], elos[p1_name]
+            score_p0 = 1.0 if winner_model == p0_name else (0.0 if winner_model == p1_name else 0.5)
+            elos[p0_name], elos[p1_name] = calculate_elo(elo0, elo1, score_p0)
+            writer.writerow([row['Matchup_ID'], p0_name, p1_name, winner_model, row['Turns'], f'{elo0:.2f}', f'{elo1:.2f}',
+                             f'{elos[p0_name]:.2f}', f'{elos[p1_name]:.2f}', row['Termination'], row['Seed']])
+            winner = 0 if winner_model == p0_name else (1 if winner_model == p1_name else -1)
+            games.append((names[p0_name], names[p1_name], winner, TERMINATIONS.index(row['Termination']), int(row['Turns']), int(row['Seed'])))
+
+    print(f'{len(games)} jogos em {len(blocks)} matchups -> {output}')
+    print('\n' + '=' * 50)
+    print('CLASSIFICAÇÃO FINAL DO TORNEIO (ELO)')
+    print('=' * 50)
+    for rank, (name, elo) in enumerate(sorted(elos.items(), key=lambda item: item[1], reverse=True), 1):
+        print(f'{rank}. {name}: {elo:.2f}')
+
+    ratings, lower, upper = fit_elo(np.array(games, dtype=GAME_DTYPE), len(names), initial_elo=INITIAL_ELO)
+    print(f'\nBRADLEY-TERRY (ESCALA ELO, IC 95%) - {len(games)} jogos')
+    print_table(list(names), ratings, lower, upper)
+
+def merge_sweep(output):
+    # curva de aprendizado: checkpoints de volta na ordem de episódio
+    header, blocks = read_shards(output, 'Checkpoint')
+    with open(output, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=header)
+        writer.writeheader()
+        for block in blocks:
+            writer.writerows(block)
+            print(f'Ep {block[0]["Episode"]:>6}' + ''.join(f' | {row["Baseline"]}: {float(row["Score"]):.3f} ± {float(row["Score_Stderr"]):.3f}' for row in block))
+    print(f'{len(blocks)} checkpoints -> {output}')
+
+def merge_store(output):
+    # concatena os stores dos shards (ids dos modelos remapeados); com jogadas gravadas, o destino também as guarda
+    shard_dirs = find_shards(output)
+    has_records = any(glob.glob(os.path.join(directory, 'records_*.idx')) for directory in shard_dirs)
+    target = GameRecordStore(output) if has_records else ResultsStore(output)
+    if len(target.load()): raise ValueError(f'{output} já tem partidas; use uma pasta nova')
+    for directory in shard_dirs:
+        if has_records:
+            store = GameRecordStore(directory)
+            records = store.read(range(len(store)))
+        else:
+            store = ResultsStore(directory)
+            records = store.to_records(store.load())
+        target.append(records)
+        print(f'{directory}: {len(records)} jogos')
+    print(f'{len(target.load())} jogos -> {output}')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Junta os resultados de execuções com --shard-index/--num-shards.')
+    parser.add_argument('kind', choices=['tournament', 'sweep', 'store'],
+                        help='csv do run_tournament_v2.py, csv do evaluate_checkpoints.py ou pasta do --store/--records')
+    parser.add_argument('output', help='caminho sem o sufixo .shard-KK-of-NN (o mesmo passado aos shards)')
+    args = parser.parse_args()
+
+    {'tournament': merge_tournament, 'sweep': merge_sweep, 'store': merge_store}[args.kind](args.output)
@@ -0,0 +1,63 @@
+import os
+import sys
+import argparse
+import numpy as np
+
+sys.path.insert(0, 'agents')
+from dueling_agent import DuelingAgent
+from generate_minimax_dataset import load_shards
+
+ACTION_SIZE = 11
+VALUE_SCALE = 20000 # minimax: round ganho = 10000, fim de jogo = 100000
+MARGIN = 1.0
+
+def q_targets(actions, values):
+    # q-alvo na escala das recompensas do treino: valor do minimax comprimido para [-5, 5] (vitória = +5)
+    # na jogada escolhida e MARGIN abaixo nas outras, para que o argmax da rede seja a jogada do minimax
+    v = 5.0 * np.tanh(values / VALUE_SCALE)
+    targets = np.repeat((v - MARGIN)[:, None], ACTION_SIZE, axis=1)
+    targets[np.arange(len(actions)), actions] = v
+    return targets.astype(np.float32)
+
+def pretrain(dataset_dir, output, algorithm, epochs, batch_size, learning_rate, val_fraction, seed):
+    features, actions, values = load_shards(dataset_dir)
+    features = features.astype(np.float32)
+    targets = q_targets(actions.astype(np.int64), values)
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(actions))
+    val_size = int(len(order) * val_fraction)
+    val_idx, train_idx = order[:val_size], order[val_size:]
+    print(f'Dataset {dataset_dir}: {len(train_idx)} posições de treino, {val_size} de validação')
+
+    agent = DuelingAgent(features.shape[1], ACTION_SIZE, double_dqn=(algorithm == 'DDQN'))
+    agent.model.optimizer.learning_rate.assign(learning_rate) # o lr do dqn é pequeno demais para o supervisionado
+
+    for epoch in range(1, epochs + 1):
+        history = agent.model.fit(features[train_idx], targets[train_idx], batch_size=batch_size, epochs=1, verbose=0, shuffle=True)
+        line = f'Época {epoch}/{epochs} | loss {history.history["loss"][0]:.4f}'
+        if val_size:
+            predictions = agent.model.predict(features[val_idx], batch_size=batch_size, verbose=0)
+            agreement = np.mean(np.argmax(predictions, axis=1) == actions[val_idx])
+            line += f' | concordância com o minimax (validação): {agreement:.3f}'
+        print(line)
+
+    # pesos prontos para o --init-weights dos trainers
+    output_dir = os.path.dirname(output)
+    if output_dir and not os.path.exists(output_dir): os.makedirs(output_dir)
+    agent.save(output)
+    print(f'Pesos pré-treinados salvos em {output}')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pré-treino supervisionado do DuelingAgent com jogadas do Minimax.')
+    parser.add_argument('dataset', help='pasta gerada por generate_minimax_dataset.py')
+    parser.add_argument('--output', type=str, required=True, help='arquivo .weights.h5 de saída')
+    parser.add_argument('--type', type=str, choices=['DQN', 'DDQN'], default='DDQN')
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=1024)
+    parser.add_argument('--learning-rate', type=float, default=1e-3)
+    parser.add_argument('--val-fraction', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    pretrain(args.dataset, args.output, args.type, args.epochs, args.batch_size, args.learning_rate, args.val_fraction, args.seed)
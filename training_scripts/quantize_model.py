@@ -0,0 +1,115 @@
+import os
+import json
+import argparse
+import numpy as np
+
+from tournament_core import load_agent, play_matchup_lockstep, game_seed, get_registry, GwentLite
+from distill_student import generate_corpus, us_per_state_batched
+from quantized_agent import QuantizedAgent, export, PRECISIONS
+from model_registry import default_name
+
+MAX_TURNS = 100
+BATCH_SIZES = (1, 64, 1024)
+
+def play_match(quantized, model, games, seed):
+    # cada deal nos dois assentos, em lockstep (um forward pass por tick); score do quantizado contra o float32
+    names, config = ('Quantized', 'Float32'), {'type': 'DQN'}
+    seeds = [game_seed(seed, None, None, i, duplicate=True) for i in range(games)]
+    records = (play_matchup_lockstep(names, (quantized, model), (config, config), seeds, MAX_TURNS) +
+               play_matchup_lockstep(names[::-1], (model, quantized), (config, config), seeds, MAX_TURNS))
+    wins = sum(record['winner'] == 'Quantized' for record in records)
+    losses = sum(record['winner'] == 'Float32' for record in records)
+    return wins, len(records) - wins - losses, losses
+
+def batched_rates(q_values, states):
+    # estados/s para cada tamanho de lote (melhor de 3)
+    rates = {}
+    for size in BATCH_SIZES:
+        batch = states[:size]
+        repeats = max(1, 2048 // size)
+        best = min(sum(us_per_state_batched(q_values, batch) for _ in range(repeats)) / repeats for _ in range(3))
+        rates[size] = 1e6 / best
+    return rates
+
+def quantize_model(name, config, precisions, output_dir, states_games, games, explore, seed, register):
+    env = GwentLite()
+    state_size, action_size = env.get_observation_shape(), env.get_action_space_size()
+    registry = get_registry()
+    config = registry.resolve(config)
+    arch = config.get('arch') or registry.describe(config['path'])['arch'] or 'dense'
+    if arch == 'quantized': raise ValueError(f'{name} já é um modelo quantizado')
+    model = load_agent(name, dict(config, arch=arch), state_size, action_size)
+    if model is None: return None
+
+    print(f'Gerando estados com {states_games} jogos semeados...')
+    states = generate_corpus(model, states_games, seed, explore)
+    reference = np.asarray(model.model.predict(states, batch_size=4096, verbose=0))
+    print(f'{len(states)} estados')
+
+    source_size = os.path.getsize(config['path'])
+    stem = os.path.basename(config['path']).replace('.weights.h5', '')
+    output_dir = output_dir or os.path.dirname(config['path'])
+    report = {'model': name, 'path': config['path'], 'arch': arch, 'type': config['type'], 'states': len(states),
+              'games': 2 * games, 'size': source_size, 'float32': batched_rates(model.model.predict_on_batch, states), 'exports': {}}
+
+    for precision in precisions:
+        path = os.path.join(output_dir, f'{stem}.{precision}.npz')
+        export(model.model, arch, path, precision, algorithm=config['type'], source=config['path'], episode=config.get('episode'))
+        quantized = QuantizedAgent(path)
+        q_values = quantized.q_values(states)
+        wins, ties, losses = play_match(quantized, model, games, seed)
+        report['exports'][precision] = {
+            'path': path, 'size': os.path.getsize(path),
+            'agreement': float(np.mean(np.argmax(q_values, axis=1) == np.argmax(reference, axis=1))),
+            'max_abs_error': float(np.abs(q_values - reference).max()),
+            'mean_abs_error': float(np.abs(q_values - reference).mean()),
+            'wins': wins, 'ties': ties, 'losses': losses, 'score': (wins + ties / 2) / (wins + ties + losses),
+            'rates': batched_rates(quantized.q_values, states),
+        }
+        if register:
+            registry.register(default_name(path), path, config['type'], 'quantized', config.get('episode'),
+                              source=config['path'], precision=precision)
+    if register: registry.save()
+    return report
+
+def print_report(report):
+    print('\n' + '=' * 78)
+    print(f'{report["model"]} ({report["arch"]}, {report["type"]}): {report["states"]} estados semeados, '
+          f'{report["games"]} jogos contra o float32')
+    sizes = ' '.join(f'{f"lote {size}":>11}' for size in BATCH_SIZES)
+    print(f'{"Precisão":<10} {"Arquivo":>9} {"Concord.":>9} {"|ΔQ| máx":>9} {"Score":>6}  {sizes}  (estados/s)')
+    print(f'{"keras f32":<10} {report["size"] / 1024:>8.0f}K {"-":>9} {"-":>9} {"-":>6}  '
+          + ' '.join(f'{report["float32"][size]:>11.0f}' for size in BATCH_SIZES))
+    for precision, r in report['exports'].items():
+        print(f'{precision:<10} {r["size"] / 1024:>8.0f}K {100 * r["agreement"]:>8.2f}% {r["max_abs_error"]:>9.4f} {r["score"]:>6.3f}  '
+              + ' '.join(f'{r["rates"][size]:>11.0f}' for size in BATCH_SIZES))
+    for precision, r in report['exports'].items():
+        print(f'{precision}: {report["size"] / r["size"]:.1f}x menor, V {r["wins"]} / E {r["ties"]} / D {r["losses"]} -> {r["path"]}')
+    print('=' * 78)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Exporta um agente neural em float16/int8 para o runtime numpy e valida contra o float32.')
+    parser.add_argument('model', help='checkpoint .weights.h5 ou nome no registro de modelos')
+    parser.add_argument('--type', choices=['DQN', 'DDQN'], default=None, help='padrão: pelo prefixo do arquivo')
+    parser.add_argument('--arch', choices=['dueling', 'dense', 'student'], default=None, help='padrão: lida do arquivo')
+    parser.add_argument('--precision', nargs='+', choices=PRECISIONS, default=['float16', 'int8'])
+    parser.add_argument('--output-dir', type=str, default=None, help='padrão: a pasta do checkpoint')
+    parser.add_argument('--states-games', type=int, default=1000, help='jogos semeados que geram os estados de validação')
+    parser.add_argument('--explore', type=float, default=0.2)
+    parser.add_argument('--games', type=int, default=100, help='deals contra o float32 (cada um nos dois assentos)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--register', action='store_true', help='registra os arquivos exportados no registro de modelos')
+    parser.add_argument('--report', type=str, default=None, help='json com o relatório de validação')
+    args = parser.parse_args()
+
+    registry = get_registry()
+    if args.model in registry: config = {'model': args.model}
+    else:
+        config = {'type': args.type or registry.describe(args.model)['algorithm'], 'path': args.model}
+        if args.arch: config['arch'] = args.arch
+    report = quantize_model(args.model, config, args.precision, args.output_dir, args.states_games, args.games, args.explore,
+                            args.seed, args.register)
+    if report is not None:
+        print_report(report)
+        if args.report:
+            with open(args.report, 'w') as f: json.dump(report, f, indent=2)
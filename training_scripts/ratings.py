@@ -0,0 +1,101 @@
+import sys
+import time
+import argparse
+import numpy as np
+
+from results_store import ResultsStore
+
+INITIAL_ELO = 1000
+ELO_SCALE = 400 / np.log(10) # log-força do bradley-terry -> pontos de elo
+
+def score_matrix(games, num_models):
+    # s[i, j] = pontos de i contra j (empate vale 0.5), n[i, j] = jogos entre i e j
+    p0, p1 = games['p0'].astype(int), games['p1'].astype(int)
+    score_p0 = np.where(games['winner'] == 0, 1.0, np.where(games['winner'] == 1, 0.0, 0.5))
+
+    s = np.zeros((num_models, num_models))
+    n = np.zeros((num_models, num_models))
+    np.add.at(s, (p0, p1), score_p0)
+    np.add.at(s, (p1, p0), 1 - score_p0)
+    np.add.at(n, (p0, p1), 1)
+    np.add.at(n, (p1, p0), 1)
+    return s, n
+
+def fit_bradley_terry(s, n, prior=1.0, max_iter=1000, tol=1e-10):
+    # algoritmo MM (Hunter, 2004) sobre a matriz de vitórias inteira de uma vez.
+    # o prior soma um empate virtual a cada par que se enfrentou, para que um modelo
+    # invicto não tenha força infinita.
+    played = n > 0
+    s = s + prior / 2 * played
+    n = n + prior * played
+
+    wins = s.sum(axis=1)
+    strength = np.ones(len(s))
+    for _ in range(max_iter):
+        denom = (n / (strength[:, None] + strength[None, :])).sum(axis=1)
+        new_strength = np.where(denom > 0, wins / np.maximum(denom, 1e-300), 1.0)
+        new_strength /= np.exp(np.mean(np.log(new_strength)))
+        converged = np.max(np.abs(new_strength - strength)) < tol
+        strength = new_strength
+        if converged: break
+
+    # covariância pela inversa (pseudo, soma-zero) da informação de fisher em log-força
+    theta = np.log(strength)
+    q = n * strength[:, None] * strength[None, :] / (strength[:, None] + strength[None, :])**2
+    information = np.diag(q.sum(axis=1)) - q
+    stderr = np.sqrt(np.clip(np.diag(np.linalg.pinv(information)), 0, None))
+    return theta, stderr
+
+def fit_elo(games, num_models, prior=1.0, confidence=1.96, initial_elo=INITIAL_ELO):
+    # elo "de uma vez": bradley-terry na escala de elo, centrado em initial_elo
+    s, n = score_matrix(games, num_models)
+    theta, stderr = fit_bradley_terry(s, n, prior)
+    ratings = initial_elo + ELO_SCALE * (theta - theta.mean())
+    margin = confidence * ELO_SCALE * stderr
+    return ratings, ratings - margin, ratings + margin
+
+def sequential_elo(games, num_models, k_factor=32, initial_elo=INITIAL_ELO, order=None):
+    # o elo incremental do torneio original, para comparar com o ajuste em lote
+    elos = np.full(num_models, float(initial_elo))
+    if order is not None: games = games[order]
+    for p0, p1, winner in zip(games['p0'], games['p1'], games['winner']):
+        score_p0 = 1.0 if winner == 0 else (0.0 if winner == 1 else 0.5)
+        expected_p0 = 1 / (1 + 10**((elos[p1] - elos[p0]) / 400))
+        delta = k_factor * (score_p0 - expected_p0)
+        elos[p0] += delta
+        elos[p1] -= delta
+    return elos
+
+def print_table(names, ratings, lower=None, upper=None):
+    print('=' * 60)
+    for rank, i in enumerate(np.argsort(-ratings), 1):
+        ci = f'  [{lower[i]:.0f}, {upper[i]:.0f}]' if lower is not None else ''
+        print(f'{rank}. {names[i]}: {ratings[i]:.2f}{ci}')
+    print('=' * 60)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Recalcula ratings a partir do store de partidas, sem rejogar nada.')
+    parser.add_argument('store', help='diretório do ResultsStore')
+    parser.add_argument('--method', choices=['bt', 'sequential'], default='bt')
+    parser.add_argument('--k', type=float, default=32, help='k-factor do elo sequencial')
+    parser.add_argument('--prior', type=float, default=1.0, help='empates virtuais por par no bradley-terry')
+    parser.add_argument('--shuffle-seed', type=int, default=None, help='embaralha a ordem dos jogos no elo sequencial')
+    args = parser.parse_args()
+
+    store = ResultsStore(args.store)
+    games = store.load()
+    if len(games) == 0:
+        print('Store vazio.')
+        sys.exit(1)
+
+    start_time = time.perf_counter()
+    if args.method == 'bt':
+        ratings, lower, upper = fit_elo(games, len(store.models), prior=args.prior)
+    else:
+        order = None
+        if args.shuffle_seed is not None: order = np.random.default_rng(args.shuffle_seed).permutation(len(games))
+        ratings, lower, upper = sequential_elo(games, len(store.models), args.k, order=order), None, None
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+    print(f'{len(games)} jogos, {len(store.models)} modelos, método {args.method}: {elapsed_ms:.2f} ms')
+    print_table(store.models, ratings, lower, upper)
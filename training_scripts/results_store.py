@@ -0,0 +1,62 @@
+import os
+import json
+import numpy as np
+
+# registro de partida com tamanho fixo (16 bytes); o arquivo games.bin só cresce por append
+GAME_DTYPE = np.dtype([
+    ('p0', '<u2'),          # id do modelo no assento 0
+    ('p1', '<u2'),          # id do modelo no assento 1
+    ('winner', 'i1'),       # 0 = p0, 1 = p1, -1 = empate
+    ('termination', 'u1'),  # código em TERMINATIONS
+    ('turns', '<u2'),
+    ('seed', '<u8'),
+])
+
+TERMINATIONS = ['Game_Over', 'Timeout', 'Illegal_Move', 'Normal']
+
+class ResultsStore:
+    def __init__(self, directory):
+        self.directory = directory
+        self.models_file = os.path.join(directory, 'models.json')
+        self.games_file = os.path.join(directory, 'games.bin')
+        if not os.path.exists(directory): os.makedirs(directory)
+
+        self.models = []
+        if os.path.exists(self.models_file):
+            with open(self.models_file) as f: self.models = json.load(f)
+        self.model_ids = {name: i for i, name in enumerate(self.models)}
+
+    def model_id(self, name):
+        if name not in self.model_ids:
+            self.model_ids[name] = len(self.models)
+            self.models.append(name)
+            # escrita atômica para não corromper o índice se o processo morrer no meio
+            tmp_file = self.models_file + '.tmp'
+            with open(tmp_file, 'w') as f: json.dump(self.models, f)
+            os.replace(tmp_file, self.models_file)
+        return self.model_ids[name]
+
+    def encode(self, records):
+        games = np.zeros(len(records), dtype=GAME_DTYPE)
+        for i, record in enumerate(records):
+            p0, p1 = self.model_id(record['p0']), self.model_id(record['p1'])
+            winner = 0 if record['winner'] == record['p0'] else (1 if record['winner'] == record['p1'] else -1)
+            games[i] = (p0, p1, winner, TERMINATIONS.index(record['termination']), record['turns'], record['seed'])
+        return games
+
+    def append(self, records):
+        if not records: return
+        games = self.encode(records)
+        with open(self.games_file, 'ab') as f:
+            f.write(games.tobytes())
+
+    def load(self):
+        if not os.path.exists(self.games_file): return np.zeros(0, dtype=GAME_DTYPE)
+        # ignora um registro final incompleto (append interrompido)
+        count = os.path.getsize(self.games_file) // GAME_DTYPE.itemsize
+        return np.fromfile(self.games_file, dtype=GAME_DTYPE, count=count)
+
+    def to_records(self, games):
+        return [{'p0': self.models[g['p0']], 'p1': self.models[g['p1']],
+                 'winner': self.models[g['p0']] if g['winner'] == 0 else (self.models[g['p1']] if g['winner'] == 1 else 'Tie'),
+                 'turns': int(g['turns']), 'termination': TERMINATIONS[g['termination']], 'seed': int(g['seed'])} for g in games]
@@ -1,19 +1,22 @@
-import sys
 import numpy as np
 import os
 import csv
+import json
+import math
 import time
+import argparse
 import itertools
-from collections import defaultdict
+from contextlib import closing
 
-sys.path.insert(0, 'games')
-from GwentLite import GwentLite
-from dqn_agent import DQNAgent
-from ddqn_agent import DDQNAgent
-from minimax_agent import MinimaxAgent
-from dueling_agent import DuelingAgent
+from tournament_core import game_seed, make_shards, ShardRunner, ENV_AGENT_TYPES, get_registry
+from matchup_cache import MatchupCache
+from sprt import SPRT
+from results_store import ResultsStore
+from game_records import GameRecordStore
+from ratings import fit_elo, print_table
+from sharding import add_shard_arguments, shard_items, shard_path
 
-# configurações
+# configurações (padrões da CLI: --games, --output, --models)
 GAMES_PER_MATCHUP = 50
 INITIAL_ELO = 1000
 K_FACTOR = 32
@@ -36,110 +39,315 @@ def calculate_elo(p1_elo, p2_elo, p1_score):
     new_p2_elo = p2_elo + K_FACTOR * ((1 - p1_score) - expected_p2)
     return new_p1_elo, new_p2_elo
 
-def load_agent(name, config, state_size, action_size):
-    print(f'Carregando agente {name}...')
-    if config['type'] == 'Minimax': return MinimaxAgent(depth=config['depth'])
+def load_models_config(path):
+    # json no mesmo formato do MODELS_CONFIG: {"nome": {"type": ..., "path": ...}, ...}
+    with open(path) as f: return json.load(f)
 
-    if 'Fixed' in name or 'Pro' in name:
-        is_double = (config['type'] == 'DDQN')
-        agent = DuelingAgent(state_size, action_size, double_dqn=is_double)
-    else:
-        hidden_size = 256
-        if config['type'] == 'DQN': agent = DQNAgent(state_size, action_size, hidden_size=hidden_size)
-        else: agent = DDQNAgent(state_size, action_size, hidden_size=hidden_size)
-
-    try:
-        agent.load(config['path'])
-        agent.epsilon = 0.0
-    except Exception as e:
-        print(f'ERRO CRÍTICO ao carregar {name}: {e}')
-        return None
-    return agent
-
-def get_agent_action(agent, config, env, state):
-    if config['type'] == 'Minimax': return agent.act(env)
-    return agent.act(state)
-
-def run_tournament():
-    env = GwentLite()
-    state_size = env.get_observation_shape()
-    action_size = env.get_action_space_size()
-
-    agents = {}
+def load_valid_configs():
+    # valida os modelos sem carregar redes no processo pai; cada worker carrega o que precisar
     valid_configs = {}
+    registry = get_registry()
     for name, config in MODELS_CONFIG.items():
-        agent = load_agent(name, config, state_size, action_size)
-        if agent:
-            agents[name] = agent
-            valid_configs[name] = config
+        if config.get('model') and config['model'] not in registry:
+            print(f'ERRO CRÍTICO ao carregar {name}: modelo {config["model"]} não está no registro')
+            continue
+        config = registry.resolve(config) # {'model': nome} -> caminho, algoritmo e arquitetura do manifesto
+        if config['type'] not in ENV_AGENT_TYPES and not os.path.exists(config['path']):
+            print(f'ERRO CRÍTICO ao carregar {name}: arquivo {config["path"]} não encontrado')
+            continue
+        valid_configs[name] = config
+    return valid_configs
 
-    if len(agents) < 2: return
+def iter_shard_results(shards, valid_configs, workers, seed, lockstep=False, minimax_workers=0, duplicate=False):
+    if not shards: return
+    with ShardRunner(valid_configs, workers, seed, MAX_TURNS, lockstep, minimax_workers, duplicate) as runner:
+        for records in runner.imap(shards): yield records
 
-    elos = {name: INITIAL_ELO for name in agents.keys()}
-    matchups = list(itertools.permutations(agents.keys(), 2))
+def iter_matchup_results(matchups, valid_configs, workers, seed, chunk_size, lockstep, minimax_workers, cache, duplicate=False):
+    # devolve (matchup, registros, veio_do_cache) na ordem canônica; só os matchups
+    # ausentes do cache são divididos em fatias e jogados
+    keys, cached, pending = {}, {}, []
+    for p0_name, p1_name in matchups:
+        if cache is not None:
+            seeds = [game_seed(seed, p0_name, p1_name, i, duplicate) for i in range(GAMES_PER_MATCHUP)]
+            keys[(p0_name, p1_name)] = cache.matchup_key(valid_configs[p0_name], valid_configs[p1_name], seeds, MAX_TURNS)
+            records = cache.get(keys[(p0_name, p1_name)], (p0_name, p1_name))
+            if records is not None:
+                cached[(p0_name, p1_name)] = records
+                continue
+        pending.append((p0_name, p1_name))
+
+    # fatias menores que um matchup permitem usar mais cores do que há matchups
+    # no modo lockstep o lote é a fatia inteira, então só dividimos matchups se houver workers sobrando
+    if chunk_size is None:
+        total_games = max(1, len(pending) * GAMES_PER_MATCHUP)
+        shards_per_worker = 1 if lockstep else 4
+        chunk_size = min(GAMES_PER_MATCHUP, max(1, math.ceil(total_games / (workers * shards_per_worker))))
+    shards = make_shards(pending, GAMES_PER_MATCHUP, chunk_size)
+    print(f'Matchups: {len(matchups)} ({len(cached)} do cache, {len(pending)} a jogar), Fatias: {len(shards)} de até {chunk_size} jogos')
+
+    # a última fatia é lida antes do fim do gerador de fatias: o finally fecha o runner (grava o cache do
+    # minimax, encerra os pools) assim que os matchups acabam ou o consumidor fecha este gerador
+    results = iter_shard_results(shards, valid_configs, workers, seed, lockstep, minimax_workers, duplicate)
+    try:
+        for matchup in matchups:
+            if matchup in cached:
+                yield matchup, cached[matchup], True
+                continue
+            # uma fatia volta vazia quando um dos modelos não carregou; o matchup é pulado e não vai para o cache
+            records = []
+            for _ in range(0, GAMES_PER_MATCHUP, chunk_size): records.extend(next(results))
+            if not records:
+                yield matchup, records, False
+                continue
+            # estatísticas de busca descrevem esta execução, não o resultado do matchup; as jogadas ficam no --records
+            if cache is not None: cache.put(keys[matchup], [{k: v for k, v in r.items() if k not in ('search', 'actions')} for r in records])
+            yield matchup, records, False
+    finally:
+        results.close()
+
+def duplicate_report(results):
+    # no modo duplicado, o jogo i de (a, b) e o jogo i de (b, a) usam o mesmo deal com os assentos
+    # trocados; somar os dois cancela quase toda a sorte do deal
+    print(f'\n{"Par (duplicado)":<45} {"Deals":>6} {"Score A":>8} {"Erro pad.":>10}')
+    for (a, b) in results:
+        if a > b or (b, a) not in results: continue
+        games_ab = {r['game']: r for r in results[(a, b)]}
+        games_ba = {r['game']: r for r in results[(b, a)]}
+        deals = sorted(set(games_ab) & set(games_ba))
+        if not deals: continue
+
+        pair_scores = []
+        for i in deals:
+            score_ab = 1.0 if games_ab[i]['winner'] == a else (0.0 if games_ab[i]['winner'] == b else 0.5)
+            score_ba = 1.0 if games_ba[i]['winner'] == a else (0.0 if games_ba[i]['winner'] == b else 0.5)
+            pair_scores.append((score_ab + score_ba) / 2)
+        pair_scores = np.array(pair_scores)
+        stderr = pair_scores.std(ddof=1) / np.sqrt(len(pair_scores)) if len(pair_scores) > 1 else float('nan')
+        print(f'{a + " vs " + b:<45} {len(deals):>6} {pair_scores.mean():>8.3f} {stderr:>10.3f}')
+
+def search_report(results, output_file):
+    # soma o custo de busca de cada minimax em todos os jogos desta execução (matchups do cache não entram)
+    totals = {}
+    for records in results.values():
+        for record in records:
+            for name, stats in record.get('search', {}).items():
+                model_totals = totals.setdefault(name, dict.fromkeys(stats, 0))
+                for key, value in stats.items(): model_totals[key] += value
+    if not totals: return
+
+    print(f'\n{"Busca":<20} {"Jogadas":>8} {"Cache":>6} {"Nós/jog":>9} {"ms/jog":>8} {"Nós/s":>9} {"Clone":>6} {"Aval.":>6} {"Act":>6}')
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Model', 'Moves', 'Cache_Hits', 'Nodes', 'Leaf_Evaluations', 'Cutoffs', 'Nodes_Per_Move',
+                         'Ms_Per_Move', 'Nodes_Per_Sec', 'Clone_Time_Pct', 'Eval_Time_Pct', 'Act_Time_Pct'])
+        for name, t in totals.items():
+            moves = max(1, t['moves'])
+            elapsed = max(t['time'], 1e-9)
+            row = [name, t['moves'], t['cache_hits'], t['nodes'], t['leaf_evaluations'], t['cutoffs'], t['nodes'] / moves,
+                   1000 * t['time'] / moves, t['nodes'] / elapsed, 100 * t['clone_time'] / elapsed, 100 * t['eval_time'] / elapsed,
+                   100 * t['act_time'] / elapsed]
+            writer.writerow([f'{v:.2f}' if isinstance(v, float) else v for v in row])
+            print(f'{name:<20} {row[1]:>8} {row[2]:>6} {row[6]:>9.0f} {row[7]:>8.1f} {row[8]:>9.0f} {row[9]:>5.0f}% {row[10]:>5.0f}% {row[11]:>5.0f}%')
+    print(f'Estatísticas de busca salvas em {output_file}')
+
+def open_store(store_dir, records):
+    # com records o store também guarda as jogadas de cada partida (game_records.py refaz qualquer posição)
+    if not store_dir: return None
+    return GameRecordStore(store_dir) if records else ResultsStore(store_dir)
+
+def run_tournament(workers=1, seed=0, chunk_size=None, lockstep=False, minimax_workers=0, store_dir=None, cache_dir=None, duplicate=False,
+                   search_stats_file=None, records=False, shard_index=0, num_shards=1):
+    valid_configs = load_valid_configs()
+    if len(valid_configs) < 2: return
+    store = open_store(store_dir, records)
+    cache = MatchupCache(cache_dir) if cache_dir else None
+
+    elos = {name: INITIAL_ELO for name in valid_configs.keys()}
+    # cada shard joga uma fatia fixa da lista canônica de matchups (merge_shards.py junta os csvs)
+    matchups = shard_items(itertools.permutations(valid_configs.keys(), 2), shard_index, num_shards)
 
     print('-' * 60)
     print(f'INICIANDO TORNEIO ROUND-ROBIN (CORRIGIDO V2 - DEPTH 3 - RUN 2)')
+    print(f'Workers: {workers}, Seed: {seed}, Lockstep: {lockstep}, Duplicado: {duplicate}')
+    if num_shards > 1: print(f'Shard {shard_index + 1}/{num_shards}: {len(matchups)} matchups -> {OUTPUT_FILE}')
     print('-' * 60)
 
     with open(OUTPUT_FILE, 'w', newline='') as f:
         writer = csv.writer(f)
         writer.writerow(['Matchup_ID', 'Player0_Model', 'Player1_Model', 'Winner_Model', 'Turns',
-                         'P0_ELO_Before', 'P1_ELO_Before', 'P0_ELO_After', 'P1_ELO_After', 'Termination'])
+                         'P0_ELO_Before', 'P1_ELO_Before', 'P0_ELO_After', 'P1_ELO_After', 'Termination', 'Seed'])
 
-    for p0_name, p1_name in matchups:
-        print(f'\n>>> Matchup: {p0_name} vs {p1_name}')
-        agent0, config0 = agents[p0_name], valid_configs[p0_name]
-        agent1, config1 = agents[p1_name], valid_configs[p1_name]
-        wins_p0, wins_p1, ties = 0, 0, 0
-
-        for i in range(GAMES_PER_MATCHUP):
-            env.reset()
-            done = False
-            turns = 0
-            winner_model = 'Tie'
-            termination = 'Normal'
-
-            while not done:
-                if turns >= MAX_TURNS:
-                    done = True; termination = 'Timeout'; break
-
-                curr = env.get_player_turn()
-                state = env.get_features(curr)
-                action = get_agent_action(agent0, config0, env, state) if curr == 0 else get_agent_action(agent1, config1, env, state)
-
-                if not env.act(action):
-                    done = True; termination = 'Illegal_Move'
-                    winner_model = p1_name if curr == 0 else p0_name
-                else:
-                    game_over, results = env.check_game_over()
-                    if game_over:
-                        done = True; termination = 'Game_Over'
-                        if results[0] == 'win': winner_model = p0_name
-                        elif results[1] == 'win': winner_model = p1_name
-                        else: winner_model = 'Tie'
-                turns += 1
-
-            elo0, elo1 = elos[p0_name], elos[p1_name]
-            score_p0 = 1.0 if winner_model == p0_name else (0.0 if winner_model == p1_name else 0.5)
-            if score_p0 == 1.0: wins_p0 += 1
-            elif score_p0 == 0.0: wins_p1 += 1
-            else: ties += 1
-            
-            new_elo0, new_elo1 = calculate_elo(elo0, elo1, score_p0)
-            elos[p0_name], elos[p1_name] = new_elo0, new_elo1
-
-            with open(OUTPUT_FILE, 'a', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow([f'{p0_name}_vs_{p1_name}', p0_name, p1_name, winner_model, turns,        
-                                 f'{elo0:.2f}', f'{elo1:.2f}', f'{new_elo0:.2f}', f'{new_elo1:.2f}', termination])
+    start_time = time.time()
+    all_results = {}
+    # closing: o runner é encerrado aqui mesmo se o loop parar no meio (exceção ou ctrl+c)
+    with closing(iter_matchup_results(matchups, valid_configs, workers, seed, chunk_size,
+                                      lockstep, minimax_workers, cache, duplicate)) as matchup_results:
+        for (p0_name, p1_name), records, from_cache in matchup_results:
+            if not records:
+                print(f'\n>>> Matchup: {p0_name} vs {p1_name} (pulado: modelo não carregou)')
+                continue
+            all_results[(p0_name, p1_name)] = records
+            print(f'\n>>> Matchup: {p0_name} vs {p1_name}' + (' (cache)' if from_cache else ''))
+            if store is not None and not from_cache: store.append(records)
 
+            for record in records:
+                winner_model = record['winner']
+                # elo sequencial aplicado na ordem canônica: a tabela final não depende do escalonamento
+                elo0, elo1 = elos[p0_name], elos[p1_name]
+                score_p0 = 1.0 if winner_model == p0_name else (0.0 if winner_model == p1_name else 0.5)
+                new_elo0, new_elo1 = calculate_elo(elo0, elo1, score_p0)
+                elos[p0_name], elos[p1_name] = new_elo0, new_elo1
+
+                with open(OUTPUT_FILE, 'a', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow([f'{p0_name}_vs_{p1_name}', p0_name, p1_name, winner_model, record['turns'],
+                                     f'{elo0:.2f}', f'{elo1:.2f}', f'{new_elo0:.2f}', f'{new_elo1:.2f}', record['termination'], record['seed']])
+
+    print(f'\nTempo total: {time.time() - start_time:.1f}s')
     print('\n' + '='*50)
     print('CLASSIFICAÇÃO FINAL DO TORNEIO (ELO)')
     print('='*50)
-    sorted_elos = sorted(elos.items(), key=lambda item: item[1], reverse=True)
+    played = {name for matchup in all_results for name in matchup}
+    sorted_elos = sorted(((name, elo) for name, elo in elos.items() if name in played), key=lambda item: item[1], reverse=True)
+    for rank, (name, elo) in enumerate(sorted_elos, 1):
+        print(f'{rank}. {name}: {elo:.2f}')
+
+    if duplicate: duplicate_report(all_results)
+    if search_stats_file: search_report(all_results, search_stats_file)
+
+    if store is not None:
+        # ajuste em lote sobre todos os jogos do store (inclui execuções anteriores)
+        games = store.load()
+        ratings, lower, upper = fit_elo(games, len(store.models), initial_elo=INITIAL_ELO)
+        print(f'\nBRADLEY-TERRY (ESCALA ELO, IC 95%) - {len(games)} jogos em {store_dir}')
+        print_table(store.models, ratings, lower, upper)
+
+def run_adaptive_tournament(workers=1, seed=0, lockstep=False, minimax_workers=0, store_dir=None, duplicate=False, records=False,
+                            elo0=-50, elo1=50, alpha=0.05, beta=0.05, batch_size=10, min_games=10, max_games=None,
+                            shard_index=0, num_shards=1):
+    # cada matchup joga lotes até o sprt decidir quem é mais forte; o orçamento não usado
+    # pelos matchups desequilibrados vai para os equilibrados (até max_games por matchup)
+    valid_configs = load_valid_configs()
+    if len(valid_configs) < 2: return
+    store = open_store(store_dir, records)
+    if max_games is None: max_games = 2 * GAMES_PER_MATCHUP
+
+    matchups = shard_items(itertools.permutations(valid_configs.keys(), 2), shard_index, num_shards)
+    budget = GAMES_PER_MATCHUP * len(matchups) # com shards, cada um redistribui só o orçamento dos seus matchups
+    tests = {matchup: SPRT(elo0, elo1, alpha, beta) for matchup in matchups}
+    results = {matchup: [] for matchup in matchups}
+    failed = set() # matchups com um modelo que não carregou
+    used = 0
+
+    print('-' * 60)
+    print(f'INICIANDO TORNEIO ADAPTATIVO (SPRT elo0={elo0} elo1={elo1} alpha={alpha} beta={beta})')
+    print(f'Workers: {workers}, Seed: {seed}, Orçamento: {budget} jogos, Máximo por matchup: {max_games}')
+    if num_shards > 1: print(f'Shard {shard_index + 1}/{num_shards}: {len(matchups)} matchups -> {OUTPUT_FILE}')
+    print('-' * 60)
+
+    start_time = time.time()
+    with ShardRunner(valid_configs, workers, seed, MAX_TURNS, lockstep, minimax_workers, duplicate) as runner:
+        while used < budget:
+            # matchups ainda indecisos, os com menos jogos primeiro
+            open_matchups = [m for m in matchups if m not in failed and len(results[m]) < max_games and
+                             (len(results[m]) < min_games or not tests[m].decided)]
+            if not open_matchups: break
+            open_matchups.sort(key=lambda m: len(results[m]))
+
+            shards = []
+            for p0_name, p1_name in open_matchups:
+                played = len(results[(p0_name, p1_name)])
+                size = min(batch_size, max_games - played, budget - used - sum(len(sh[2]) for sh in shards))
+                if size <= 0: break
+                shards.append((p0_name, p1_name, list(range(played, played + size))))
+
+            for (p0_name, p1_name, _), records in zip(shards, runner.imap(shards)):
+                if not records:
+                    if (p0_name, p1_name) not in failed: print(f'>>> Matchup: {p0_name} vs {p1_name} (pulado: modelo não carregou)')
+                    failed.add((p0_name, p1_name))
+                    continue
+                for record in records:
+                    matchup = (record['p0'], record['p1'])
+                    score_p0 = 1.0 if record['winner'] == record['p0'] else (0.0 if record['winner'] == record['p1'] else 0.5)
+                    tests[matchup].update(score_p0)
+                    results[matchup].append(record)
+                used += len(records)
+                if store is not None: store.append(records)
+
+    # elo sequencial na ordem canônica (matchup, índice do jogo)
+    elos = {name: INITIAL_ELO for name in valid_configs.keys()}
+    with open(OUTPUT_FILE, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Matchup_ID', 'Player0_Model', 'Player1_Model', 'Winner_Model', 'Turns',
+                         'P0_ELO_Before', 'P1_ELO_Before', 'P0_ELO_After', 'P1_ELO_After', 'Termination', 'Seed'])
+        for p0_name, p1_name in matchups:
+            for record in sorted(results[(p0_name, p1_name)], key=lambda r: r['game']):
+                winner_model = record['winner']
+                elo0_before, elo1_before = elos[p0_name], elos[p1_name]
+                score_p0 = 1.0 if winner_model == p0_name else (0.0 if winner_model == p1_name else 0.5)
+                elos[p0_name], elos[p1_name] = calculate_elo(elo0_before, elo1_before, score_p0)
+                writer.writerow([f'{p0_name}_vs_{p1_name}', p0_name, p1_name, winner_model, record['turns'],
+                                 f'{elo0_before:.2f}', f'{elo1_before:.2f}', f'{elos[p0_name]:.2f}', f'{elos[p1_name]:.2f}',
+                                 record['termination'], record['seed']])
+
+    print(f'\n{"Matchup":<45} {"Jogos":>6} {"V-E-D":>10} {"LLR":>7}  Resultado')
+    for matchup in matchups:
+        test = tests[matchup]
+        print(f'{matchup[0] + " vs " + matchup[1]:<45} {test.games:>6} {f"{test.wins}-{test.draws}-{test.losses}":>10} {test.llr:>7.2f}  {test.result}')
+    if duplicate: duplicate_report(results)
+    print(f'\nJogos usados: {used} de {budget} ({budget - used} economizados, {100 * (budget - used) / budget:.1f}%)')
+    print(f'Tempo total: {time.time() - start_time:.1f}s')
+
+    print('\n' + '='*50)
+    print('CLASSIFICAÇÃO FINAL DO TORNEIO (ELO)')
+    print('='*50)
+    played = {name for matchup in matchups if results[matchup] for name in matchup}
+    sorted_elos = sorted(((name, elo) for name, elo in elos.items() if name in played), key=lambda item: item[1], reverse=True)
     for rank, (name, elo) in enumerate(sorted_elos, 1):
         print(f'{rank}. {name}: {elo:.2f}')
 
 if __name__ == '__main__':
-    run_tournament()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=1, help='processos em paralelo (1 = serial)')
+    parser.add_argument('--seed', type=int, default=0, help='seed base das partidas')
+    parser.add_argument('--models', type=str, default=None, help='json com os modelos no formato do MODELS_CONFIG (padrão: o do script)')
+    parser.add_argument('--games', type=int, default=GAMES_PER_MATCHUP, help='jogos por matchup')
+    parser.add_argument('--output', type=str, default=OUTPUT_FILE, help='csv das partidas (com shards: um arquivo por shard)')
+    parser.add_argument('--chunk-size', type=int, default=None, help='jogos por fatia enviada a um worker')
+    parser.add_argument('--lockstep', action='store_true', help='joga os jogos de cada fatia em lote, um forward pass por tick')
+    parser.add_argument('--minimax-workers', type=int, default=0, help='pool para jogadas do minimax no modo lockstep serial')
+    stores = parser.add_mutually_exclusive_group()
+    stores.add_argument('--store', type=str, default=None, help='diretório do store append-only de partidas')
+    stores.add_argument('--records', type=str, default=None, help='como --store, mas grava também as jogadas (ver game_records.py)')
+    parser.add_argument('--cache', type=str, default=None, help='diretório do cache de matchups (só joga pares novos)')
+    parser.add_argument('--duplicate', action='store_true', help='mesmos deals em todos os matchups, (a, b) e (b, a) com assentos trocados')
+    parser.add_argument('--search-stats', type=str, default=None, help='csv com o custo de busca de cada minimax (nós, tempo, cortes)')
+    parser.add_argument('--adaptive', action='store_true', help='para cada matchup quando o SPRT decide (ignora --cache)')
+    parser.add_argument('--elo0', type=float, default=-50, help='hipótese h0 do SPRT (diferença de elo p0 - p1)')
+    parser.add_argument('--elo1', type=float, default=50, help='hipótese h1 do SPRT')
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--beta', type=float, default=0.05)
+    parser.add_argument('--batch-size', type=int, default=10, help='jogos por lote entre testes do SPRT')
+    parser.add_argument('--min-games', type=int, default=10)
+    parser.add_argument('--max-games', type=int, default=None, help='máximo por matchup (padrão 2x --games)')
+    add_shard_arguments(parser)
+    args = parser.parse_args()
+
+    # cada shard grava os próprios arquivos; o cache de matchups pode ser compartilhado entre eles
+    if args.models: MODELS_CONFIG = load_models_config(args.models)
+    GAMES_PER_MATCHUP = args.games
+    OUTPUT_FILE = shard_path(args.output, args.shard_index, args.num_shards)
+    store_dir = args.records or args.store
+    if store_dir: store_dir = shard_path(store_dir, args.shard_index, args.num_shards)
+    search_stats_file = shard_path(args.search_stats, args.shard_index, args.num_shards) if args.search_stats else None
+    if args.adaptive:
+        run_adaptive_tournament(workers=args.workers, seed=args.seed, lockstep=args.lockstep, minimax_workers=args.minimax_workers,
+                                store_dir=store_dir, records=bool(args.records), duplicate=args.duplicate, elo0=args.elo0, elo1=args.elo1, alpha=args.alpha, beta=args.beta,
+                                batch_size=args.batch_size, min_games=args.min_games, max_games=args.max_games,
+                                shard_index=args.shard_index, num_shards=args.num_shards)
+    else:
+        run_tournament(workers=args.workers, seed=args.seed, chunk_size=args.chunk_size,
+                       lockstep=args.lockstep, minimax_workers=args.minimax_workers, store_dir=store_dir, cache_dir=args.cache,
+                       duplicate=args.duplicate, search_stats_file=search_stats_file, records=bool(args.records),
+                       shard_index=args.shard_index, num_shards=args.num_shards)
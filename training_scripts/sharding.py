@@ -0,0 +1,53 @@
+import os
+import re
+import glob
+
+# divisão determinística do trabalho entre nós (job array do slurm ou processos locais):
+# o shard k de n fica com os itens k, k + n, k + 2n, ... da lista canônica, e cada shard grava
+# em <arquivo>.shard-KK-of-NN<ext>. como as seeds dependem só do jogo (não de quem o joga),
+# juntar os shards dá o mesmo resultado de uma execução única.
+SHARD_PATTERN = re.compile(r'\.shard-(?P<index>\d+)-of-(?P<count>\d+)')
+
+def slurm_shard():
+    # (índice, total) a partir das variáveis do job array; (0, 1) fora do slurm
+    if 'SLURM_ARRAY_TASK_ID' not in os.environ: return 0, 1
+    index = int(os.environ['SLURM_ARRAY_TASK_ID']) - int(os.environ.get('SLURM_ARRAY_TASK_MIN', 0))
+    return index, int(os.environ.get('SLURM_ARRAY_TASK_COUNT', 1))
+
+def add_shard_arguments(parser):
+    index, count = slurm_shard()
+    parser.add_argument('--shard-index', type=int, default=index, help='shard desta execução (padrão: SLURM_ARRAY_TASK_ID)')
+    parser.add_argument('--num-shards', type=int, default=count, help='total de shards (padrão: SLURM_ARRAY_TASK_COUNT)')
+
+def check_shard(index, count):
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f'shard {index} fora do intervalo para {count} shards')
+
+def shard_items(items, index, count):
+    check_shard(index, count)
+    return list(items)[index::count]
+
+def shard_path(path, index, count):
+    # com um shard só o caminho não muda
+    if count == 1: return path
+    root, ext = os.path.splitext(os.path.normpath(path))
+    return f'{root}.shard-{index:02d}-of-{count:02d}{ext}'
+
+def find_shards(path):
+    # arquivos (ou pastas) de todos os shards de path, na ordem dos índices; erro se faltar algum
+    root, ext = os.path.splitext(os.path.normpath(path))
+    found = {}
+    for shard_file in glob.glob(f'{glob.escape(root)}.shard-*-of-*{ext}'):
+        match = SHARD_PATTERN.search(shard_file[len(root):])
+        if match: found.setdefault(int(match.group('count')), {})[int(match.group('index'))] = shard_file
+    if not found: raise FileNotFoundError(f'nenhum shard de {path}')
+    if len(found) > 1: raise ValueError(f'shards de execuções com totais diferentes: {sorted(found)}')
+    count, files = next(iter(found.items()))
+    missing = sorted(set(range(count)) - set(files))
+    if missing: raise FileNotFoundError(f'faltam os shards {missing} de {count} ({path})')
+    return [files[i] for i in range(count)]
+
+def interleave(parts):
+    # desfaz shard_items: parts[k] são os itens do shard k, o resultado está na ordem canônica
+    total = sum(len(part) for part in parts)
+    return [parts[i % len(parts)][i // len(parts)] for i in range(total)]
@@ -0,0 +1,50 @@
+import math
+
+def elo_to_score(elo):
+    return 1 / (1 + 10**(-elo / 400))
+
+def sprt_bounds(alpha, beta):
+    # limites de wald: abaixo de lower aceita h0, acima de upper aceita h1
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+def sprt_llr(wins, draws, losses, elo0, elo1):
+    # log-likelihood ratio do gsprt (aproximação normal do modelo trinomial, como no fishtest)
+    # h0: diferença de elo = elo0, h1: diferença de elo = elo1, do ponto de vista de quem soma wins
+    n = wins + draws + losses
+    if n == 0: return 0.0
+    score = (wins + draws / 2) / n
+
+    # pseudo-contagens só na variância: sem elas, 10 vitórias seguidas dariam variância zero
+    w, d, l = wins + 0.5, draws + 0.5, losses + 0.5
+    variance = (w * (1 - score)**2 + d * (0.5 - score)**2 + l * (0 - score)**2) / (w + d + l)
+
+    s0, s1 = elo_to_score(elo0), elo_to_score(elo1)
+    return n * (s1 - s0) * (2 * score - s0 - s1) / (2 * variance)
+
+class SPRT:
+    # teste sequencial de um matchup; decided fica True quando o llr sai do intervalo
+    def __init__(self, elo0=-50, elo1=50, alpha=0.05, beta=0.05):
+        self.elo0, self.elo1 = elo0, elo1
+        self.lower, self.upper = sprt_bounds(alpha, beta)
+        self.wins = self.draws = self.losses = 0
+
+    def update(self, score):
+        if score == 1.0: self.wins += 1
+        elif score == 0.0: self.losses += 1
+        else: self.draws += 1
+
+    @property
+    def games(self): return self.wins + self.draws + self.losses
+
+    @property
+    def llr(self): return sprt_llr(self.wins, self.draws, self.losses, self.elo0, self.elo1)
+
+    @property
+    def decided(self): return not (self.lower < self.llr < self.upper)
+
+    @property
+    def result(self):
+        llr = self.llr
+        if llr >= self.upper: return 'H1'
+        if llr <= self.lower: return 'H0'
+        return 'Indeciso'
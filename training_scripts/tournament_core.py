@@ -0,0 +1,329 @@
+import sys
+import random
+import zlib
+import math
+import multiprocessing
+import numpy as np
+
+sys.path.insert(0, '.') # GwentLite importa games.Game a partir da raiz do repo
+sys.path.insert(0, 'games')
+sys.path.insert(0, 'agents')
+from GwentLite import GwentLite
+from dqn_agent import DQNAgent
+from ddqn_agent import DDQNAgent
+from minimax_agent import MinimaxAgent
+from random_agent import RandomAgent
+from neural_minimax_agent import NeuralMinimaxAgent
+from mcts_agent import MCTSAgent
+from endgame_tablebase import EndgameTablebase
+from minimax_cache import MinimaxCache
+from dueling_agent import DuelingAgent
+from student_agent import StudentAgent
+from quantized_agent import QuantizedAgent
+from model_registry import ModelRegistry
+
+def make_minimax(depth, tablebase_dir=None, cache_path=None, workers=0):
+    # a tablebase e a base do cache são abertas por memmap: cada processo mapeia os mesmos arquivos sem copiá-los
+    return MinimaxAgent(depth=depth, tablebase=EndgameTablebase(tablebase_dir) if tablebase_dir else None,
+                        cache=MinimaxCache(cache_path) if cache_path else None, workers=workers)
+
+# --- registro de modelos, um por processo: modelos com os mesmos pesos viram um único agente em memória ---
+_shared = {}
+
+def get_registry():
+    if 'registry' not in _shared: _shared['registry'] = ModelRegistry()
+    return _shared['registry']
+
+def load_agent(name, config, state_size, action_size):
+    print(f'Carregando agente {name}...')
+    config = get_registry().resolve(config)
+    if config['type'] == 'Minimax':
+        return make_minimax(config['depth'], config.get('tablebase'), config.get('cache'), config.get('search_workers', 0))
+    if config['type'] == 'Random': return RandomAgent()
+    if config['type'] == 'MCTS':
+        # com 'iterations' (e sem time_budget) o resultado não depende da velocidade da máquina
+        return MCTSAgent(time_budget=config.get('time_budget', math.inf if config.get('iterations') else 0.5),
+                         max_iterations=config.get('iterations'), rollout_policy=config.get('rollout', 'heuristic'),
+                         workers=config.get('search_workers', 0), seed=config.get('seed'))
+    if config['type'] == 'NeuralMinimax':
+        # busca com a rede de um checkpoint como avaliador de folhas
+        network = load_agent(name, dict(config, type=config.get('network_type', 'DDQN')), state_size, action_size)
+        if network is None: return None
+        try:
+            return NeuralMinimaxAgent(network, depth=config['depth'], batch_depth=config.get('batch_depth', 2),
+                                      leaf_value=config.get('leaf_value', 'max_q'))
+        except ValueError as e: # leaf_value 'value' com uma rede sem stream de valor
+            print(f'ERRO CRÍTICO ao carregar {name}: {e}')
+            return None
+
+    # 'arch' explícito na config tem prioridade; senão vem do registro (ou das camadas do próprio arquivo)
+    def build(arch, hidden_size):
+        # exportado por quantize_model.py: pesos float16/int8 rodando em numpy, sem tensorflow
+        if arch == 'quantized': return QuantizedAgent(config['path'])
+        if arch == 'student': agent = StudentAgent(state_size, action_size, hidden_size=hidden_size or 64)
+        elif arch == 'dueling':
+            is_double = (config['type'] == 'DDQN')
+            agent = DuelingAgent(state_size, action_size, double_dqn=is_double)
+        else:
+            hidden_size = hidden_size or 256 # o registro lê a largura das camadas gravadas no arquivo
+            if config['type'] == 'DQN': agent = DQNAgent(state_size, action_size, hidden_size=hidden_size)
+            else: agent = DDQNAgent(state_size, action_size, hidden_size=hidden_size)
+        agent.load(config['path'])
+        agent.epsilon = 0.0
+        return agent
+
+    try:
+        return get_registry().shared_agent(config, build)
+    except Exception as e:
+        print(f'ERRO CRÍTICO ao carregar {name}: {e}')
+        return None
+
+# agentes que jogam olhando o ambiente em vez das features
+ENV_AGENT_TYPES = ('Minimax', 'Random', 'NeuralMinimax', 'MCTS')
+
+def get_agent_action(agent, config, env, state):
+    if config['type'] in ENV_AGENT_TYPES: return agent.act(env)
+    return agent.act(state)
+
+def game_seed(base_seed, p0_name, p1_name, game_index, duplicate=False):
+    # seed estável entre processos (hash() do python muda a cada execução)
+    # no modo duplicado o deal só depende do índice do jogo: todos os matchups usam os mesmos
+    # deals (números aleatórios comuns) e (a, b) e (b, a) jogam cada deal com os assentos trocados
+    if duplicate: return zlib.crc32(f'{base_seed}:deal:{game_index}'.encode())
+    return zlib.crc32(f'{base_seed}:{p0_name}:{p1_name}:{game_index}'.encode())
+
+def play_game(env, names, agents, configs, seed, max_turns):
+    # joga uma partida completa e devolve o registro dela
+    # o deal vem do rng do próprio ambiente; o rng global (usado pelos agentes) também é
+    # semeado por partida, então o resultado não depende da ordem de execução
+    np.random.seed(seed)
+    random.seed(seed)
+    env.reset(seed=seed)
+
+    p0_name, p1_name = names
+    done = False
+    turns = 0
+    winner_model = 'Tie'
+    termination = 'Normal'
+
+    while not done:
+        if turns >= max_turns:
+            done = True; termination = 'Timeout'; break
+
+        curr = env.get_player_turn()
+        state = env.get_features(curr)
+        action = get_agent_action(agents[curr], configs[curr], env, state)
+
+        done, winner_model, termination = apply_action(env, names, curr, action)
+        turns += 1
+
+    return {'p0': p0_name, 'p1': p1_name, 'seed': seed, 'winner': winner_model, 'turns': turns, 'termination': termination,
+            'first_player': env.round_one_first_player_index, 'actions': env.action_history}
+
+def apply_action(env, names, curr, action):
+    # aplica a jogada e devolve (done, winner_model, termination)
+    p0_name, p1_name = names
+    if not env.act(action):
+        return True, (p1_name if curr == 0 else p0_name), 'Illegal_Move'
+
+    game_over, results = env.check_game_over()
+    if not game_over: return False, 'Tie', 'Normal'
+    if results[0] == 'win': return True, p0_name, 'Game_Over'
+    if results[1] == 'win': return True, p1_name, 'Game_Over'
+    return True, 'Tie', 'Game_Over'
+
+def batch_q_values(agent, states):
+    # um único forward pass para todos os estados do lote
+    if isinstance(agent, (StudentAgent, QuantizedAgent)): return agent.q_values(np.concatenate(states, axis=0))
+    return np.asarray(agent.model.predict_on_batch(np.concatenate(states, axis=0)))
+
+def minimax_act(task):
+    depth, tablebase_dir, cache_path, env = task
+    agents = _worker.setdefault('minimax_by_depth', {})
+    key = (depth, tablebase_dir, cache_path)
+    if key not in agents: agents[key] = make_minimax(depth, tablebase_dir, cache_path)
+    # as estatísticas da busca voltam junto para o agente do processo principal (--search-stats)
+    return agents[key].act(env), agents[key].last_stats
+
+def play_matchup_lockstep(names, agents, configs, seeds, max_turns, minimax_pool=None):
+    # joga todas as partidas de um matchup ao mesmo tempo, em ticks sincronizados.
+    # a cada tick, os jogos em que um agente neural está na vez viram um único lote
+    # (um forward pass por agente) e as jogadas do minimax vão para o pool de processos.
+    # assume agentes gulosos (epsilon = 0, como load_agent deixa), então cada partida
+    # tem o mesmo vencedor, turnos e término do runner sequencial.
+    p0_name, p1_name = names
+    envs = []
+    for seed in seeds:
+        env = GwentLite()
+        env.reset(seed=seed)
+        envs.append(env)
+
+    records = [{'p0': p0_name, 'p1': p1_name, 'seed': seed, 'winner': 'Tie', 'turns': 0, 'termination': 'Normal'} for seed in seeds]
+    active = list(range(len(envs)))
+
+    while active:
+        by_player = {0: [], 1: []}
+        for g in list(active):
+            if records[g]['turns'] >= max_turns:
+                records[g]['termination'] = 'Timeout'
+                active.remove(g)
+                continue
+            by_player[envs[g].get_player_turn()].append(g)
+
+        for curr, games in by_player.items():
+            if not games: continue
+            agent, config = agents[curr], configs[curr]
+
+            if config['type'] == 'Minimax':
+                tasks = [(config['depth'], config.get('tablebase'), config.get('cache'), envs[g]) for g in games]
+                if minimax_pool is not None:
+                    actions = []
+                    for action, stats in minimax_pool.map(minimax_act, tasks):
+                        agent.add_stats(stats)
+                        actions.append(action)
+                else: actions = [agent.act(envs[g]) for g in games]
+            elif config['type'] in ENV_AGENT_TYPES:
+                actions = [agent.act(envs[g]) for g in games]
+            else:
+                q_values = batch_q_values(agent, [envs[g].get_features(curr) for g in games])
+                actions = np.argmax(q_values, axis=1)
+
+            for g, action in zip(games, actions):
+                done, winner_model, termination = apply_action(envs[g], names, curr, int(action))
+                records[g]['turns'] += 1
+                if done:
+                    records[g]['winner'], records[g]['termination'] = winner_model, termination
+                    active.remove(g)
+
+    # jogadas de cada partida para o GameRecordStore (replay a partir da seed)
+    for record, env in zip(records, envs):
+        record['first_player'], record['actions'] = env.round_one_first_player_index, env.action_history
+    return records
+
+def make_shards(matchups, games_per_matchup, chunk_size):
+    # divide cada matchup em fatias de jogos; a ordem das fatias é a ordem canônica do torneio
+    shards = []
+    for p0_name, p1_name in matchups:
+        for start in range(0, games_per_matchup, chunk_size):
+            shards.append((p0_name, p1_name, list(range(start, min(start + chunk_size, games_per_matchup)))))
+    return shards
+
+# --- estado por processo worker ---
+_worker = {}
+
+def configure_worker_threads(models_config=None):
+    # cada worker usa um core; o paralelismo vem do número de processos.
+    # sem nenhum agente keras na config (só busca, aleatório ou quantizado), o tensorflow nem chega a ser importado
+    if models_config is not None and all(c['type'] in ('Minimax', 'Random', 'MCTS') or c.get('arch') == 'quantized'
+                                         for c in models_config.values()):
+        return
+    try:
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(1)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+def init_worker(models_config, base_seed, max_turns, lockstep=False, minimax_workers=0, duplicate=False):
+    configure_worker_threads(models_config)
+    env = GwentLite()
+    _worker['env'] = env
+    _worker['configs'] = models_config
+    _worker['agents'] = {}
+    _worker['base_seed'] = base_seed
+    _worker['max_turns'] = max_turns
+    _worker['lockstep'] = lockstep
+    _worker['duplicate'] = duplicate
+    # pool próprio para o minimax só no processo principal (workers de pool não podem ter filhos)
+    _worker['minimax_pool'] = None
+    if lockstep and minimax_workers > 1:
+        _worker['minimax_pool'] = multiprocessing.get_context('spawn').Pool(minimax_workers)
+
+def close_worker():
+    # só o runner serial grava o cache do minimax: workers de pool o usam como base somente leitura
+    for name, agent in _worker.get('agents', {}).items():
+        if agent is None: continue
+        if hasattr(agent, 'close'): agent.close()
+        if getattr(agent, 'cache', None) is not None and agent.cache.path:
+            agent.cache.save()
+            print(f'Cache do minimax ({name}): {agent.cache}')
+    if _worker.get('minimax_pool') is not None:
+        _worker['minimax_pool'].close()
+        _worker['minimax_pool'].join()
+        _worker['minimax_pool'] = None
+
+def get_worker_agent(name):
+    # carrega cada modelo no máximo uma vez por worker, só quando uma fatia precisa dele;
+    # uma falha também fica guardada (None), para não tentar de novo a cada fatia
+    agents = _worker['agents']
+    if name not in agents:
+        env = _worker['env']
+        agents[name] = load_agent(name, _worker['configs'][name], env.get_observation_shape(), env.get_action_space_size())
+        if agents[name] is None: print(f'AVISO: {name} não carregou, os matchups dele serão pulados')
+    return agents[name]
+
+def search_totals(names, agents):
+    # totais acumulados das estatísticas de busca dos agentes que as têm (minimax)
+    return {name: dict(agent.totals) for name, agent in zip(names, agents) if hasattr(agent, 'totals')}
+
+def play_shard(shard):
+    p0_name, p1_name, game_indices = shard
+    env = _worker['env']
+    agents = (get_worker_agent(p0_name), get_worker_agent(p1_name))
+    # como no runner original, um modelo que não carrega fica de fora em vez de abortar o torneio:
+    # a fatia volta vazia e quem consome os resultados pula o matchup
+    if None in agents: return []
+    configs = (_worker['configs'][p0_name], _worker['configs'][p1_name])
+    totals_before = search_totals((p0_name, p1_name), agents)
+
+    if _worker['lockstep']:
+        seeds = [game_seed(_worker['base_seed'], p0_name, p1_name, i, _worker['duplicate']) for i in game_indices]
+        records = play_matchup_lockstep((p0_name, p1_name), agents, configs, seeds, _worker['max_turns'], _worker['minimax_pool'])
+        for i, record in zip(game_indices, records): record['game'] = i
+    else:
+        records = []
+        for i in game_indices:
+            seed = game_seed(_worker['base_seed'], p0_name, p1_name, i, _worker['duplicate'])
+            record = play_game(env, (p0_name, p1_name), agents, configs, seed, _worker['max_turns'])
+            record['game'] = i
+            records.append(record)
+
+    # o custo de busca da fatia inteira vai no primeiro registro (somar os registros dá o total)
+    if totals_before and records:
+        totals_after = search_totals((p0_name, p1_name), agents)
+        records[0]['search'] = {name: {key: totals_after[name][key] - value for key, value in totals.items()}
+                                for name, totals in totals_before.items()}
+    return records
+
+class ShardRunner:
+    # executa fatias no próprio processo (workers <= 1) ou num pool persistente de processos
+    def __init__(self, valid_configs, workers, seed, max_turns, lockstep=False, minimax_workers=0, duplicate=False):
+        self.valid_configs = valid_configs
+        self.workers = workers
+        self.seed = seed
+        self.max_turns = max_turns
+        self.lockstep = lockstep
+        self.minimax_workers = minimax_workers
+        self.duplicate = duplicate
+        self.pool = None
+
+    def __enter__(self):
+        if self.workers <= 1:
+            init_worker(self.valid_configs, self.seed, self.max_turns, self.lockstep, self.minimax_workers, self.duplicate)
+        else:
+            # workers de pool não podem ter pool próprio para o minimax
+            init_args = (self.valid_configs, self.seed, self.max_turns, self.lockstep, 0, self.duplicate)
+            ctx = multiprocessing.get_context('spawn') # tensorflow não é seguro com fork
+            self.pool = ctx.Pool(self.workers, initializer=init_worker, initargs=init_args)
+        return self
+
+    def imap(self, shards):
+        # devolve os registros na ordem canônica das fatias, qualquer que seja a ordem de execução
+        if self.pool is None: return map(play_shard, shards)
+        return self.pool.imap(play_shard, shards)
+
+    def __exit__(self, *exc):
+        if self.pool is None: close_worker()
+        else:
+            self.pool.close()
+            self.pool.join()
@@ -4,21 +4,32 @@ import os
 import csv
 import time
 import argparse
+import itertools
 from collections import deque
 
 # adiciona pasta games ao path
 sys.path.insert(0, 'games')
 from GwentLite import GwentLite
 from dueling_agent import DuelingAgent
+from async_eval import AsyncEvaluator, report_results
+from endgame_tablebase import EndgameTablebase
+from model_registry import ModelRegistry, default_name
+from game_records import GameRecordStore
+from sharding import add_shard_arguments, shard_items, shard_path
 
 # configurações globais
-EPISODES = 10000
+EPISODES = 10000 # padrão de --episodes
 TARGET_UPDATE_FREQ = 20
 SAVE_MODEL_FREQ = 500
 OPPONENT_UPDATE_FREQ = 500 # a cada 500 eps, o oponente vira a versão atual do agente
 MAX_TURNS = 100
 K_FACTOR = 32
 INITIAL_ELO = 1000
+EVAL_FREQ = 0 # avaliação contra o minimax em processo separado (desligada por padrão: --eval-freq 500 liga)
+EVAL_GAMES = 10 # deals por avaliação, cada um jogado nos dois assentos
+EVAL_DEPTH = 2
+EVAL_PATIENCE = 0 # avaliações sem melhora antes de parar o treino (0 = nunca para)
+RECORDS_FLUSH_FREQ = 50 # episódios acumulados antes de gravar as partidas no --records
 
 def calculate_elo_update(p1_elo, p2_elo, p1_score, k_factor):
     expected_p1 = 1 / (1 + 10**((p2_elo - p1_elo) / 400))
@@ -27,7 +38,8 @@ def calculate_elo_update(p1_elo, p2_elo, p1_score, k_factor):
     new_p2_elo = p2_elo + k_factor * ((1 - p1_score) - expected_p2)
     return new_p1_elo, new_p2_elo
 
-def run_training(algorithm, reward_shaping):
+def run_training(algorithm, reward_shaping, eval_freq=EVAL_FREQ, eval_games=EVAL_GAMES, eval_depth=EVAL_DEPTH, eval_patience=EVAL_PATIENCE, tablebase_dir=None,
+                 init_weights=None, epsilon_start=None, records_dir=None, episodes=EPISODES):
     # setup de pastas e nomes
     is_double = (algorithm == 'DDQN')
     suffix = 'v2' if reward_shaping else 'v1'
@@ -40,7 +52,7 @@ def run_training(algorithm, reward_shaping):
     
     print(f"--- INICIANDO TREINO PRO V3: {model_name} ---")
     print(f"Algoritmo: {algorithm} (Dueling), Reward Shaping: {reward_shaping}")
-    print(f"Episódios: {EPISODES}, Batch Size: 128")
+    print(f"Episódios: {episodes}, Batch Size: 128")
     
     env = GwentLite()
     state_size = env.get_observation_shape()
@@ -48,6 +60,12 @@ def run_training(algorithm, reward_shaping):
     
     # agente principal
     agent = DuelingAgent(state_size, action_size, double_dqn=is_double)
+    if init_weights:
+        # warm start com os pesos do pré-treino supervisionado (pretrain_dueling.py)
+        agent.load(init_weights)
+        agent.update_target_model()
+        print(f"Pesos iniciais: {init_weights}")
+    if epsilon_start is not None: agent.epsilon = epsilon_start
     
     # agente oponente (começa como cópia do principal)
     opponent = DuelingAgent(state_size, action_size, double_dqn=is_double)
@@ -58,15 +76,31 @@ def run_training(algorithm, reward_shaping):
     opponent.load(opponent_weights_file)
     
     player_elos = {0: INITIAL_ELO, 1: INITIAL_ELO}
+    registry = ModelRegistry() # cada checkpoint salvo entra no manifesto de modelos
+
+    # posições de round final com resultado exato (terminal bootstrap)
+    tablebase = EndgameTablebase(tablebase_dir) if tablebase_dir else None
+    if tablebase is not None: print(f"Tablebase: {tablebase_dir} ({len(tablebase)} posições)")
+
+    # partidas do treino (seed do deal + jogadas) para replay e análise posterior
+    records = GameRecordStore(records_dir) if records_dir else None
+    pending_records = []
     
     with open(metrics_file, 'w', newline='') as f:
         writer = csv.writer(f)
         writer.writerow(['Episode', 'Epsilon', 'Winner', 'Turns', 'Total_Reward_P0', 'Duration_Sec', 'ELO_P0', 'ELO_P1'])
 
+    evaluator = None
+    if eval_freq > 0:
+        evaluator = AsyncEvaluator(state_size, action_size, is_double, eval_depth, eval_games, f"eval_{metrics_file}")
+    best_weights_file = f"{save_dir}/{model_name}_best.weights.h5"
+
     start_time = time.time()
 
-    for e in range(1, EPISODES + 1):
-        env.reset()
+    for e in range(1, episodes + 1):
+        # a seed sai do rng do próprio ambiente: os deals seguem aleatórios e cada um fica reproduzível
+        seed = int(env.rng.integers(2**63))
+        env.reset(seed=seed)
         done = False
         turns = 0
         total_reward_p0 = 0
@@ -94,7 +128,12 @@ def run_training(algorithm, reward_shaping):
             # memória do passo anterior (apenas para o agente p0)
             if current_player == 0 and last_state_action[0] is not None:
                 prev_s, prev_a, prev_r = last_state_action[0]
-                agent.remember(prev_s, prev_a, prev_r, state, False)
+                outcome = tablebase.probe(env, 0) if tablebase is not None else None
+                if outcome is None: agent.remember(prev_s, prev_a, prev_r, state, False)
+                else:
+                    # final resolvido na tablebase: a transição fecha com o retorno exato, sem bootstrap da rede
+                    final_r = 5.0 * outcome + (3.0 if reward_shaping and outcome == 1 else 0.0)
+                    agent.remember(prev_s, prev_a, prev_r + final_r, state, True)
 
             wins_before = env.player_num_round_wins[current_player]
             legal = env.act(action)
@@ -173,23 +212,69 @@ def run_training(algorithm, reward_shaping):
         # logs
         duration = time.time() - start_time
         if e % 50 == 0:
-            print(f"Ep {e}/{EPISODES} | {model_name} | Win: {winner} | Ep: {agent.epsilon:.2f} | R: {total_reward_p0:.1f} | ELO P0: {player_elos[0]:.0f}")
+            print(f"Ep {e}/{episodes} | {model_name} | Win: {winner} | Ep: {agent.epsilon:.2f} | R: {total_reward_p0:.1f} | ELO P0: {player_elos[0]:.0f}")
         
         with open(metrics_file, 'a', newline='') as f:
             writer = csv.writer(f)
             writer.writerow([e, agent.epsilon, winner, turns, total_reward_p0, duration, player_elos[0], player_elos[1]])
 
+        if records is not None:
+            names = (model_name, f"{model_name}_opponent")
+            termination = {'Timeout': 'Timeout', 'Illegal': 'Illegal_Move'}.get(winner, 'Game_Over')
+            pending_records.append({'p0': names[0], 'p1': names[1], 'winner': names[winner] if winner in (0, 1) else 'Tie',
+                                    'termination': termination, 'turns': turns, 'seed': seed,
+                                    'first_player': env.round_one_first_player_index, 'actions': env.action_history})
+            if e % RECORDS_FLUSH_FREQ == 0:
+                records.append(pending_records)
+                pending_records = []
+
         # checkpoints
         if e % SAVE_MODEL_FREQ == 0:
-            agent.save(f"{save_dir}/{model_name}_{e}.weights.h5")
+            checkpoint_file = f"{save_dir}/{model_name}_{e}.weights.h5"
+            agent.save(checkpoint_file)
+            registry.register(default_name(checkpoint_file), checkpoint_file, algorithm, 'dueling', e, trainer='train_pro',
+                              reward_shaping=reward_shaping, init_weights=init_weights, tablebase=tablebase_dir)
+            registry.save()
+
+        # avaliação assíncrona: o snapshot vai para o processo de avaliação e o treino segue
+        if evaluator is not None:
+            if e % eval_freq == 0 and not evaluator.submit(e, agent.model):
+                print(f">> Avaliação do Ep {e} pulada: a anterior ainda não terminou")
+            report_results(evaluator.poll(), agent, best_weights_file)
+            if eval_patience > 0 and evaluator.evals_without_improvement >= eval_patience:
+                print(f">> Early stop no Ep {e}: {eval_patience} avaliações sem melhora (melhor: Ep {evaluator.best_episode})")
+                break
+
+    if records is not None:
+        records.append(pending_records)
+        print(f"Partidas gravadas em {records_dir}: {len(records)}")
+
+    if evaluator is not None:
+        report_results(evaluator.close(), agent, best_weights_file)
+        print(f"Melhor avaliação: Ep {evaluator.best_episode} (score {evaluator.best_score:.3f}) -> {best_weights_file}"
+              + (f" ({evaluator.skipped} snapshots pulados)" if evaluator.skipped else ""))
 
     print(f"Treinamento {model_name} Concluído!")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--type", type=str, choices=['DQN', 'DDQN'], required=True)
-    parser.add_argument("--shaping", type=str, choices=['True', 'False'], required=True)
+    # vários valores formam uma grade (tipo x shaping); com shards, cada execução treina uma fatia dela
+    parser.add_argument("--type", type=str, choices=['DQN', 'DDQN'], nargs='+', required=True)
+    parser.add_argument("--shaping", type=str, choices=['True', 'False'], nargs='+', required=True)
+    parser.add_argument("--episodes", type=int, default=EPISODES)
+    parser.add_argument("--eval-freq", type=int, default=EVAL_FREQ, help="episódios entre avaliações contra o minimax (0 desliga)")
+    parser.add_argument("--eval-games", type=int, default=EVAL_GAMES)
+    parser.add_argument("--eval-depth", type=int, default=EVAL_DEPTH)
+    parser.add_argument("--eval-patience", type=int, default=EVAL_PATIENCE)
+    parser.add_argument("--tablebase", type=str, default=None, help="pasta gerada por build_tablebase.py")
+    parser.add_argument("--init-weights", type=str, default=None, help="pesos gerados por pretrain_dueling.py")
+    parser.add_argument("--epsilon-start", type=float, default=None, help="epsilon inicial (padrão do agente: 1.0)")
+    parser.add_argument("--records", type=str, default=None, help="pasta onde gravar cada partida do treino (ver game_records.py)")
+    add_shard_arguments(parser)
     args = parser.parse_args()
-    
-    use_shaping = (args.shaping == 'True')
-    run_training(args.type, use_shaping)
+
+    # cada configuração grava em pastas e arquivos com o próprio nome; só o --records é separado por shard
+    records_dir = shard_path(args.records, args.shard_index, args.num_shards) if args.records else None
+    for algorithm, shaping in shard_items(itertools.product(args.type, args.shaping), args.shard_index, args.num_shards):
+        run_training(algorithm, shaping == 'True', args.eval_freq, args.eval_games, args.eval_depth, args.eval_patience, args.tablebase,
+                     args.init_weights, args.epsilon_start, records_dir, args.episodes)